@@ -1,5 +1,9 @@
 import pandas as pd
+import numpy as np
 import os
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
 from nautilus_trader.model.enums import OrderSide
 from  tools.help_funcs.help_funcs_strategy import extract_interval_from_bar_type
 
@@ -57,18 +61,252 @@ class IndicatorInstance:
         self.plot_number = plot_number  # 0 -> in (bar) chart, 1 -> metrik plot 1 etc...
 
 
+class CsvSink:
+    """appends every batch to a csv file (legacy format, human readable)"""
+    extension = ".csv"
+
+    def write(self, file_path, df):
+        header = not file_path.exists()
+        df.to_csv(file_path, mode='a', header=header, index=False)
+
+    def close(self):
+        pass
+
+
+class ParquetSink:
+    """keeps one ParquetWriter open per series, every batch becomes a typed row group"""
+    extension = ".parquet"
+
+    def __init__(self, compression="zstd"):
+        self.compression = compression
+        self._writers = {}
+
+    @staticmethod
+    def _typed(df):
+        # timestamps / plot ids as int64, everything else (Price, Quantity, floats, None) as float64
+        out = {}
+        for col in df.columns:
+            if col in ("timestamp", "plot_id"):
+                out[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int64")
+            else:
+                try:
+                    out[col] = df[col].astype("float64")
+                except (TypeError, ValueError):
+                    out[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        return pd.DataFrame(out)
+
+    def write(self, file_path, df):
+        table = pa.Table.from_pandas(self._typed(df), preserve_index=False)
+        writer = self._writers.get(file_path)
+        if writer is None:
+            writer = pq.ParquetWriter(file_path, table.schema, compression=self.compression)
+            self._writers[file_path] = writer
+        else:
+            table = table.cast(writer.schema)
+        writer.write_table(table)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+
+RESULT_SINKS = {"csv": CsvSink, "parquet": ParquetSink}
+
+
+def find_result_file(directory, stem):
+    """returns <directory>/<stem>.parquet or .csv (whichever sink wrote it), None if neither exists"""
+    for sink_cls in (ParquetSink, CsvSink):
+        candidate = Path(directory) / f"{stem}{sink_cls.extension}"
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def find_result_files(directory, pattern="*"):
+    """all <directory>/<pattern>.parquet / .csv result files (one per stem, parquet first), sorted by stem"""
+    files = {}
+    for sink_cls in (CsvSink, ParquetSink):
+        for candidate in Path(directory).glob(f"{pattern}{sink_cls.extension}"):
+            files[candidate.stem] = candidate
+    return [files[stem] for stem in sorted(files)]
+
+
+def read_result_file(file_path, columns=None):
+    """reads a bars/indicator file written by any sink"""
+    file_path = Path(file_path)
+    if file_path.suffix == ParquetSink.extension:
+        return pd.read_parquet(file_path, columns=columns)
+    return pd.read_csv(file_path, usecols=columns)
+
+
+# column names that already logged a non-numeric value (warned once per name and process)
+_NON_NUMERIC_WARNED = set()
+
+
+def _as_float(value, name="value"):
+    # Price/Quantity/Decimal/int/bool -> float, None -> NaN; unconvertible -> NaN with one warning per column
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        if name not in _NON_NUMERIC_WARNED:
+            _NON_NUMERIC_WARNED.add(name)
+            print(f"[collector] Nicht-numerischer Wert für {name!r}: {value!r} ({type(value).__name__}) -> NaN")
+        return np.nan
+
+
+NS_PER_DAY = 86_400_000_000_000
+
+# equity statistics of finished runs in this process, run_id -> summary (see BacktestDataCollector.track_equity)
+RUN_EQUITY_STATS = {}
+
+
+def pop_equity_stats(run_id):
+    """returns and forgets the in-process equity statistics of a run, None if this process did not run it"""
+    return RUN_EQUITY_STATS.pop(str(run_id), None)
+
+
+class EquityStats:
+    """
+    running peak, max drawdown, drawdown duration, time under water and daily closes of an equity series,
+    updated per logged value so nothing has to be re-read from disk after the run
+    """
+
+    def __init__(self):
+        self.peak = None
+        self.peak_timestamp = None
+        self.max_drawdown = 0.0
+        self.max_drawdown_duration = 0  # ns from peak to the deepest point of the longest drawdown
+        self.time_under_water = 0       # ns spent below the running peak
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.last_value = None
+        self._days = []                 # day index (ts // NS_PER_DAY)
+        self._daily_closes = []         # last equity per day
+
+    def update(self, timestamp, value):
+        if value is None or value != value:
+            return
+        timestamp = int(timestamp)
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        if self.last_value is not None and self.last_value < self.peak and timestamp > self.last_timestamp:
+            self.time_under_water += timestamp - self.last_timestamp
+
+        if self.peak is None or value >= self.peak:
+            self.peak = value
+            self.peak_timestamp = timestamp
+        else:
+            # same semantics as calculate_max_drawdown: drawdown relative to a positive peak
+            if self.peak > 0:
+                drawdown = (self.peak - value) / self.peak
+                if drawdown > self.max_drawdown:
+                    self.max_drawdown = drawdown
+            duration = timestamp - self.peak_timestamp
+            if duration > self.max_drawdown_duration:
+                self.max_drawdown_duration = duration
+
+        if self.last_timestamp is None or timestamp >= self.last_timestamp:
+            self.last_timestamp = timestamp
+            self.last_value = value
+        day = timestamp // NS_PER_DAY
+        if self._days and day == self._days[-1]:
+            self._daily_closes[-1] = value
+        elif not self._days or day > self._days[-1]:
+            self._days.append(day)
+            self._daily_closes.append(value)
+
+    def daily_returns(self):
+        """daily close-to-close returns (like resample('1D').last().pct_change()), indexed by day"""
+        closes = pd.Series(self._daily_closes, index=pd.to_datetime(np.asarray(self._days, dtype=np.int64) * NS_PER_DAY, unit="ns"))
+        return closes.pct_change(fill_method=None).dropna()
+
+    def summary(self):
+        span = (self.last_timestamp - self.first_timestamp) if self.first_timestamp is not None else 0
+        return {
+            "Max Drawdown": float(round(self.max_drawdown, 6)),
+            "Max Drawdown Duration (days)": float(round(self.max_drawdown_duration / NS_PER_DAY, 4)),
+            "Time Under Water (%)": float(round(100.0 * self.time_under_water / span, 4)) if span > 0 else 0.0,
+            "Peak Equity": float(self.peak) if self.peak is not None else 0.0,
+        }
+
+
+class ColumnBuffer:
+    """
+    typed in-memory series: int64 timestamps + float64 value columns, starting small and doubling up to
+    chunk_size (sparse indicators never hold a full chunk), beyond that grown in chunks
+    replaces the former list of dicts per bar/indicator (no Python object per row)
+    """
+
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, value_columns, chunk_size=5000):
+        self.value_columns = tuple(value_columns)
+        self.chunk_size = max(int(chunk_size), 1)
+        capacity = min(self.INITIAL_CAPACITY, self.chunk_size)
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty((capacity, len(self.value_columns)), dtype=np.float64)
+        self.size = 0
+        self.last_timestamp = None  # survives flushes
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        capacity = len(self._timestamps)
+        if capacity < self.chunk_size:
+            capacity = min(capacity * 2, self.chunk_size)
+        else:
+            capacity += self.chunk_size
+        timestamps = np.empty(capacity, dtype=np.int64)
+        values = np.empty((capacity, len(self.value_columns)), dtype=np.float64)
+        timestamps[:self.size] = self._timestamps[:self.size]
+        values[:self.size] = self._values[:self.size]
+        self._timestamps, self._values = timestamps, values
+
+    def append(self, timestamp, *values):
+        if self.size == len(self._timestamps):
+            self._grow()
+        self._timestamps[self.size] = timestamp
+        self._values[self.size] = values
+        self.size += 1
+        self.last_timestamp = timestamp
+
+    def to_frame(self):
+        data = {"timestamp": self._timestamps[:self.size].copy()}
+        for i, col in enumerate(self.value_columns):
+            data[col] = self._values[:self.size, i].copy()
+        return pd.DataFrame(data)
+
+    def clear(self):
+        self.size = 0
+
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
 class BacktestDataCollector:
-    def __init__(self, name, run_id, batch_size=5000): 
+    def __init__(self, name, run_id, batch_size=5000, sink="csv"): 
         self.name = name
         # Bars pro Timeframe
-        self.bars = {}              # timeframe -> List[bar_dict]
+        self.bars = {}              # timeframe -> ColumnBuffer(open, high, low, close, volume)
         self.trades = []
+        # O(1) lookups for fill / close handling, maintained by add_trade and add_trade_details
+        self._trades_by_id = {}     # client_order_id -> List[TradeInstance]
+        self._trades_by_parent = {} # parent_id -> List[TradeInstance]
         self.run_id = run_id
-        self.indicators = {}
+        self.indicators = {}        # name -> ColumnBuffer(value)
         self.indicator_plot_number = {}
         self.initialise_result_path()
         self.plots_at_minus_one = 0
         self.batch_size = batch_size
+        if sink not in RESULT_SINKS:
+            raise ValueError(f"Unbekannter result sink: {sink!r} (erlaubt: {list(RESULT_SINKS)})")
+        self.sink = RESULT_SINKS[sink]()
+        self.equity_stats = None            # EquityStats of one indicator, see track_equity
+        self._equity_indicator = None
         
 
     def initialise_result_path(self):
@@ -83,7 +321,7 @@ class BacktestDataCollector:
         (self.path / "indicators").mkdir(parents=True, exist_ok=True)
  
     def initialise_logging_indicator(self, name, plot_number): #indicator -> [indicator_name, plot_number]
-        self.indicators[name] = []
+        self.indicators[name] = ColumnBuffer(("value",), self.batch_size)
         if plot_number == -1:
             plot_number = 1000 + self.plots_at_minus_one
             self.plots_at_minus_one += 1
@@ -91,95 +329,75 @@ class BacktestDataCollector:
 
     def add_bar(self, timestamp, open_, high, low, close, volume, bar_type):
         timeframe = extract_interval_from_bar_type(str(bar_type), str(bar_type.instrument_id))
-        if timeframe not in self.bars:
-            self.bars[timeframe] = []
-        bar_dict = {
-            'timestamp': timestamp,
-            'open': open_,
-            'high': high,
-            'low': low,
-            'close': close,
-            'volume': volume,
-        }
-        self.bars[timeframe].append(bar_dict)
+        buffer = self.bars.get(timeframe)
+        if buffer is None:
+            buffer = self.bars[timeframe] = ColumnBuffer(BAR_COLUMNS, self.batch_size)
+        buffer.append(timestamp, _as_float(open_, "open"), _as_float(high, "high"), _as_float(low, "low"),
+                      _as_float(close, "close"), _as_float(volume, "volume"))
         # flush when batch is full
-        if len(self.bars[timeframe]) >= self.batch_size:
+        if len(buffer) >= self.batch_size:
             self.flush_bars(timeframe)
 
+    def track_equity(self, name):
+        """maintains EquityStats for indicator `name` while it is logged; published to RUN_EQUITY_STATS on save_data"""
+        self._equity_indicator = name
+        self.equity_stats = EquityStats()
+
     def add_indicator(self, name, timestamp, value):
-        plot_number = self.indicator_plot_number.get(name, 0)
-        if name not in self.indicators:
-            self.indicators[name] = []
-        self.indicators[name].append({
-            'timestamp': timestamp,
-            'value': value,
-            'plot_id': plot_number,
-        })
+        buffer = self.indicators.get(name)
+        if buffer is None:
+            buffer = self.indicators[name] = ColumnBuffer(("value",), self.batch_size)
+        value = _as_float(value, name)
+        buffer.append(timestamp, value)
+        if name == self._equity_indicator:
+            self.equity_stats.update(timestamp, value)
         # flush when batch is full
-        if len(self.indicators[name]) >= self.batch_size:
+        if len(buffer) >= self.batch_size:
             self.flush_indicators(name)
 
+    def last_bar_timestamp(self):
+        """latest bar timestamp over all timeframes (also after flushes), None if no bar was logged"""
+        timestamps = [b.last_timestamp for b in self.bars.values() if b.last_timestamp is not None]
+        return max(timestamps) if timestamps else None
+
     def _append_df(self, file_path, df):
-        header = not file_path.exists()
-        df.to_csv(file_path, mode='a', header=header, index=False)
+        self.sink.write(file_path, df)
 
     def flush_bars(self, timeframe, force=False):
         """
-        Schreibt einen Batch Bars für ein Timeframe in CSV.
-        Bei force=True werden alle restlichen Bars geschrieben.
+        Schreibt die gepufferten Bars eines Timeframes über den Sink.
+        Ohne force nur, wenn der Batch voll ist.
         """
-        if timeframe not in self.bars or not self.bars[timeframe]:
+        buffer = self.bars.get(timeframe)
+        if buffer is None or not len(buffer):
             return
-        entries = self.bars[timeframe]
-        if not force and len(entries) < self.batch_size:
+        if not force and len(buffer) < self.batch_size:
             return
-        batch_size = len(entries) if force else self.batch_size
-        batch = entries[:batch_size]
-        # DataFrame mit konsistenter Reihenfolge
-        df = pd.DataFrame(batch)
-        cols = ["timestamp", "open", "high", "low", "close", "volume"]
-        for c in cols:
-            if c not in df.columns:
-                df[c] = None
-        df = df[cols]
-        file_path = self.path / f"bars-{timeframe}.csv"
-        self._append_df(file_path, df)
-        del entries[:batch_size]
+        file_path = self.path / f"bars-{timeframe}{self.sink.extension}"
+        self._append_df(file_path, buffer.to_frame())
+        buffer.clear()
 
     def flush_all_bars(self, force=False):
         for tf in list(self.bars.keys()):
-            while True:
-                before = len(self.bars[tf])
-                self.flush_bars(tf, force=force)
-                # Wenn force: nur einmal ausführen
-                if force or len(self.bars[tf]) == before or len(self.bars[tf]) < self.batch_size:
-                    break
+            self.flush_bars(tf, force=force)
 
     def flush_indicators(self, name, force=False):
-        if name not in self.indicators or not self.indicators[name]:
+        buffer = self.indicators.get(name)
+        if buffer is None or not len(buffer):
             return
-        entries = self.indicators[name]
-        if not force and len(entries) < self.batch_size:
+        if not force and len(buffer) < self.batch_size:
             return
-        batch_size = len(entries) if force else self.batch_size
-        batch = entries[:batch_size]
-        df = pd.DataFrame(batch)
-        if "plot_id" not in df.columns:
-            plot_number = self.indicator_plot_number.get(name, 0)
-            df["plot_id"] = int(plot_number)
+        df = buffer.to_frame()
+        df["plot_id"] = int(self.indicator_plot_number.get(name, 0))
         indicators_dir = self.path / "indicators"
         indicators_dir.mkdir(exist_ok=True)
-        file_path = indicators_dir / f"{name}.csv"
+        file_path = indicators_dir / f"{name}{self.sink.extension}"
         self._append_df(file_path, df)
-        del entries[:batch_size]
+        buffer.clear()
 
     def flush_all_indicators(self, force=False):
         for name in list(self.indicators.keys()):
-            while True:
-                before = len(self.indicators[name])
-                self.flush_indicators(name, force=force)
-                if force or len(self.indicators[name]) == before or len(self.indicators[name]) < self.batch_size:
-                    break
+            self.flush_indicators(name, force=force)
 
     def flush_all(self, force=False):
         """
@@ -195,13 +413,16 @@ class BacktestDataCollector:
         price_actual = order_filled.last_px
         #fee = order_filled.commission
 
-
-        for trade in self.trades:
-            if trade.id == id:
-                trade.open_price_actual = price_actual
-                #trade.fee = fee
-                trade.parent_id = parent_id
-                break
+        trades = self._trades_by_id.get(id)
+        if not trades:
+            return
+        trade = trades[0]  # wie der frühere Scan: nur der erste Trade mit dieser id
+        trade.open_price_actual = price_actual
+        #trade.fee = fee
+        if trade.parent_id != parent_id:
+            self._unindex_parent(trade)
+            trade.parent_id = parent_id
+            self._index_parent(trade)
 
     def add_closed_trade(self, position_closed, fees):
         id = position_closed.opening_order_id
@@ -210,19 +431,32 @@ class BacktestDataCollector:
         close_price_actual = position_closed.avg_px_close
         # open_price_actual = position_closed.avg_px_open
 
-        for trade in self.trades:
-            if trade.id == id or (trade.parent_id is not None and trade.parent_id == id):
-                trade.closed_timestamp = closed_timestamp
-                trade.realized_pnl = realized_pnl
-                trade.close_price_actual = close_price_actual
-                trade.fee = fees
-                #trade.open_price_actual = open_price_actual
-                
-        
+        matches = list(self._trades_by_parent.get(id, ()))
+        for opening_trade in self._trades_by_id.get(id, ()):
+            if opening_trade.parent_id != id:
+                matches.append(opening_trade)
+        for trade in matches:
+            trade.closed_timestamp = closed_timestamp
+            trade.realized_pnl = realized_pnl
+            trade.close_price_actual = close_price_actual
+            trade.fee = fees
+            #trade.open_price_actual = open_price_actual
+
+    def _index_parent(self, trade):
+        if trade.parent_id is not None:
+            self._trades_by_parent.setdefault(trade.parent_id, []).append(trade)
+
+    def _unindex_parent(self, trade):
+        children = self._trades_by_parent.get(trade.parent_id)
+        if children:
+            children[:] = [t for t in children if t is not trade]
+
     # In BacktestDataCollector:
     def add_trade(self, new_order):
         trade = TradeInstance(new_order)
         self.trades.append(trade)
+        self._trades_by_id.setdefault(trade.id, []).append(trade)
+        self._index_parent(trade)
         
     def bars_to_csv(self):
         """
@@ -232,7 +466,7 @@ class BacktestDataCollector:
         # Dateien wurden bereits im Append-Modus erstellt -> nur Rückgabe der Dateinamen
         saved = []
         for tf in self.bars.keys():
-            file_path = self.path / f"bars-{tf}.csv"
+            file_path = self.path / f"bars-{tf}{self.sink.extension}"
             if file_path.exists():
                 saved.append(file_path.name)
         return saved
@@ -243,7 +477,7 @@ class BacktestDataCollector:
         indicators_dir = self.path / "indicators"
         if indicators_dir.exists():
             for name in self.indicators.keys():
-                file_path = indicators_dir / f"{name}.csv"
+                file_path = indicators_dir / f"{name}{self.sink.extension}"
                 if file_path.exists():
                     saved.append(f"indicators/{file_path.name}")
         return saved
@@ -369,6 +603,17 @@ class BacktestDataCollector:
         pd.DataFrame([analysis]).to_csv(metrics_path, index=False)
         return analysis
 
+    def _save_equity_stats(self):
+        """publishes the equity summary for extract_metrics and writes the daily returns for QuantStats"""
+        if self.equity_stats.first_timestamp is None:
+            # nichts geloggt: keine 0-Drawdown-Summary vortäuschen, extract_metrics fällt auf die Datei zurück
+            return
+        RUN_EQUITY_STATS[str(self.run_id)] = self.equity_stats.summary()
+        returns = self.equity_stats.daily_returns()
+        pd.DataFrame({"timestamp": returns.index.asi8, "value": returns.values}).to_csv(
+            self.path / "daily_returns.csv", index=False
+        )
+
     def _clear_memory(self):
         """
         Leert nach Persistierung alle gesammelten In-Memory-Daten
@@ -376,10 +621,10 @@ class BacktestDataCollector:
         """
         self.bars = {}
         # Nur Werte leeren, Mapping behalten
-        for k in list(self.indicators.keys()):
-            self.indicators[k].clear()
         self.indicators = {}
         self.trades = []
+        self._trades_by_id = {}
+        self._trades_by_parent = {}
 
     def save_data(self):
         """
@@ -391,7 +636,11 @@ class BacktestDataCollector:
             self.flush_all(force=True)
             bars_files = self.bars_to_csv()
             ind_files = self.indicators_to_csv()
+            # parquet footers are only written on close
+            self.sink.close()
             trades_file = self.trades_to_csv()  # Trades nicht gebatcht
+            if self.equity_stats is not None:
+                self._save_equity_stats()
             # Speicher jetzt leeren
             self._clear_memory()
             parts = []
@@ -1,6 +1,7 @@
 from dash import Input, Output, State, callback_context, html
 from dash.exceptions import PreventUpdate
 from pathlib import Path
+from core.visualizing.backtest_visualizer_prototype import find_result_files
 
 # Import both services
 from core.visualizing.dashboard.regime_analyzer.ui import build_regime_layout
@@ -168,7 +169,7 @@ def register_regime_analyzer_callbacks(app, repo):
             print(f"[REGIME] Scanning instrument path: {instrument_path}")
             
             if instrument_path.exists():
-                bar_files = list(instrument_path.glob("bars-*.csv"))
+                bar_files = find_result_files(instrument_path, "bars-*")
                 print(f"[REGIME] Found bar files: {[f.name for f in bar_files]}")
                 
                 if bar_files:
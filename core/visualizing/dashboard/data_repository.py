@@ -3,6 +3,7 @@ from pathlib import Path
 import pandas as pd
 from dataclasses import dataclass
 from core.visualizing.dashboard.slide_menu import RunValidator
+from core.visualizing.backtest_visualizer_prototype import find_result_files, read_result_file
 
 @dataclass
 class DashboardData:
@@ -129,9 +130,11 @@ class ResultsRepository:
 
         # Bars (pick the shortest timeframe as primary)
         bars_list = []
-        for f in folder.glob("bars-*.csv"):
+        # csv or parquet, depending on the collector's result sink
+        bar_files = find_result_files(folder, "bars-*")
+        for f in bar_files:
             try:
-                df = pd.read_csv(f)
+                df = read_result_file(f)
                 if not df.empty and "timestamp" in df.columns:
                     df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ns", errors="coerce")
                     df = df.dropna(subset=["timestamp"]).sort_values("timestamp").reset_index(drop=True)
@@ -176,9 +179,10 @@ class ResultsRepository:
         # Indicators
         idir = folder / "indicators"
         if idir.exists():
-            for ind_file in idir.glob("*.csv"):
+            ind_files = find_result_files(idir)
+            for ind_file in ind_files:
                 try:
-                    idf = pd.read_csv(ind_file)
+                    idf = read_result_file(ind_file)
                     if not idf.empty and "timestamp" in idf.columns:
                         try:
                             idf["timestamp"] = pd.to_datetime(idf["timestamp"], unit="ns")
@@ -2,6 +2,7 @@ from typing import Dict, List, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from core.visualizing.backtest_visualizer_prototype import find_result_file, find_result_files, read_result_file
 from .base_indicator import BaseIndicator
 from .general_indicator import GeneralIndicator
 from .chart_based_indicator import ChartBasedIndicator
@@ -36,14 +37,14 @@ class IndicatorManager:
                 return False
             
             self.csv_indicators = {}
-            csv_files = list(indicators_path.glob("*.csv"))
+            csv_files = find_result_files(indicators_path)
             print(f"[INDICATOR_MGR] Found {len(csv_files)} CSV indicator files")
             
             for csv_file in csv_files:
                 if not csv_file.name.startswith('total'):
                     indicator_name = csv_file.stem
                     try:
-                        df = pd.read_csv(csv_file)
+                        df = read_result_file(csv_file)
                         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ns')
                         df = df.sort_values('timestamp')
                         
@@ -87,8 +88,8 @@ class IndicatorManager:
             for instrument_dir in instrument_dirs:
                 print(f"[INDICATOR_MGR] Checking instrument: {instrument_dir.name}")
                 
-                # Look for bar files (bars-5M.csv, bars-15M.csv, etc.)
-                bar_files = list(instrument_dir.glob("bars-*.csv"))
+                # Look for bar files (bars-5M.csv, bars-15M.parquet, etc.)
+                bar_files = find_result_files(instrument_dir, "bars-*")
                 
                 if bar_files:
                     # Use the first bar file found (could be enhanced to select specific timeframe)
@@ -98,7 +99,7 @@ class IndicatorManager:
                     print(f"[INDICATOR_MGR] Loading bars from: {bar_file.name} (timeframe: {timeframe})")
                     
                     try:
-                        bars_df = pd.read_csv(bar_file)
+                        bars_df = read_result_file(bar_file)
                         print(f"[INDICATOR_MGR] Raw bars data shape: {bars_df.shape}")
                         print(f"[INDICATOR_MGR] Raw bars columns: {bars_df.columns.tolist()}")
                         
@@ -201,7 +202,7 @@ class IndicatorManager:
                 instrument_name = instrument_dir.name
                 
                 # Find all bar files
-                bar_files = list(instrument_dir.glob("bars-*.csv"))
+                bar_files = find_result_files(instrument_dir, "bars-*")
                 
                 timeframes = []
                 for bar_file in bar_files:
@@ -225,13 +226,13 @@ class IndicatorManager:
         print(f"[INDICATOR_MGR] Loading specific price data: {instrument} - {timeframe}")
         
         try:
-            bar_file = self.results_root / run_id / instrument / f"bars-{timeframe}.csv"
+            bar_file = find_result_file(self.results_root / run_id / instrument, f"bars-{timeframe}")
             
-            if not bar_file.exists():
-                print(f"[INDICATOR_MGR] Bar file not found: {bar_file}")
+            if bar_file is None:
+                print(f"[INDICATOR_MGR] Bar file not found: bars-{timeframe} in {self.results_root / run_id / instrument}")
                 return False
             
-            bars_df = pd.read_csv(bar_file)
+            bars_df = read_result_file(bar_file)
             print(f"[INDICATOR_MGR] Loaded {len(bars_df)} bars from {bar_file.name}")
             print(f"[INDICATOR_MGR] Raw bars columns: {bars_df.columns.tolist()}")
             
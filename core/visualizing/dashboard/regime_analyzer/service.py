@@ -6,6 +6,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.express as px
 from .indicators import IndicatorManager
+from core.visualizing.backtest_visualizer_prototype import find_result_file, read_result_file
 
 class RegimeService:
     """Advanced regime analysis service for equity performance vs indicators."""
@@ -48,9 +49,9 @@ class RegimeService:
                 print(f"[SERVICE] Run path does not exist!")
                 return False
 
-            equity_file = run_path / "total_equity.csv"
-            if equity_file.exists():
-                equity_df = pd.read_csv(equity_file)
+            equity_file = find_result_file(run_path, "total_equity")
+            if equity_file is not None:
+                equity_df = read_result_file(equity_file)
                 equity_df['timestamp'] = pd.to_datetime(equity_df['timestamp'], unit='ns')
                 equity_df = equity_df.sort_values('timestamp')
                 self.equity_data = equity_df[['timestamp', 'value']].rename(columns={'value': 'equity'})
@@ -5,6 +5,7 @@ import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.express as px
+from core.visualizing.backtest_visualizer_prototype import find_result_files, read_result_file
 
 class TradeEntryAnalyzer:
     """Advanced trade entry analysis - correlates entry features with trade PnL outcomes."""
@@ -102,14 +103,14 @@ class TradeEntryAnalyzer:
                 return False
             
             self.indicators = {}
-            csv_files = list(indicators_path.glob("*.csv"))
+            csv_files = find_result_files(indicators_path)
             print(f"[TRADE_ENTRY] Found {len(csv_files)} indicator files")
             
             for csv_file in csv_files:
                 if not csv_file.name.startswith('total'):
                     indicator_name = csv_file.stem
                     try:
-                        df = pd.read_csv(csv_file)
+                        df = read_result_file(csv_file)
                         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ns')
                         df = df.sort_values('timestamp')
                         self.indicators[indicator_name] = df[['timestamp', 'value']].rename(
@@ -3,6 +3,7 @@ from typing import Optional
 import pandas as pd
 from dash import html, dcc
 from .service import RegimeService
+from core.visualizing.backtest_visualizer_prototype import find_result_files
 
 _service: Optional[RegimeService] = None
 
@@ -47,7 +48,7 @@ def build_regime_layout(runs_df: Optional[pd.DataFrame] = None,
                     # Get timeframes for first instrument
                     if initial_instrument:
                         instrument_path = run_path / initial_instrument
-                        bar_files = list(instrument_path.glob("bars-*.csv"))
+                        bar_files = find_result_files(instrument_path, "bars-*")
                         
                         if bar_files:
                             timeframes = [f.stem.replace('bars-', '') for f in bar_files]
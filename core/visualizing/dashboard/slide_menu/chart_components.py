@@ -5,6 +5,7 @@ from pathlib import Path
 import pandas as pd
 from dash import html, dcc
 import plotly.graph_objects as go
+from core.visualizing.backtest_visualizer_prototype import find_result_file, read_result_file
 
 class EquityChartsBuilder:
     """Erstellt Equity-Kurven für ausgewählte Runs"""
@@ -158,11 +159,11 @@ class EquityChartsBuilder:
                 
             run_data = {}
             for metric in available_metrics:
-                csv_path = general_indicators_dir / f"{metric}.csv"
+                csv_path = find_result_file(general_indicators_dir, metric)
                 
-                if csv_path.exists():
+                if csv_path is not None:
                     try:
-                        df = pd.read_csv(csv_path)
+                        df = read_result_file(csv_path)
                         
                         if not df.empty and 'timestamp' in df.columns and 'value' in df.columns:
                             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ns', errors='coerce')
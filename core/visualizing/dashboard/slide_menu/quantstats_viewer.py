@@ -4,6 +4,8 @@ import quantstats as qs
 import webbrowser
 import tempfile
 from dash import html, dcc
+from tools.help_funcs.quantstats_reports import load_benchmark_returns
+from core.visualizing.backtest_visualizer_prototype import find_result_file, read_result_file
 import warnings
 try:
     import matplotlib
@@ -140,18 +142,18 @@ class QuantStatsViewer:
         return current.parents[4] / "data" / "DATA_STORAGE" / "results"
 
     def _find_equity_csv(self, run_id):
-        """Findet die total_equity.csv für einen Run"""
+        """Findet die total_equity.csv / .parquet für einen Run"""
         run_dir = self._results_dir() / run_id
         
         # check general/indicators folder first
         general_indicators_dir = run_dir / "general" / "indicators"
         if general_indicators_dir.exists():
-            equity_file = general_indicators_dir / "total_equity.csv"
-            if equity_file.exists():
+            equity_file = find_result_file(general_indicators_dir, "total_equity")
+            if equity_file is not None:
                 self._log(f"Found equity file in general: {equity_file}")
                 return equity_file
         
-        self._log(f"No total_equity.csv found for run {run_id}")
+        self._log(f"No total_equity.csv/.parquet found for run {run_id}")
         return None
 
     def _generate_quantstats_report(self, run_id, benchmark_symbol=None):
@@ -160,10 +162,10 @@ class QuantStatsViewer:
             # Equity CSV finden
             equity_csv = self._find_equity_csv(run_id)
             if not equity_csv:
-                raise FileNotFoundError(f"No total_equity.csv found for run {run_id}")
+                raise FileNotFoundError(f"No total_equity.csv/.parquet found for run {run_id}")
 
             # Equity-Kurve laden
-            equity_df = pd.read_csv(equity_csv, usecols=["timestamp", "value"])
+            equity_df = read_result_file(equity_csv, columns=["timestamp", "value"])
             equity = pd.Series(
                 equity_df["value"].values, 
                 index=pd.to_datetime(equity_df["timestamp"], unit="ns")
@@ -174,13 +176,11 @@ class QuantStatsViewer:
             equity_daily = equity.resample("1D").last().dropna()
             returns = equity_daily.pct_change(fill_method=None).dropna()
 
-            # Benchmark laden (falls angegeben)
+            # Benchmark laden (falls angegeben, lokal gecached wie bei load_qs)
             benchmark = None
             if benchmark_symbol and benchmark_symbol.strip():
                 try:
-                    benchmark = qs.utils.download_returns(benchmark_symbol)
-                    # Benchmark auf gleiche Zeitspanne beschränken
-                    benchmark = benchmark[equity_daily.index.min():equity_daily.index.max()]
+                    benchmark = load_benchmark_returns(benchmark_symbol.strip(), equity_daily.index.min(), equity_daily.index.max())
                 except Exception as e:
                     self._log(f"Warning: Could not load benchmark {benchmark_symbol}: {e}")
                     benchmark = None
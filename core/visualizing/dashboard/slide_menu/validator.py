@@ -66,12 +66,12 @@ class RunValidator:
         # Nach Sharpe sortieren (bester zuerst)
         df = df.sort_values('Sharpe', ascending=False, na_position='last')
         
-        # Ordner-Index hinzufügen (run0, run1, run2, ...)
+        # Anzeige-Index hinzufügen (Rang nach Sharpe)
         df = df.reset_index(drop=True)
         df['run_index'] = df.index
         
-        # Run-Ordner und run_config.yaml validieren
-        self._validate_run_directories(df['run_index'].tolist())
+        # Run-Ordner (Ordnername == run_id) und run_config.yaml validieren
+        self._validate_run_directories(df['run_id'].astype(str).tolist())
         
         return df
     
@@ -111,10 +111,10 @@ class RunValidator:
 
         return df_mapped
     
-    def _validate_run_directories(self, run_indices: List[int]):
+    def _validate_run_directories(self, run_ids: List[str]):
         """Validiert dass alle Run-Ordner existieren und run_config.yaml enthalten"""
-        for run_index in run_indices:
-            run_dir = self.results_dir / f"run{run_index}"
+        for run_id in run_ids:
+            run_dir = self.results_dir / run_id
             
             if not run_dir.exists():
                 raise FileNotFoundError(f"CRITICAL: Run directory not found: {run_dir}")
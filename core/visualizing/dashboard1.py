@@ -6,6 +6,7 @@ import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
 import os
+from core.visualizing.backtest_visualizer_prototype import find_result_files, read_result_file
 from dash import dash_table
 from dash import dcc
 
@@ -72,15 +73,15 @@ class TradingDashboard:
             print(f"Fehler beim Laden der neuen Struktur: {e}")
 
     def _load_collector_data(self, folder: Path):
-        """Lädt einen einzelnen Collector (bars-*.csv, trades.csv, indicators/*.csv)."""
+        """Lädt einen einzelnen Collector (bars-*, trades.csv, indicators/*; csv oder parquet)."""
         try:
             data = {"bars_df": None, "trades_df": None, "indicators_df": {}}
             # Bars (alle zusammenführen; wähle kürzestes Intervall für Hauptchart)
-            bar_files = list(folder.glob("bars-*.csv"))
+            bar_files = find_result_files(folder, "bars-*")
             bars_list = []
             for f in bar_files:
                 try:
-                    df = pd.read_csv(f)
+                    df = read_result_file(f)
                     if not df.empty and "timestamp" in df.columns:
                         df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ns")
                         df = df.sort_values("timestamp").reset_index(drop=True)
@@ -117,9 +118,9 @@ class TradingDashboard:
             # Indicators
             ind_dir = folder / "indicators"
             if ind_dir.exists():
-                for ind_file in ind_dir.glob("*.csv"):
+                for ind_file in find_result_files(ind_dir):
                     try:
-                        idf = pd.read_csv(ind_file)
+                        idf = read_result_file(ind_file)
                         if not idf.empty and "timestamp" in idf.columns:
                             idf["timestamp"] = pd.to_datetime(idf["timestamp"], unit="ns")
                             if "plot_id" not in idf.columns:
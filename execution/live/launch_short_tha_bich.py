@@ -15,6 +15,7 @@ from nautilus_trader.live.node import TradingNode
 from nautilus_trader.model.identifiers import InstrumentId, TraderId
 from nautilus_trader.portfolio.config import PortfolioConfig
 from strategies.short_tha_bich_strat import ShortThaBitchStrat, ShortThaBitchStratConfig
+from tools.help_funcs.indicator_warmup import INDICATOR_SNAPSHOT_DIR
 
 load_dotenv()
 
@@ -207,6 +208,8 @@ class ShortThaBitchLiveTrader:
             "instruments": instruments,
             "min_account_balance": 1000,
             "run_id": "live_short_tha_bich",
+            # indicator state is saved on stop and resumed on restart (only the gap is requested then)
+            "indicator_snapshot_path": str(INDICATOR_SNAPSHOT_DIR / "live_short_tha_bich.json"),
             "sl_atr_multiple": 3.0,
             "atr_period": 30,
             "time_after_listing_close": 20,
@@ -3,10 +3,11 @@ import pandas as pd
 import uuid
 from pathlib import Path
 from nautilus_trader.model.identifiers import InstrumentId, Symbol, Venue
-from nautilus_trader.backtest.config import BacktestDataConfig, BacktestVenueConfig, BacktestEngineConfig, BacktestRunConfig
-from nautilus_trader.trading.config import ImportableStrategyConfig
-from tools.help_funcs.help_funcs_execution import (_clear_directory, run_backtest, extract_metrics, load_qs, add_trade_metrics, build_data_configs)
-from tools.help_funcs.yaml_loader import load_and_split_params, set_nested_parameter
+from nautilus_trader.backtest.config import BacktestDataConfig, BacktestVenueConfig
+from tools.help_funcs.help_funcs_execution import (_clear_directory, run_backtest, extract_metrics, load_qs, build_data_configs)
+from tools.help_funcs.yaml_loader import load_and_split_params
+from tools.help_funcs.trade_metrics import merge_trade_metrics
+from tools.help_funcs.sweep_runner import SweepRunner, run_successive_halving, run_tpe_optimization, run_walk_forward, rerun_top_k_full
 import shutil
 import yaml
 import copy
@@ -15,111 +16,105 @@ import os
 import webbrowser
 from core.visualizing.dashboard.main import launch_dashbaord
 
-#STRAT PARAMETER
-
-yaml_name = "simple_meme_short.yaml"
-
-yaml_path = str(Path(__file__).resolve().parents[1] / "config" / yaml_name)
-params, param_grid, keys, values, static_params, all_instrument_ids, all_bar_types, data_sources_normalized = load_and_split_params(yaml_path)
-
-strategy_path = params["strategy_path"]
-config_path = params["config_path"]
-start_date = params["start_date"]
-end_date = params["end_date"]
-venue = params["venue"]
-visualize = params.get("visualize", True)
-load_qs_flag = params.get("load_qs", False)  # renamed to avoid clash with function
-bench_qs = params.get("qs_bench")
-
-catalog_path = str(Path(__file__).resolve().parents[1] / "data" / "DATA_STORAGE" / "data_catalog_wrangled")
-
-# Datenquellen aus YAML bauen (fallback auf Standard-Bar wenn nicht angegeben)
-data_configs = build_data_configs(
-    data_sources_normalized=data_sources_normalized,
-    all_instrument_ids=all_instrument_ids,
-    all_bar_types=all_bar_types,
-    catalog_path=catalog_path,
-)
-
-from nautilus_trader.backtest.config import ImportableFillModelConfig
-
-venue_config = BacktestVenueConfig(
-    name=str(venue),
-    oms_type=params.get("oms_type", "NETTING"),
-    account_type=params.get("account_type", "MARGIN"),
-    base_currency=params.get("base_currency", "USDT"),
-    starting_balances=[params.get("starting_account_balance", "100000 USDT")],
-    bar_adaptive_high_low_ordering=True,
-)
-
-results_dir = Path(__file__).resolve().parents[1] / "data" / "DATA_STORAGE" / "results"
-results_dir.mkdir(parents=True, exist_ok=True)
-_clear_directory(results_dir)
-
-run_configs = []
-run_ids = []
-run_params_list = []
-run_dirs = []
-
-for i, combination in enumerate(itertools.product(*values)):
-    run_id = f"run{i}"
-    run_dir = results_dir / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
-
-    run_params = dict(zip(keys, combination))
-    config_params = copy.deepcopy(static_params)
-    
-    for param_key, param_value in run_params.items():
-        if "." in param_key:
-            set_nested_parameter(config_params, param_key, param_value)
-        else:
-            config_params[param_key] = param_value
-    
-    config_params["run_id"] = run_id
-
-    strategy_config = ImportableStrategyConfig(
-        strategy_path=strategy_path,
-        config_path=config_path,
-        config=config_params,
-    )
-    engine_config = BacktestEngineConfig(strategies=[strategy_config])
-    run_config = BacktestRunConfig(
-        data=data_configs,
-        venues=[venue_config],
-        engine=engine_config,
-        start=start_date,
-        end=end_date,
+
+def main():
+    #STRAT PARAMETER
+
+    yaml_name = "simple_meme_short.yaml"
+
+    yaml_path = str(Path(__file__).resolve().parents[1] / "config" / yaml_name)
+    params, param_grid, keys, values, static_params, all_instrument_ids, all_bar_types, data_sources_normalized = load_and_split_params(yaml_path)
+
+    strategy_path = params["strategy_path"]
+    config_path = params["config_path"]
+    start_date = params["start_date"]
+    end_date = params["end_date"]
+    venue = params["venue"]
+    visualize = params.get("visualize", True)
+    load_qs_flag = params.get("load_qs", False)  # renamed to avoid clash with function
+    bench_qs = params.get("qs_bench")
+    sweep_params = params.get("sweep") or {}
+    use_cache = sweep_params.get("cache", True)
+
+    catalog_path = str(Path(__file__).resolve().parents[1] / "data" / "DATA_STORAGE" / "data_catalog_wrangled")
+
+    # Datenquellen aus YAML bauen (fallback auf Standard-Bar wenn nicht angegeben)
+    data_configs = build_data_configs(
+        data_sources_normalized=data_sources_normalized,
+        all_instrument_ids=all_instrument_ids,
+        all_bar_types=all_bar_types,
+        catalog_path=catalog_path,
     )
 
-    run_config_dict = copy.deepcopy(params)
-    run_config_dict.update(run_params)
-    run_config_dict.update(static_params)
-    run_config_dict["run_id"] = run_id
-    with open(run_dir / "run_config.yaml", "w", encoding="utf-8") as f:
-        yaml.dump(run_config_dict, f, allow_unicode=True, sort_keys=False)
-
-    run_configs.append(run_config)
-    run_ids.append(run_id)
-    run_params_list.append(run_params)
-    run_dirs.append(run_dir)
-
-results = run_backtest(run_configs)
-
-all_metrics = []
-for result, run_id, run_params, run_dir in zip(results, run_ids, run_params_list, run_dirs):
-    metrics = extract_metrics(result, run_params, run_id)
-    pd.DataFrame([metrics]).to_csv(run_dir / "performance_metrics.csv", index=False)
-    all_metrics.append(metrics)
-
-df_all = pd.DataFrame(all_metrics)
-file_path = results_dir / "all_backtest_results.csv"
-df_all.to_csv(file_path, index=False)
-add_trade_metrics(run_ids, results_dir, file_path, all_instrument_ids)
-print("Finished Backtest runs. Results saved to:", results_dir)
-
-if load_qs_flag:
-    load_qs(run_dirs, run_ids, benchmark_symbol=bench_qs, open_browser=True)
-
-if visualize:
-    dash = launch_dashbaord()
-    dash.run(debug=True, host="127.0.0.1", port=8050, use_reloader=False)
+    from nautilus_trader.backtest.config import ImportableFillModelConfig
+
+    venue_params = {
+        "name": str(venue),
+        "oms_type": params.get("oms_type", "NETTING"),
+        "account_type": params.get("account_type", "MARGIN"),
+        "base_currency": params.get("base_currency", "USDT"),
+        "starting_balances": [params.get("starting_account_balance", "100000 USDT")],
+    }
+    venue_config = BacktestVenueConfig(**venue_params, bar_adaptive_high_low_ordering=True)
+
+    results_dir = Path(__file__).resolve().parents[1] / "data" / "DATA_STORAGE" / "results"
+    results_dir.mkdir(parents=True, exist_ok=True)
+    if not use_cache:
+        _clear_directory(results_dir)
+
+    # run ids are content hashes -> unchanged combinations map onto their existing result folders
+    runner = SweepRunner(
+        params=params,
+        static_params=static_params,
+        data_configs=data_configs,
+        data_sources_normalized=data_sources_normalized,
+        venue_config=venue_config,
+        venue_params=venue_params,
+        results_dir=results_dir,
+        sweep_params=sweep_params,
+    )
+    sweep_mode = sweep_params.get("mode", "grid")
+    # tpe samples the grid lists lazily, the other modes need the full product
+    combinations = [] if sweep_mode == "tpe" else [dict(zip(keys, c)) for c in itertools.product(*values)]
+    if sweep_mode == "halving":
+        final_runs = run_successive_halving(runner, combinations)
+    elif sweep_mode == "walk_forward":
+        final_runs = run_walk_forward(runner, combinations)
+    elif sweep_mode == "tpe":
+        final_runs = run_tpe_optimization(runner, keys, values)
+    elif sweep_mode == "grid":
+        final_runs = runner.execute([runner.prepare_run(run_params) for run_params in combinations])
+    else:
+        raise ValueError(f"Unbekannter sweep.mode: {sweep_mode!r} (erlaubt: grid, halving, tpe, walk_forward)")
+
+    final_runs = rerun_top_k_full(runner, final_runs)
+    # cached folders of earlier grids would otherwise show up in the dashboard / regime analyzer
+    runner.prune_stale_runs()
+
+    # summary is rebuilt from cached and new runs of the current grid
+    finished_runs = [run for run in final_runs if run.metrics is not None]
+    run_ids = [run.run_id for run in finished_runs]
+    run_dirs = [run.run_dir for run in finished_runs]
+    df_all = pd.DataFrame([run.metrics for run in finished_runs])
+    df_all = merge_trade_metrics(df_all, results_dir, all_instrument_ids)
+    df_all.to_csv(results_dir / "all_backtest_results.csv", index=False)
+    print("Finished Backtest runs. Results saved to:", results_dir)
+
+    if load_qs_flag:
+        # only the best qs_top_k runs by sweep.metric get a report ("all" -> every run)
+        qs_top_k = params.get("qs_top_k", 10)
+        load_qs(
+            run_dirs, run_ids, benchmark_symbol=bench_qs, open_browser=True, metrics_df=df_all,
+            top_k=None if qs_top_k == "all" else qs_top_k,
+            metric=sweep_params.get("metric", "Sharpe Ratio (252 days)"),
+            maximize=sweep_params.get("maximize", True),
+            workers=sweep_params.get("workers") if isinstance(sweep_params.get("workers"), int) else None,
+        )
+
+    if visualize:
+        dash = launch_dashbaord()
+        dash.run(debug=True, host="127.0.0.1", port=8050, use_reloader=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,9 @@ class RSITickSimpleStrategyConfig(StrategyConfig):
     rsi_oversold: float
     run_id: str
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
 
 class RSITickSimpleStrategy(BaseStrategy, Strategy):
     def __init__(self, config: RSITickSimpleStrategyConfig):
@@ -33,6 +33,9 @@ class VWAPTrendStrategyConfig(StrategyConfig):
     tp_atr_multiplier: float = 4.0
     atr_period: int = 14
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
     only_trade_rth: bool = True
     require_PDH_PDL_broken: bool = True
 
@@ -215,7 +218,8 @@ class VWAPTrendStrategy(BaseStrategy, Strategy):
             
         self.entry_logic(bar, current_instrument, prev_close, choch_signal)
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
     def entry_logic(self, bar: Bar, current_instrument: Dict[str, Any], prev_close: float = None, choch_signal=None):
         # Only enter trades during RTH
@@ -354,20 +358,19 @@ class VWAPTrendStrategy(BaseStrategy, Strategy):
             # Log VWAP and bands
             current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="vwap", value=float(vwap_indicator.value))
             
-            # 1-sigma bands
-            _, upper_1, lower_1 = vwap_indicator.get_bands(1.0)
+            # 1/2/3-sigma bands from one variance calculation
+            bands = vwap_indicator.get_bands_multi((1.0, 2.0, 3.0))
+            upper_1, lower_1 = bands[1.0]
             if upper_1 is not None:
                 current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="vwap_upper_band", value=float(upper_1))
                 current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="vwap_lower_band", value=float(lower_1))
             
-            # 2-sigma bands
-            _, upper_2, lower_2 = vwap_indicator.get_bands(2.0)
+            upper_2, lower_2 = bands[2.0]
             if upper_2 is not None:
                 current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="vwap_upper_band_2", value=float(upper_2))
                 current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="vwap_lower_band_2", value=float(lower_2))
             
-            # 3-sigma bands
-            _, upper_3, lower_3 = vwap_indicator.get_bands(3.0)
+            upper_3, lower_3 = bands[3.0]
             if upper_3 is not None:
                 current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="vwap_upper_band_3", value=float(upper_3))
                 current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="vwap_lower_band_3", value=float(lower_3))
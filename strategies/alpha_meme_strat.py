@@ -29,6 +29,9 @@ class AlphaMemeStrategyConfig(StrategyConfig):
     rsi_oversold: float
     run_id: str
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
 
 
 class AlphaMemeStrategy(BaseStrategy, Strategy):
@@ -80,7 +83,8 @@ class AlphaMemeStrategy(BaseStrategy, Strategy):
             return
         self.entry_logic(bar, current_instrument)
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
     def entry_logic(self, bar: Bar, current_instrument: Dict[str, Any]):
         instrument_id = bar.bar_type.instrument_id
@@ -1,4 +1,6 @@
 from datetime import datetime, time, timezone, timedelta
+from functools import partial
+from operator import attrgetter
 from typing import Any, Dict, Optional, List
 from nautilus_trader.trading import Strategy
 from nautilus_trader.trading.config import StrategyConfig
@@ -14,6 +16,7 @@ from nautilus_trader.indicators.volatility import AverageTrueRange
 from tools.help_funcs.base_strategy import BaseStrategy
 from tools.order_management.order_types import OrderTypes
 from tools.order_management.risk_manager import RiskManager
+from tools.help_funcs.rolling_stats import DAY_NS, RollingTimeSum
 from data.download.crypto_downloads.custom_class.metrics_data import MetricsData
 
 
@@ -186,9 +189,189 @@ class CoinFullConfig(StrategyConfig):
     only_execute_short: bool = False
     hold_profit_for_remaining_days: bool = False
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
+
+
+# ----------------------------------------------------------------
+# rule pipeline: per-system indicator update / warm-up check / visualization,
+# compiled into lists of the enabled systems in CoinFullStrategy.compile_rule_pipeline
+# ----------------------------------------------------------------
+
+def _indicator_value(indicator) -> Optional[float]:
+    return float(indicator.value) if indicator.value is not None else None
+
+
+def _update_directional_movement(bar, current_instrument):
+    current_instrument.directional_movement.handle_bar(bar)
+
+
+def _update_htf_ema(bar, current_instrument):
+    current_instrument.htf_ema.handle_bar(bar)
+
+
+def _update_entry_trend_ema(bar, current_instrument):
+    current_instrument.entry_trend_ema.handle_bar(bar)
+
+
+def _update_exit_trend_ema(bar, current_instrument):
+    current_instrument.exit_trend_ema.handle_bar(bar)
+
+
+def _update_spike(bar, current_instrument):
+    current_instrument.spike_atr.handle_bar(bar)
+    current_instrument.reversion_ema.handle_bar(bar)
+
+
+def _update_rsi(bar, current_instrument):
+    current_instrument.rsi.handle_bar(bar)
+
+
+def _update_macd(bar, current_instrument):
+    macd = current_instrument.macd
+    macd.handle_bar(bar)
+    # Update signal line EMA with MACD value
+    if macd.initialized:
+        current_instrument.macd_signal_ema.update_raw(macd.value)
+
+
+def _update_donchian(bar, current_instrument):
+    donchian = current_instrument.donchian
+    # Store previous values before updating for breakout detection
+    if donchian.initialized:
+        current_instrument.prev_donchian_upper = float(donchian.upper)
+        current_instrument.prev_donchian_lower = float(donchian.lower)
+    donchian.handle_bar(bar)
+
+
+def _update_aroon(bar, current_instrument):
+    current_instrument.aroon.handle_bar(bar)
+
+
+def _update_rsi_exit(bar, current_instrument):
+    rsi_exit = current_instrument.rsi_exit
+    if rsi_exit:
+        rsi_exit.handle_bar(bar)
+
+
+def _update_macd_exit(bar, current_instrument):
+    macd_exit = current_instrument.macd_exit
+    macd_exit_signal = current_instrument.macd_exit_signal
+    if macd_exit and macd_exit_signal:
+        macd_exit.handle_bar(bar)
+        if macd_exit.initialized:
+            macd_exit_signal.update_raw(macd_exit.value)
+
+
+def _ready_entry_trend_ema(current_instrument) -> bool:
+    return current_instrument.entry_trend_ema.initialized
+
+
+def _ready_spike(current_instrument) -> bool:
+    return current_instrument.reversion_ema.initialized
+
+
+def _ready_rsi(current_instrument) -> bool:
+    return current_instrument.rsi.initialized
+
+
+def _ready_macd(current_instrument) -> bool:
+    return current_instrument.macd.initialized and current_instrument.macd_signal_ema.initialized
+
+
+def _ready_donchian(current_instrument) -> bool:
+    return current_instrument.donchian.initialized
+
+
+def _ready_aroon(current_instrument) -> bool:
+    return current_instrument.aroon.initialized
+
+
+def _ready_macd_exit(current_instrument) -> bool:
+    macd_exit = current_instrument.macd_exit
+    macd_exit_signal = current_instrument.macd_exit_signal
+    return bool(macd_exit and macd_exit_signal and macd_exit.initialized and macd_exit_signal.initialized)
+
+
+def _visualize_ema(key):
+    get_ema = attrgetter(key)
+
+    def visualize(bar, current_instrument):
+        current_instrument.collector.add_indicator(timestamp=bar.ts_event, name=key, value=_indicator_value(get_ema(current_instrument)))
+    return visualize
+
+
+def _visualize_directional_movement(bar, current_instrument):
+    dm = current_instrument.directional_movement
+    di_diff_value = abs(dm.pos - dm.neg) if dm and dm.initialized else None
+    current_instrument.collector.add_indicator(timestamp=bar.ts_event, name="di_diff", value=di_diff_value)
+
+
+def _visualize_rsi(show_levels: bool):
+    def visualize(bar, current_instrument):
+        collector = current_instrument.collector
+        collector.add_indicator(timestamp=bar.ts_event, name="rsi", value=_indicator_value(current_instrument.rsi))
+        # Add condition mode visualization
+        if show_levels:
+            collector.add_indicator(timestamp=bar.ts_event, name="rsi_overbought_level", value=current_instrument.rsi_overbought)
+            collector.add_indicator(timestamp=bar.ts_event, name="rsi_oversold_level", value=current_instrument.rsi_oversold)
+    return visualize
+
+
+def _visualize_macd(macd_key, signal_key, macd_name, signal_name):
+    get_macd = attrgetter(macd_key)
+    get_signal = attrgetter(signal_key)
+
+    def visualize(bar, current_instrument):
+        macd = get_macd(current_instrument)
+        macd_signal = get_signal(current_instrument)
+        if macd and macd.value is not None and macd_signal and macd_signal.value is not None:
+            current_instrument.collector.add_indicator(timestamp=bar.ts_event, name=macd_name, value=float(macd.value))
+            current_instrument.collector.add_indicator(timestamp=bar.ts_event, name=signal_name, value=float(macd_signal.value))
+    return visualize
+
+
+def _visualize_aroon(bar, current_instrument):
+    current_instrument.collector.add_indicator(timestamp=bar.ts_event, name="aroon_osc", value=_indicator_value(current_instrument.aroon))
+
+
+def _visualize_donchian(bar, current_instrument):
+    donchian = current_instrument.donchian
+    collector = current_instrument.collector
+    for name, value in (("donchian_upper", donchian.upper), ("donchian_lower", donchian.lower), ("donchian_middle", donchian.middle)):
+        collector.add_indicator(timestamp=bar.ts_event, name=name, value=float(value) if value is not None else None)
+
+
+def _visualize_rsi_exit(bar, current_instrument):
+    rsi_exit = current_instrument.rsi_exit
+    if rsi_exit and rsi_exit.value is not None:
+        current_instrument.collector.add_indicator(timestamp=bar.ts_event, name="rsi_exit", value=float(rsi_exit.value))
 
 
 class CoinFullStrategy(BaseStrategy,Strategy):
+    instrument_state_fields = (
+        "aroon", "aroon_osc_long_threshold", "aroon_osc_short_threshold", "atr", "bars_above_ema",
+        "bars_above_reversion_ema", "bars_below_ema", "bars_below_reversion_ema", "bars_over_ema_exit", "bars_since_entry",
+        "bars_under_ema_exit", "collector", "count_long_short_ratio", "directional_movement", "donchian",
+        "ema_exit_qualified", "entry_trend_ema", "exit_trend_ema", "htf_ema", "in_long_position",
+        "in_short_position", "latest_open_interest_value", "long_entry_price", "macd", "macd_exit",
+        "macd_exit_signal", "macd_signal_ema", "max_extreme_topt_long", "max_topt_difference_since_entry", "min_24h_volume",
+        "min_breakout_strength", "min_di_diff", "min_extreme_topt_short", "min_price", "min_sum_open_interest_value",
+        "min_topt_difference_since_entry", "only_trade_rth", "prev_bar_close", "prev_donchian_lower", "prev_donchian_upper",
+        "prev_macd_exit_line", "prev_macd_exit_signal", "prev_macd_line", "prev_macd_signal",
+        "reversion_ema", "rolling_24h_dollar_volume", "rolling_24h_volume", "rsi", "rsi_exit",
+        "rsi_overbought", "rsi_oversold", "rth_end_hour", "rth_end_minute", "rth_start_hour",
+        "rth_start_minute", "short_entry_price", "sl_atr_multiple", "sl_price", "spike_atr",
+        "spike_atr_threshold", "sum_taker_long_short_vol_ratio", "sum_toptrader_long_short_ratio", "use_min_coin_filters", "volume_window",
+    )
+    # start values of fields that are read before their first assignment, all others start as None (checked with `is None`)
+    instrument_state_defaults = {
+        "bars_over_ema_exit": 0, "bars_under_ema_exit": 0, "count_long_short_ratio": 0.0, "ema_exit_qualified": False,
+        "latest_open_interest_value": 0.0, "rolling_24h_dollar_volume": 0.0, "sum_toptrader_long_short_ratio": 0.0,
+        "use_min_coin_filters": True,
+    }
+
     def __init__(self, config: CoinFullConfig):
         super().__init__(config)
         self.risk_manager = RiskManager(config)
@@ -208,81 +391,81 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             
             if exp_growth_config.get("enabled", False):
                 atr_period = exp_growth_config.get("atr_period", 14)
-                current_instrument["sl_atr_multiple"] = exp_growth_config.get("atr_multiple", 2.0)
+                current_instrument.sl_atr_multiple = exp_growth_config.get("atr_multiple", 2.0)
             elif log_growth_config.get("enabled", False):
                 atr_period = log_growth_config.get("atr_period", 14)
-                current_instrument["sl_atr_multiple"] = log_growth_config.get("atr_multiple", 2.0)
+                current_instrument.sl_atr_multiple = log_growth_config.get("atr_multiple", 2.0)
             else:
-                current_instrument["sl_atr_multiple"] = self.config.sl_atr_multiple
+                current_instrument.sl_atr_multiple = self.config.sl_atr_multiple
             
-            current_instrument["atr"] = AverageTrueRange(atr_period)
-            current_instrument["sl_price"] = None
+            current_instrument.atr = AverageTrueRange(atr_period)
+            current_instrument.sl_price = None
 
             # directional movement filter
             dm_config = self.config.use_directional_movement_filter
             dm_period = dm_config.get("period", 14)
-            current_instrument["directional_movement"] = DirectionalMovement(dm_period)
-            current_instrument["min_di_diff"] = dm_config.get("min_di_diff", 0.02)
+            current_instrument.directional_movement = DirectionalMovement(dm_period)
+            current_instrument.min_di_diff = dm_config.get("min_di_diff", 0.02)
 
             # htf ema bias filter
             htf_ema_config = self.config.use_htf_ema_bias_filter
             htf_ema_period = htf_ema_config.get("ema_period", 200)
-            current_instrument["htf_ema"] = ExponentialMovingAverage(htf_ema_period)
+            current_instrument.htf_ema = ExponentialMovingAverage(htf_ema_period)
 
             # aroon filter
             aroon_config = self.config.use_aroon_simple_trend_system
             aroon_period = aroon_config.get("aroon_period", 14)
             aroon_osc_long_threshold = aroon_config.get("aroon_osc_long_threshold", 50)
             aroon_osc_short_threshold = aroon_config.get("aroon_osc_short_threshold", -50)
-            current_instrument["aroon"] = AroonOscillator(aroon_period)
-            current_instrument["aroon_osc_long_threshold"] = aroon_osc_long_threshold   
-            current_instrument["aroon_osc_short_threshold"] = aroon_osc_short_threshold
+            current_instrument.aroon = AroonOscillator(aroon_period)
+            current_instrument.aroon_osc_long_threshold = aroon_osc_long_threshold   
+            current_instrument.aroon_osc_short_threshold = aroon_osc_short_threshold
 
             # donchian channel
             donchian_config = self.config.use_donchian_breakout_system
             donchian_period = donchian_config.get("donchian_period", 20)
             min_breakout_strength = donchian_config.get("min_breakout_strength", 0.5)
-            current_instrument["donchian"] = DonchianChannel(donchian_period)
-            current_instrument["min_breakout_strength"] = min_breakout_strength
+            current_instrument.donchian = DonchianChannel(donchian_period)
+            current_instrument.min_breakout_strength = min_breakout_strength
 
             # spike basic
             spike_config = self.config.use_spike_reversion_system
             spike_atr_period = spike_config.get("spike_atr_period", 20)
             reversion_ema_period = spike_config.get("reversion_ema_period", 25)
-            current_instrument["spike_atr"] = AverageTrueRange(spike_atr_period)
-            current_instrument["reversion_ema"] = ExponentialMovingAverage(reversion_ema_period)
-            current_instrument["spike_atr_threshold"] = spike_config.get("spike_atr_threshold", 2.5)
+            current_instrument.spike_atr = AverageTrueRange(spike_atr_period)
+            current_instrument.reversion_ema = ExponentialMovingAverage(reversion_ema_period)
+            current_instrument.spike_atr_threshold = spike_config.get("spike_atr_threshold", 2.5)
 
             # macd simple reversion
             macd_config = self.config.use_macd_simple_reversion_system
             macd_fast_period = macd_config.get("macd_fast_period", 12)
             macd_slow_period = macd_config.get("macd_slow_period", 26)
             macd_signal_period = macd_config.get("macd_signal_period", 9)
-            current_instrument["macd"] = MovingAverageConvergenceDivergence(macd_fast_period, macd_slow_period)
-            current_instrument["macd_signal_ema"] = ExponentialMovingAverage(macd_signal_period)
-            current_instrument["prev_macd_line"] = None
-            current_instrument["prev_macd_signal"] = None
+            current_instrument.macd = MovingAverageConvergenceDivergence(macd_fast_period, macd_slow_period)
+            current_instrument.macd_signal_ema = ExponentialMovingAverage(macd_signal_period)
+            current_instrument.prev_macd_line = None
+            current_instrument.prev_macd_signal = None
 
             # rsi simple reversion
             rsi_config = self.config.use_rsi_simple_reversion_system
             rsi_period = rsi_config.get("rsi_period", 14)
-            current_instrument["rsi"] = RelativeStrengthIndex(rsi_period)
-            current_instrument["rsi_overbought"] = rsi_config.get("rsi_overbought", 70)
-            current_instrument["rsi_oversold"] = rsi_config.get("rsi_oversold", 30)
+            current_instrument.rsi = RelativeStrengthIndex(rsi_period)
+            current_instrument.rsi_overbought = rsi_config.get("rsi_overbought", 70)
+            current_instrument.rsi_oversold = rsi_config.get("rsi_oversold", 30)
 
             # trend basic
             trend_config = self.config.use_trend_following_setup
             entry_trend_ema_period = trend_config.get("entry_trend_ema_period", 40)
-            current_instrument["entry_trend_ema"] = ExponentialMovingAverage(entry_trend_ema_period)
+            current_instrument.entry_trend_ema = ExponentialMovingAverage(entry_trend_ema_period)
             
             # exit methods
             exit_config = self.config.use_close_ema
             exit_trend_ema_period = exit_config.get("exit_trend_ema_period", 120)
-            current_instrument["exit_trend_ema"] = ExponentialMovingAverage(exit_trend_ema_period)
+            current_instrument.exit_trend_ema = ExponentialMovingAverage(exit_trend_ema_period)
             if self.config.use_rsi_as_exit.get("enabled", False):
                 rsi_exit_config = self.config.use_rsi_as_exit
                 rsi_exit_period = rsi_exit_config.get("rsi_period", 20)
-                current_instrument["rsi_exit"] = RelativeStrengthIndex(rsi_exit_period)
+                current_instrument.rsi_exit = RelativeStrengthIndex(rsi_exit_period)
                 
             # macd exit system
             if self.config.use_macd_exit_system.get("enabled", False):
@@ -290,84 +473,167 @@ class CoinFullStrategy(BaseStrategy,Strategy):
                 macd_exit_fast = macd_exit_config.get("macd_fast_exit_period", 10)
                 macd_exit_slow = macd_exit_config.get("macd_slow_exit_period", 32)
                 macd_exit_signal = macd_exit_config.get("macd_signal_exit_period", 10)
-                current_instrument["macd_exit"] = MovingAverageConvergenceDivergence(macd_exit_fast, macd_exit_slow)
-                current_instrument["macd_exit_signal"] = ExponentialMovingAverage(macd_exit_signal)
-                current_instrument["prev_macd_exit_line"] = None
-                current_instrument["prev_macd_exit_signal"] = None
-            current_instrument["prev_bar_close"] = None
-            current_instrument["short_entry_price"] = None
-            current_instrument["long_entry_price"] = None
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["bars_above_ema"] = 0  # For trend following entry logic
-            current_instrument["bars_below_ema"] = 0  # For trend following entry logic
-            current_instrument["bars_above_reversion_ema"] = 0
-            current_instrument["bars_below_reversion_ema"] = 0
-            current_instrument["bars_over_ema_exit"] = 0
-            current_instrument["bars_under_ema_exit"] = 0
-            current_instrument["max_extreme_topt_long"] = None
-            current_instrument["min_extreme_topt_short"] = None
-            current_instrument["in_short_position"] = False
-            current_instrument["in_long_position"] = False
+                current_instrument.macd_exit = MovingAverageConvergenceDivergence(macd_exit_fast, macd_exit_slow)
+                current_instrument.macd_exit_signal = ExponentialMovingAverage(macd_exit_signal)
+                current_instrument.prev_macd_exit_line = None
+                current_instrument.prev_macd_exit_signal = None
+            current_instrument.prev_bar_close = None
+            current_instrument.short_entry_price = None
+            current_instrument.long_entry_price = None
+            current_instrument.bars_since_entry = 0
+            current_instrument.bars_above_ema = 0  # For trend following entry logic
+            current_instrument.bars_below_ema = 0  # For trend following entry logic
+            current_instrument.bars_above_reversion_ema = 0
+            current_instrument.bars_below_reversion_ema = 0
+            current_instrument.bars_over_ema_exit = 0
+            current_instrument.bars_under_ema_exit = 0
+            current_instrument.max_extreme_topt_long = None
+            current_instrument.min_extreme_topt_short = None
+            current_instrument.in_short_position = False
+            current_instrument.in_long_position = False
             
             # rth
-            current_instrument["only_trade_rth"] = self.config.only_trade_rth
-            current_instrument["rth_start_hour"] = 14
-            current_instrument["rth_start_minute"] = 30
-            current_instrument["rth_end_hour"] = 21
-            current_instrument["rth_end_minute"] = 0
+            current_instrument.only_trade_rth = self.config.only_trade_rth
+            current_instrument.rth_start_hour = 14
+            current_instrument.rth_start_minute = 30
+            current_instrument.rth_end_hour = 21
+            current_instrument.rth_end_minute = 0
             
             # toptrader metrics (for exit method only)
-            current_instrument["sum_toptrader_long_short_ratio"] = 0.0
-            current_instrument["count_long_short_ratio"] = 0.0
+            current_instrument.sum_toptrader_long_short_ratio = 0.0
+            current_instrument.count_long_short_ratio = 0.0
 
             # coin filters
             coin_filters = self.config.use_min_coin_filters
-            current_instrument["use_min_coin_filters"] = coin_filters.get("enabled", True)
-            current_instrument["min_price"] = coin_filters.get("min_price", 0.1)
-            current_instrument["min_24h_volume"] = coin_filters.get("min_24h_volume", 5000000)
-            current_instrument["min_sum_open_interest_value"] = coin_filters.get("min_sum_open_interest_value", 500000)
-            current_instrument["volume_history"] = []
-            current_instrument["price_history"] = []
-            current_instrument["rolling_24h_volume"] = 0.0
-            current_instrument["rolling_24h_dollar_volume"] = 0.0
-            current_instrument["latest_open_interest_value"] = 0.0
+            current_instrument.use_min_coin_filters = coin_filters.get("enabled", True)
+            current_instrument.min_price = coin_filters.get("min_price", 0.1)
+            current_instrument.min_24h_volume = coin_filters.get("min_24h_volume", 5000000)
+            current_instrument.min_sum_open_interest_value = coin_filters.get("min_sum_open_interest_value", 500000)
+            current_instrument.volume_window = RollingTimeSum(DAY_NS, width=2)
+            current_instrument.rolling_24h_volume = 0.0
+            current_instrument.rolling_24h_dollar_volume = 0.0
+            current_instrument.latest_open_interest_value = 0.0
 
             # visualize - only show indicators for enabled systems
             if self.config.use_trend_following_setup.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("entry_trend_ema", 0)
+                current_instrument.collector.initialise_logging_indicator("entry_trend_ema", 0)
             if self.config.use_close_ema.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("exit_trend_ema", 0)
+                current_instrument.collector.initialise_logging_indicator("exit_trend_ema", 0)
             if self.config.use_spike_reversion_system.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("reversion_ema", 0)
+                current_instrument.collector.initialise_logging_indicator("reversion_ema", 0)
             if self.config.use_htf_ema_bias_filter.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("htf_ema", 0)
+                current_instrument.collector.initialise_logging_indicator("htf_ema", 0)
             if self.config.use_directional_movement_filter.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("di_diff", 2)
+                current_instrument.collector.initialise_logging_indicator("di_diff", 2)
             if self.config.use_rsi_simple_reversion_system.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("rsi", 1)
+                current_instrument.collector.initialise_logging_indicator("rsi", 1)
                 usage_method = self.config.use_rsi_simple_reversion_system.get("usage_method", "execution")
                 if usage_method == "condition":
-                    current_instrument["collector"].initialise_logging_indicator("rsi_overbought_level", 1)
-                    current_instrument["collector"].initialise_logging_indicator("rsi_oversold_level", 1)
+                    current_instrument.collector.initialise_logging_indicator("rsi_overbought_level", 1)
+                    current_instrument.collector.initialise_logging_indicator("rsi_oversold_level", 1)
             if self.config.use_macd_simple_reversion_system.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("macd", 1)
-                current_instrument["collector"].initialise_logging_indicator("macd_signal", 1)
+                current_instrument.collector.initialise_logging_indicator("macd", 1)
+                current_instrument.collector.initialise_logging_indicator("macd_signal", 1)
             if self.config.use_aroon_simple_trend_system.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("aroon_osc", 1)
+                current_instrument.collector.initialise_logging_indicator("aroon_osc", 1)
             if self.config.use_donchian_breakout_system.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("donchian_upper", 0)
-                current_instrument["collector"].initialise_logging_indicator("donchian_lower", 0)
-                current_instrument["collector"].initialise_logging_indicator("donchian_middle", 0)
+                current_instrument.collector.initialise_logging_indicator("donchian_upper", 0)
+                current_instrument.collector.initialise_logging_indicator("donchian_lower", 0)
+                current_instrument.collector.initialise_logging_indicator("donchian_middle", 0)
             if self.config.use_rsi_as_exit.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("rsi_exit", 1)
+                current_instrument.collector.initialise_logging_indicator("rsi_exit", 1)
             if self.config.use_macd_exit_system.get("enabled", False):
-                current_instrument["collector"].initialise_logging_indicator("macd_exit", 1)
-                current_instrument["collector"].initialise_logging_indicator("macd_exit_signal", 1)
+                current_instrument.collector.initialise_logging_indicator("macd_exit", 1)
+                current_instrument.collector.initialise_logging_indicator("macd_exit_signal", 1)
 
 
     def on_start(self): 
         super().on_start()
+        self.compile_rule_pipeline()
         self._subscribe_to_metrics_data()
+
+    def _system_config(self, name: str) -> Dict[str, Any]:
+        system_config = getattr(self.config, name, None)
+        return system_config if isinstance(system_config, dict) else {}
+
+    def _system_enabled(self, name: str) -> bool:
+        return self._system_config(name).get("enabled", False)
+
+    def compile_rule_pipeline(self) -> None:
+        """
+        resolves the use_* switches once: on_bar / update_visualizer_data / exits only walk the
+        enabled systems (indicator updates, warm-up checks, visuals, entry setups, exit checks in original order),
+        setup / exit parameters are read from the config here and bound to the rules
+        """
+        rsi_levels = self._system_config("use_rsi_simple_reversion_system").get("usage_method", "execution") == "condition"
+        # entry filters
+        self.use_directional_movement_filter = self._system_enabled("use_directional_movement_filter")
+        self.use_htf_ema_bias_filter = self._system_enabled("use_htf_ema_bias_filter")
+        self.use_rsi_condition_filter = self._system_enabled("use_rsi_simple_reversion_system") and rsi_levels
+        # (switch, indicator update, warm-up check, visualization) in the order of the former on_bar branches
+        systems = (
+            ("use_directional_movement_filter", _update_directional_movement, None, _visualize_directional_movement),
+            ("use_htf_ema_bias_filter", _update_htf_ema, None, _visualize_ema("htf_ema")),
+            ("use_trend_following_setup", _update_entry_trend_ema, _ready_entry_trend_ema, _visualize_ema("entry_trend_ema")),
+            ("use_close_ema", _update_exit_trend_ema, None, _visualize_ema("exit_trend_ema")),
+            ("use_spike_reversion_system", _update_spike, _ready_spike, _visualize_ema("reversion_ema")),
+            ("use_rsi_simple_reversion_system", _update_rsi, _ready_rsi, _visualize_rsi(rsi_levels)),
+            ("use_macd_simple_reversion_system", _update_macd, _ready_macd, _visualize_macd("macd", "macd_signal_ema", "macd", "macd_signal")),
+            ("use_donchian_breakout_system", _update_donchian, _ready_donchian, _visualize_donchian),
+            ("use_aroon_simple_trend_system", _update_aroon, _ready_aroon, _visualize_aroon),
+            ("use_rsi_as_exit", _update_rsi_exit, None, _visualize_rsi_exit),
+            ("use_macd_exit_system", _update_macd_exit, _ready_macd_exit, _visualize_macd("macd_exit", "macd_exit_signal", "macd_exit", "macd_exit_signal")),
+        )
+        enabled = [system for system in systems if self._system_enabled(system[0])]
+        self.indicator_rules = [update for _, update, _, _ in enabled]
+        self.ready_rules = [ready for _, _, ready, _ in enabled if ready is not None]
+        self.visual_rules = [visualize for _, _, _, visualize in enabled]
+
+        spike_config = self._system_config("use_spike_reversion_system")
+        trend_config = self._system_config("use_trend_following_setup")
+        entry_setups = (
+            ("use_donchian_breakout_system", self.donchian_breakout_setup),
+            ("use_aroon_simple_trend_system", self.aroon_simple_trend_setup),
+            ("use_macd_simple_reversion_system", self.macd_simple_reversion_setup),
+            ("use_spike_reversion_system", partial(
+                self.spike_reversion_setup,
+                min_bars_over_ema=spike_config.get("min_bars_spike_over_ema", 12),
+                min_bars_under_ema=spike_config.get("min_bars_spike_under_ema", 12),
+            )),
+            # usage_method "condition" only filters the other setups (use_rsi_condition_filter)
+            ("use_rsi_simple_reversion_system", None if rsi_levels else self.rsi_simple_reversion_setup),
+            ("use_trend_following_setup", partial(
+                self.trend_following_setup,
+                min_bars_under_ema=trend_config.get("min_bars_under_ema", 20),
+                min_bars_over_ema=trend_config.get("min_bars_over_ema", 20),
+            )),
+        )
+        self.entry_rules = [setup for name, setup in entry_setups if setup is not None and self._system_enabled(name)]
+
+        # exit checks (bar, current_instrument, position) -> bool, first hit closes the position
+        close_ema_config = self._system_config("use_close_ema")
+        topt_config = self._system_config("use_topt_ratio_as_exit")
+        rr_ratio = self._system_config("use_fixed_rr").get("rr_tp_ratio", 1.5)
+        rsi_short_exit_threshold = self._system_config("use_rsi_as_exit").get("rsi_short_exit_threshold", 0.3)
+        ema_min_bars_long = close_ema_config.get("min_bars_under_ema", 40)
+        ema_min_bars_short = close_ema_config.get("min_bars_over_ema", 40)
+        topt_reversal_long = topt_config.get("long_min_extreme_reversal_topt_longshortratio", 0.3)
+        topt_reversal_short = topt_config.get("short_min_extreme_reversal_topt_longshortratio", 0.3)
+        long_exits = (
+            ("use_close_ema", lambda bar, ci, position: self.check_ema_exit_long(bar, ci, ema_min_bars_long)),
+            ("use_topt_ratio_as_exit", lambda bar, ci, position: self.check_topt_ratio_exit_long(bar, ci, topt_reversal_long)),
+            ("use_fixed_rr", partial(self.check_fixed_rr_exit_long, rr_ratio=rr_ratio)),
+            ("use_macd_exit_system", lambda bar, ci, position: self.check_macd_exit_long(bar, ci)),
+        )
+        short_exits = (
+            ("use_close_ema", lambda bar, ci, position: self.check_ema_exit_short(bar, ci, ema_min_bars_short)),
+            ("use_rsi_as_exit", lambda bar, ci, position: self.check_rsi_exit_short(bar, ci, rsi_short_exit_threshold)),
+            ("use_topt_ratio_as_exit", lambda bar, ci, position: self.check_topt_ratio_exit_short(bar, ci, topt_reversal_short)),
+            ("use_fixed_rr", partial(self.check_fixed_rr_exit_short, rr_ratio=rr_ratio)),
+            ("use_macd_exit_system", lambda bar, ci, position: self.check_macd_exit_short(bar, ci)),
+        )
+        self.long_exit_rules = [check for name, check in long_exits if self._system_enabled(name)]
+        self.short_exit_rules = [check for name, check in short_exits if self._system_enabled(name)]
         
     def _subscribe_to_metrics_data(self):
         try:
@@ -378,47 +644,32 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             self.log.error(f"Failed to subscribe to MetricsData: {e}", LogColor.RED)
 
     def is_rth_time(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        if not current_instrument["only_trade_rth"]:
+        if not current_instrument.only_trade_rth:
             return True
             
         bar_time = datetime.fromtimestamp(bar.ts_event // 1_000_000_000, tz=timezone.utc).time()
-        rth_start = time(current_instrument["rth_start_hour"], current_instrument["rth_start_minute"])
-        rth_end = time(current_instrument["rth_end_hour"], current_instrument["rth_end_minute"])
+        rth_start = time(current_instrument.rth_start_hour, current_instrument.rth_start_minute)
+        rth_end = time(current_instrument.rth_end_hour, current_instrument.rth_end_minute)
         
         return rth_start <= bar_time <= rth_end
 
     def update_rolling_24h_volume(self, bar: Bar, current_instrument: Dict[str, Any]) -> None:
         current_volume = float(bar.volume) if hasattr(bar, 'volume') else 0.0
         current_price = float(bar.close)
-        
-        if "volume_history" not in current_instrument:
-            current_instrument["volume_history"] = []
-        if "price_history" not in current_instrument:
-            current_instrument["price_history"] = []
-            
-        volume_history = current_instrument["volume_history"]
-        price_history = current_instrument["price_history"]
-        
-        volume_history.append(current_volume)
-        price_history.append(current_price)
-        
-        # Keep only 24 hours worth of 15-minute bars (24h * 4 bars/hour = 96 bars)
-        max_bars = 96
-        if len(volume_history) > max_bars:
-            volume_history.pop(0)
-            price_history.pop(0)
-        
-        # Calculate rolling 24h volume and dollar volume
-        current_instrument["rolling_24h_volume"] = sum(volume_history)
-        dollar_volumes = [vol * price for vol, price in zip(volume_history, price_history)]
-        current_instrument["rolling_24h_dollar_volume"] = sum(dollar_volumes)
 
-    def difference_topt_longshortratio(self, current_instrument: Dict[str, Any]) -> Optional[float]:
-        if not self.config.use_topt_ratio_as_exit.get("enabled", False):
-            return None
+        # true 24h window (volume, dollar volume) with running sums, independent of the bar interval
+        volume_window = current_instrument.volume_window
+        if volume_window is None:
+            volume_window = RollingTimeSum(DAY_NS, width=2)
+            current_instrument.volume_window = volume_window
+        volume_window.append(bar.ts_event, current_volume, current_volume * current_price)
 
-        toptrader_ratio = current_instrument.get("sum_toptrader_long_short_ratio", 0.0)
-        retail_ratio = current_instrument.get("count_long_short_ratio", 0.0)
+        current_instrument.rolling_24h_volume = volume_window.sum(0)
+        current_instrument.rolling_24h_dollar_volume = volume_window.sum(1)
+
+    def difference_topt_longshortratio(self, current_instrument: Dict[str, Any]) -> Optional[float]:
+        toptrader_ratio = current_instrument.sum_toptrader_long_short_ratio
+        retail_ratio = current_instrument.count_long_short_ratio
             
         if retail_ratio == 0 or toptrader_ratio == 0:
             return None
@@ -435,50 +686,50 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         current_instrument = self.instrument_dict.get(instrument_id)
         
         if current_instrument is not None:
-            current_instrument["latest_open_interest_value"] = metrics_data.sum_open_interest_value
-            current_instrument["sum_toptrader_long_short_ratio"] = metrics_data.sum_toptrader_long_short_ratio
-            current_instrument["count_long_short_ratio"] = metrics_data.count_long_short_ratio
-            current_instrument["sum_taker_long_short_vol_ratio"] = getattr(metrics_data, 'sum_taker_long_short_vol_ratio', 0.0)
+            current_instrument.latest_open_interest_value = metrics_data.sum_open_interest_value
+            current_instrument.sum_toptrader_long_short_ratio = metrics_data.sum_toptrader_long_short_ratio
+            current_instrument.count_long_short_ratio = metrics_data.count_long_short_ratio
+            current_instrument.sum_taker_long_short_vol_ratio = getattr(metrics_data, 'sum_taker_long_short_vol_ratio', 0.0)
 
     def passes_coin_filters(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        if not current_instrument.get("use_min_coin_filters", True):
+        if not current_instrument.use_min_coin_filters:
             return True
         
-        min_price = current_instrument["min_price"]
+        min_price = current_instrument.min_price
         if min_price > 0 and float(bar.close) < min_price:
             return False
         
-        min_24h_volume = current_instrument["min_24h_volume"]
+        min_24h_volume = current_instrument.min_24h_volume
         if min_24h_volume > 0:
-            rolling_24h_dollar_volume = current_instrument.get("rolling_24h_dollar_volume", 0.0)
+            rolling_24h_dollar_volume = current_instrument.rolling_24h_dollar_volume
             if rolling_24h_dollar_volume < min_24h_volume:
                 return False
         
-        min_open_interest_value = current_instrument["min_sum_open_interest_value"]
+        min_open_interest_value = current_instrument.min_sum_open_interest_value
         if min_open_interest_value > 0:
-            latest_open_interest_value = current_instrument.get("latest_open_interest_value", 0.0)
+            latest_open_interest_value = current_instrument.latest_open_interest_value
             if latest_open_interest_value < min_open_interest_value:
                 return False
         
         return True
 
     def passes_directional_movement_filter(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        if not self.config.use_directional_movement_filter.get("enabled", False):
+        if not self.use_directional_movement_filter:
             return True
         
-        dm = current_instrument["directional_movement"]
+        dm = current_instrument.directional_movement
         if not dm.initialized:
             return False
         
-        min_di_diff = current_instrument["min_di_diff"]
+        min_di_diff = current_instrument.min_di_diff
         di_diff = abs(dm.pos - dm.neg)
         return di_diff >= min_di_diff
 
     def passes_htf_ema_bias_filter(self, bar: Bar, current_instrument: Dict[str, Any], trade_direction: str) -> bool:
-        if not self.config.use_htf_ema_bias_filter.get("enabled", False):
+        if not self.use_htf_ema_bias_filter:
             return True
         
-        htf_ema = current_instrument["htf_ema"]
+        htf_ema = current_instrument.htf_ema
         if not htf_ema.initialized:
             return True
         
@@ -494,20 +745,16 @@ class CoinFullStrategy(BaseStrategy,Strategy):
 
     def passes_rsi_condition_filter(self, bar: Bar, current_instrument: Dict[str, Any], trade_direction: str) -> bool:
         """rsi condition filter - only runs when rsi usage_method is 'condition'"""
-        if not self.config.use_rsi_simple_reversion_system.get("enabled", False):
+        if not self.use_rsi_condition_filter:
             return True
             
-        usage_method = self.config.use_rsi_simple_reversion_system.get("usage_method", "execution")
-        if usage_method != "condition":
-            return True
-            
-        rsi = current_instrument["rsi"]
+        rsi = current_instrument.rsi
         if not rsi.initialized:
             return True
             
         rsi_value = float(rsi.value)
-        rsi_overbought = current_instrument["rsi_overbought"]
-        rsi_oversold = current_instrument["rsi_oversold"]
+        rsi_overbought = current_instrument.rsi_overbought
+        rsi_oversold = current_instrument.rsi_oversold
         
         if trade_direction == "long":
             # For long trades, RSI should be oversold (good entry condition)
@@ -596,108 +843,23 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             self.log.warning(f"No instrument found for {instrument_id}", LogColor.RED)
             return
 
-        if "atr" not in current_instrument:
+        if current_instrument.atr is None:
             self.add_instrument_context()
     
         self.update_rolling_24h_volume(bar, current_instrument)
         
         # Always handle ATR (needed for stop loss)
-        current_instrument["atr"].handle_bar(bar)
-        
-        if self.config.use_directional_movement_filter.get("enabled", False):
-            current_instrument["directional_movement"].handle_bar(bar)
-        
-        if self.config.use_htf_ema_bias_filter.get("enabled", False):
-            current_instrument["htf_ema"].handle_bar(bar)
-        
-        # Only handle indicators for enabled systems
-        if self.config.use_trend_following_setup.get("enabled", False):
-            entry_trend_ema = current_instrument["entry_trend_ema"]
-            entry_trend_ema.handle_bar(bar)
-        
-        if self.config.use_close_ema.get("enabled", False):
-            exit_trend_ema = current_instrument["exit_trend_ema"]
-            exit_trend_ema.handle_bar(bar)
-        
-        if self.config.use_spike_reversion_system.get("enabled", False):
-            current_instrument["spike_atr"].handle_bar(bar)
-            reversion_ema = current_instrument["reversion_ema"]
-            reversion_ema.handle_bar(bar)
-        
-        if self.config.use_rsi_simple_reversion_system.get("enabled", False):
-            rsi = current_instrument["rsi"]
-            rsi.handle_bar(bar)
-
-        if self.config.use_macd_simple_reversion_system.get("enabled", False):
-            macd = current_instrument["macd"]
-            macd.handle_bar(bar)
-            # Update signal line EMA with MACD value
-            if macd.initialized:
-                macd_signal_ema = current_instrument["macd_signal_ema"]
-                macd_signal_ema.update_raw(macd.value)
-
-        if self.config.use_donchian_breakout_system.get("enabled", False):
-            donchian = current_instrument["donchian"]
-            # Store previous values before updating for breakout detection
-            if donchian.initialized:
-                current_instrument["prev_donchian_upper"] = float(donchian.upper)
-                current_instrument["prev_donchian_lower"] = float(donchian.lower)
-            donchian.handle_bar(bar)
-
-        if self.config.use_aroon_simple_trend_system.get("enabled", False):
-            aroon = current_instrument["aroon"]
-            aroon.handle_bar(bar)
-
-        if self.config.use_rsi_as_exit.get("enabled", False):
-            rsi_exit = current_instrument.get("rsi_exit")
-            if rsi_exit:
-                rsi_exit.handle_bar(bar)
-
-        if self.config.use_macd_exit_system.get("enabled", False):
-            macd_exit = current_instrument.get("macd_exit")
-            macd_exit_signal = current_instrument.get("macd_exit_signal")
-            if macd_exit and macd_exit_signal:
-                macd_exit.handle_bar(bar)
-                if macd_exit.initialized:
-                    macd_exit_signal.update_raw(macd_exit.value)
-
-        self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
-
-        if self.config.use_trend_following_setup.get("enabled", False):
-            entry_trend_ema = current_instrument["entry_trend_ema"]
-            if not entry_trend_ema.initialized:
-                return
+        current_instrument.atr.handle_bar(bar)
         
-        if self.config.use_spike_reversion_system.get("enabled", False):
-            reversion_ema = current_instrument["reversion_ema"]
-            if not reversion_ema.initialized:
-                return
-            
-        if self.config.use_rsi_simple_reversion_system.get("enabled", False):
-            rsi = current_instrument["rsi"]
-            if not rsi.initialized:
-                return
-
-        if self.config.use_macd_simple_reversion_system.get("enabled", False):
-            macd = current_instrument["macd"]
-            macd_signal_ema = current_instrument["macd_signal_ema"]
-            if not macd.initialized or not macd_signal_ema.initialized:
-                return
+        for update in self.indicator_rules:
+            update(bar, current_instrument)
 
-        if self.config.use_aroon_simple_trend_system.get("enabled", False):
-            aroon = current_instrument["aroon"]
-            if not aroon.initialized:
-                return
-        if self.config.use_donchian_breakout_system.get("enabled", False):
-            donchian = current_instrument["donchian"]
-            if not donchian.initialized:
-                return
+        self.base_collect_bar_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
-        if self.config.use_macd_exit_system.get("enabled", False):
-            macd_exit = current_instrument.get("macd_exit")
-            macd_exit_signal = current_instrument.get("macd_exit_signal")
-            if not macd_exit or not macd_exit_signal or not macd_exit.initialized or not macd_exit_signal.initialized:
+        for ready in self.ready_rules:
+            if not ready(current_instrument):
                 return
 
         open_orders = self.cache.orders_open(instrument_id=instrument_id)
@@ -727,29 +889,22 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         if not self.is_trading_allowed_after_listing(bar):
             return
         
-        self.donchian_breakout_setup(bar, current_instrument)
-        self.aroon_simple_trend_setup(bar, current_instrument)
-        self.macd_simple_reversion_setup(bar, current_instrument)
-        self.spike_reversion_setup(bar, current_instrument)
-        self.rsi_simple_reversion_setup(bar, current_instrument)
-        self.trend_following_setup(bar, current_instrument)
+        for setup in self.entry_rules:
+            setup(bar, current_instrument)
 
     def donchian_breakout_setup(self, bar: Bar, current_instrument: Dict[str, Any]):
-        if not self.config.use_donchian_breakout_system.get("enabled", False):
-            return
-        
-        donchian = current_instrument["donchian"]
+        donchian = current_instrument.donchian
         if not donchian.initialized:
             return
             
         # Use previous Donchian values for breakout detection to avoid look-ahead bias
-        if "prev_donchian_upper" not in current_instrument or "prev_donchian_lower" not in current_instrument:
+        if current_instrument.prev_donchian_upper is None or current_instrument.prev_donchian_lower is None:
             return  # Wait for at least one previous value
             
-        donchian_upper = current_instrument["prev_donchian_upper"]
-        donchian_lower = current_instrument["prev_donchian_lower"]
+        donchian_upper = current_instrument.prev_donchian_upper
+        donchian_lower = current_instrument.prev_donchian_lower
         bar_close = float(bar.close)
-        min_breakout_strength = current_instrument["min_breakout_strength"]
+        min_breakout_strength = current_instrument.min_breakout_strength
         
         # Standard Donchian breakout with percentage strength filter
         if bar_close > donchian_upper:
@@ -772,8 +927,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price - sl_atr_multiple * atr_value
         else:
@@ -785,11 +940,11 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_long_position"] = True
-            current_instrument["long_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["max_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_long_position = True
+            current_instrument.long_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.max_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_long_market_order(instrument_id, qty)
 
     def enter_short_donchian_breakout(self, bar: Bar, current_instrument: Dict[str, Any]):   
@@ -797,8 +952,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price + sl_atr_multiple * atr_value
         else:
@@ -810,24 +965,21 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_short_position"] = True
-            current_instrument["short_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["min_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_short_position = True
+            current_instrument.short_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.min_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_short_market_order(instrument_id, qty)
 
     def aroon_simple_trend_setup(self, bar: Bar, current_instrument: Dict[str, Any]):
-        if not self.config.use_aroon_simple_trend_system.get("enabled", False):
-            return
-        
-        aroon = current_instrument["aroon"]
+        aroon = current_instrument.aroon
         if not aroon.initialized:
             return
             
         aroon_osc_value = float(aroon.value)
-        long_threshold = current_instrument["aroon_osc_long_threshold"]
-        short_threshold = current_instrument["aroon_osc_short_threshold"]
+        long_threshold = current_instrument.aroon_osc_long_threshold
+        short_threshold = current_instrument.aroon_osc_short_threshold
         
         if (aroon_osc_value >= long_threshold and 
             self.is_long_entry_allowed() and
@@ -844,8 +996,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price - sl_atr_multiple * atr_value
         else:
@@ -857,11 +1009,11 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_long_position"] = True
-            current_instrument["long_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["max_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_long_position = True
+            current_instrument.long_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.max_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_long_market_order(instrument_id, qty)
 
     def enter_short_aroon_trend(self, bar: Bar, current_instrument: Dict[str, Any]):   
@@ -869,8 +1021,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price + sl_atr_multiple * atr_value
         else:
@@ -882,19 +1034,16 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_short_position"] = True
-            current_instrument["short_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["min_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_short_position = True
+            current_instrument.short_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.min_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_short_market_order(instrument_id, qty)
 
-    def spike_reversion_setup(self, bar: Bar, current_instrument: Dict[str, Any]):
-        if not self.config.use_spike_reversion_system.get("enabled", False):
-            return
-        
-        spike_atr = current_instrument["spike_atr"]
-        reversion_ema = current_instrument["reversion_ema"]
+    def spike_reversion_setup(self, bar: Bar, current_instrument: Dict[str, Any], *, min_bars_over_ema: int, min_bars_under_ema: int):
+        spike_atr = current_instrument.spike_atr
+        reversion_ema = current_instrument.reversion_ema
         
         if not spike_atr.initialized or not reversion_ema.initialized:
             return
@@ -903,14 +1052,14 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         bar_close = float(bar.close)
         
         if bar_close >= reversion_ema_value:
-            current_instrument["bars_above_reversion_ema"] += 1
-            current_instrument["bars_below_reversion_ema"] = 0
+            current_instrument.bars_above_reversion_ema += 1
+            current_instrument.bars_below_reversion_ema = 0
         else:
-            current_instrument["bars_below_reversion_ema"] += 1
-            current_instrument["bars_above_reversion_ema"] = 0
+            current_instrument.bars_below_reversion_ema += 1
+            current_instrument.bars_above_reversion_ema = 0
             
-        spike_atr_threshold = current_instrument["spike_atr_threshold"]
-        prev_close = current_instrument.get("prev_bar_close")
+        spike_atr_threshold = current_instrument.spike_atr_threshold
+        prev_close = current_instrument.prev_bar_close
         if prev_close is None:
             prev_close = float(bar.open) if bar.open is not None else float(bar.close)
         
@@ -920,21 +1069,18 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             abs(float(bar.low) - prev_close)
         )
         
-        spike_atr_value = current_instrument["spike_atr"].value
+        spike_atr_value = current_instrument.spike_atr.value
         if spike_atr_value is None or spike_atr_value <= 0:
             return
             
         if bar_tr < (spike_atr_threshold * spike_atr_value):
-            min_bars_spike_over_ema = self.config.use_spike_reversion_system.get("min_bars_spike_over_ema", 12)
-            min_bars_spike_under_ema = self.config.use_spike_reversion_system.get("min_bars_spike_under_ema", 12)
-            
             if (bar_close > reversion_ema_value and 
-                current_instrument["bars_above_reversion_ema"] >= min_bars_spike_over_ema and
+                current_instrument.bars_above_reversion_ema >= min_bars_over_ema and
                 self.passes_htf_ema_bias_filter(bar, current_instrument, "short") and
                 self.passes_rsi_condition_filter(bar, current_instrument, "short")):
                 self.spike_short_entry_logic(bar, current_instrument)
             elif (bar_close < reversion_ema_value and 
-                  current_instrument["bars_below_reversion_ema"] >= min_bars_spike_under_ema and
+                  current_instrument.bars_below_reversion_ema >= min_bars_under_ema and
                   self.is_long_entry_allowed() and
                   self.passes_htf_ema_bias_filter(bar, current_instrument, "long") and
                   self.passes_rsi_condition_filter(bar, current_instrument, "long")):
@@ -945,8 +1091,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price + sl_atr_multiple * atr_value
         else:
@@ -958,11 +1104,11 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_short_position"] = True
-            current_instrument["short_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["min_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_short_position = True
+            current_instrument.short_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.min_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_short_market_order(instrument_id, qty)
 
     def spike_long_entry_logic(self, bar: Bar, current_instrument: Dict[str, Any]):
@@ -970,8 +1116,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price - sl_atr_multiple * atr_value
         else:
@@ -983,47 +1129,37 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_long_position"] = True
-            current_instrument["long_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["max_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_long_position = True
+            current_instrument.long_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.max_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_long_market_order(instrument_id, qty)
                 
 
     def rsi_simple_reversion_setup(self, bar: Bar, current_instrument: Dict[str, Any]):
-        if not self.config.use_rsi_simple_reversion_system.get("enabled", False):
-            return
-            
-        rsi = current_instrument["rsi"]
+        """usage_method 'execution' - RSI directly triggers trades ('condition' is handled by passes_rsi_condition_filter)"""
+        rsi = current_instrument.rsi
         if not rsi.initialized:
             return
             
-        usage_method = self.config.use_rsi_simple_reversion_system.get("usage_method", "execution")
+        rsi_value = float(rsi.value)
+        rsi_overbought = current_instrument.rsi_overbought
+        rsi_oversold = current_instrument.rsi_oversold
         
-        if usage_method == "execution":
-            # Original behavior - RSI directly triggers trades
-            rsi_value = float(rsi.value)
-            rsi_overbought = current_instrument["rsi_overbought"]
-            rsi_oversold = current_instrument["rsi_oversold"]
-            
-            # Immediate execution on extreme RSI levels - no minimum bars required
-            if rsi_value >= rsi_overbought and self.passes_htf_ema_bias_filter(bar, current_instrument, "short"):
-                self.enter_short_rsi_reversion(bar, current_instrument)
-            elif rsi_value <= rsi_oversold and self.is_long_entry_allowed() and self.passes_htf_ema_bias_filter(bar, current_instrument, "long"):
-                self.enter_long_rsi_reversion(bar, current_instrument)
-        elif usage_method == "condition":
-            # New behavior - RSI acts as a condition for other entry methods
-            # The actual condition checking is done in passes_rsi_condition_filter method
-            pass
+        # Immediate execution on extreme RSI levels - no minimum bars required
+        if rsi_value >= rsi_overbought and self.passes_htf_ema_bias_filter(bar, current_instrument, "short"):
+            self.enter_short_rsi_reversion(bar, current_instrument)
+        elif rsi_value <= rsi_oversold and self.is_long_entry_allowed() and self.passes_htf_ema_bias_filter(bar, current_instrument, "long"):
+            self.enter_long_rsi_reversion(bar, current_instrument)
 
     def enter_short_rsi_reversion(self, bar: Bar, current_instrument: Dict[str, Any]):
         instrument_id = bar.bar_type.instrument_id
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price + sl_atr_multiple * atr_value
         else:
@@ -1035,11 +1171,11 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_short_position"] = True
-            current_instrument["short_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["max_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_short_position = True
+            current_instrument.short_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.max_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_short_market_order(instrument_id, qty)
 
     def enter_long_rsi_reversion(self, bar: Bar, current_instrument: Dict[str, Any]):
@@ -1047,8 +1183,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price - sl_atr_multiple * atr_value
         else:
@@ -1060,19 +1196,16 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_long_position"] = True
-            current_instrument["long_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["max_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_long_position = True
+            current_instrument.long_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.max_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_long_market_order(instrument_id, qty)
 
     def macd_simple_reversion_setup(self, bar: Bar, current_instrument: Dict[str, Any]):
-        if not self.config.use_macd_simple_reversion_system.get("enabled", False):
-            return
-            
-        macd = current_instrument["macd"]
-        macd_signal_ema = current_instrument["macd_signal_ema"]
+        macd = current_instrument.macd
+        macd_signal_ema = current_instrument.macd_signal_ema
         
         if not macd.initialized or not macd_signal_ema.initialized:
             return
@@ -1080,8 +1213,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         macd_line = float(macd.value)              # MACD line (fast line)
         signal_line = float(macd_signal_ema.value) # Signal line (slow line)
         
-        prev_macd = current_instrument.get("prev_macd_line")
-        prev_signal = current_instrument.get("prev_macd_signal")
+        prev_macd = current_instrument.prev_macd_line
+        prev_signal = current_instrument.prev_macd_signal
         
         if prev_macd is not None and prev_signal is not None:            
             if (prev_macd <= prev_signal and macd_line > signal_line and 
@@ -1097,16 +1230,16 @@ class CoinFullStrategy(BaseStrategy,Strategy):
                   self.passes_rsi_condition_filter(bar, current_instrument, "short")):
                 self.enter_short_macd_reversion(bar, current_instrument)
         
-        current_instrument["prev_macd_line"] = macd_line
-        current_instrument["prev_macd_signal"] = signal_line
+        current_instrument.prev_macd_line = macd_line
+        current_instrument.prev_macd_signal = signal_line
 
     def enter_long_macd_reversion(self, bar: Bar, current_instrument: Dict[str, Any]):
         instrument_id = bar.bar_type.instrument_id
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price - sl_atr_multiple * atr_value
         else:
@@ -1118,11 +1251,11 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_long_position"] = True
-            current_instrument["long_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["max_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_long_position = True
+            current_instrument.long_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.max_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_long_market_order(instrument_id, qty)
 
     def enter_short_macd_reversion(self, bar: Bar, current_instrument: Dict[str, Any]):
@@ -1130,8 +1263,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         entry_price = float(bar.close)
         
         # Calculate ATR-based stop loss
-        atr_value = current_instrument["atr"].value
-        sl_atr_multiple = current_instrument["sl_atr_multiple"]
+        atr_value = current_instrument.atr.value
+        sl_atr_multiple = current_instrument.sl_atr_multiple
         if atr_value is not None:
             stop_loss_price = entry_price + sl_atr_multiple * atr_value
         else:
@@ -1143,23 +1276,21 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         # Only submit order if quantity > 0
         if qty > 0:
-            current_instrument["in_short_position"] = True
-            current_instrument["short_entry_price"] = entry_price
-            current_instrument["bars_since_entry"] = 0
-            current_instrument["min_topt_difference_since_entry"] = None
-            current_instrument["sl_price"] = stop_loss_price
+            current_instrument.in_short_position = True
+            current_instrument.short_entry_price = entry_price
+            current_instrument.bars_since_entry = 0
+            current_instrument.min_topt_difference_since_entry = None
+            current_instrument.sl_price = stop_loss_price
             self.order_types.submit_short_market_order(instrument_id, qty)
 
-    def trend_following_setup(self, bar: Bar, current_instrument: Dict[str, Any]):
-        if not self.config.use_trend_following_setup.get("enabled", False):
-            return
-        entry_trend_ema_value = current_instrument["entry_trend_ema"].value
+    def trend_following_setup(self, bar: Bar, current_instrument: Dict[str, Any], *, min_bars_under_ema: int, min_bars_over_ema: int):
+        entry_trend_ema_value = current_instrument.entry_trend_ema.value
         if entry_trend_ema_value is None:
             return
         
-        prev_bar_close = current_instrument.get("prev_bar_close")
+        prev_bar_close = current_instrument.prev_bar_close
         if prev_bar_close is None:
-            current_instrument["prev_bar_close"] = float(bar.close)
+            current_instrument.prev_bar_close = float(bar.close)
             return
 
         prev_bar_close_f = float(prev_bar_close)
@@ -1167,20 +1298,19 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         ema_f = float(entry_trend_ema_value)
         
         if bar_close_f >= ema_f:
-            current_instrument["bars_above_ema"] += 1
-            self.trend_long_entry_logic(bar, current_instrument, prev_bar_close_f, bar_close_f, ema_f)
-            current_instrument["bars_below_ema"] = 0
+            current_instrument.bars_above_ema += 1
+            self.trend_long_entry_logic(bar, current_instrument, prev_bar_close_f, bar_close_f, ema_f, min_bars_under_ema)
+            current_instrument.bars_below_ema = 0
         else:
-            current_instrument["bars_below_ema"] += 1
-            self.trend_short_entry_logic(bar, current_instrument, prev_bar_close_f, bar_close_f, ema_f)
-            current_instrument["bars_above_ema"] = 0
+            current_instrument.bars_below_ema += 1
+            self.trend_short_entry_logic(bar, current_instrument, prev_bar_close_f, bar_close_f, ema_f, min_bars_over_ema)
+            current_instrument.bars_above_ema = 0
         
-        current_instrument["prev_bar_close"] = bar_close_f
+        current_instrument.prev_bar_close = bar_close_f
 
-    def trend_long_entry_logic(self, bar: Bar, current_instrument: Dict[str, Any], prev_bar_close: float, bar_close: float, ema_value: float):
-        min_bars_under_ema = self.config.use_trend_following_setup.get("min_bars_under_ema", 20)
+    def trend_long_entry_logic(self, bar: Bar, current_instrument: Dict[str, Any], prev_bar_close: float, bar_close: float, ema_value: float, min_bars_under_ema: int):
         if (prev_bar_close < ema_value and bar_close >= ema_value and 
-            current_instrument["bars_below_ema"] >= min_bars_under_ema and
+            current_instrument.bars_below_ema >= min_bars_under_ema and
             self.is_long_entry_allowed() and
             self.passes_htf_ema_bias_filter(bar, current_instrument, "long") and
             self.passes_rsi_condition_filter(bar, current_instrument, "long")):
@@ -1189,8 +1319,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             entry_price = bar_close
             
             # Calculate ATR-based stop loss
-            atr_value = current_instrument["atr"].value
-            sl_atr_multiple = current_instrument["sl_atr_multiple"]
+            atr_value = current_instrument.atr.value
+            sl_atr_multiple = current_instrument.sl_atr_multiple
             if atr_value is not None:
                 stop_loss_price = entry_price - sl_atr_multiple * atr_value
             else:
@@ -1202,16 +1332,15 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             
             # Only submit order if quantity > 0
             if qty > 0:
-                current_instrument["in_long_position"] = True
-                current_instrument["long_entry_price"] = entry_price
-                current_instrument["bars_since_entry"] = 0
-                current_instrument["sl_price"] = stop_loss_price
+                current_instrument.in_long_position = True
+                current_instrument.long_entry_price = entry_price
+                current_instrument.bars_since_entry = 0
+                current_instrument.sl_price = stop_loss_price
                 self.order_types.submit_long_market_order(instrument_id, qty)
 
-    def trend_short_entry_logic(self, bar: Bar, current_instrument: Dict[str, Any], prev_bar_close: float, bar_close: float, ema_value: float):
-        min_bars_over_ema = self.config.use_trend_following_setup.get("min_bars_over_ema", 20)
+    def trend_short_entry_logic(self, bar: Bar, current_instrument: Dict[str, Any], prev_bar_close: float, bar_close: float, ema_value: float, min_bars_over_ema: int):
         if (prev_bar_close >= ema_value and bar_close < ema_value and 
-            current_instrument["bars_above_ema"] >= min_bars_over_ema and
+            current_instrument.bars_above_ema >= min_bars_over_ema and
             self.passes_htf_ema_bias_filter(bar, current_instrument, "short") and
             self.passes_rsi_condition_filter(bar, current_instrument, "short")):
             
@@ -1219,8 +1348,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             entry_price = bar_close
             
             # Calculate ATR-based stop loss
-            atr_value = current_instrument["atr"].value
-            sl_atr_multiple = current_instrument["sl_atr_multiple"]
+            atr_value = current_instrument.atr.value
+            sl_atr_multiple = current_instrument.sl_atr_multiple
             if atr_value is not None:
                 stop_loss_price = entry_price + sl_atr_multiple * atr_value
             else:
@@ -1232,15 +1361,15 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             
             # Only submit order if quantity > 0
             if qty > 0:
-                current_instrument["in_short_position"] = True
-                current_instrument["short_entry_price"] = entry_price
-                current_instrument["bars_since_entry"] = 0
-                current_instrument["sl_price"] = stop_loss_price
+                current_instrument.in_short_position = True
+                current_instrument.short_entry_price = entry_price
+                current_instrument.bars_since_entry = 0
+                current_instrument.sl_price = stop_loss_price
                 self.order_types.submit_short_market_order(instrument_id, qty)
 
     def long_exit_logic(self, bar: Bar, current_instrument: Dict[str, Any], position):
-        current_instrument["bars_since_entry"] += 1
-        sl_price = current_instrument.get("sl_price")
+        current_instrument.bars_since_entry += 1
+        sl_price = current_instrument.sl_price
         instrument_id = bar.bar_type.instrument_id
         
         # Always check stop loss first (highest priority)
@@ -1249,7 +1378,7 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             if close_qty > 0:
                 self.order_types.submit_short_market_order(instrument_id, int(close_qty))
             self.reset_position_tracking(current_instrument)
-            current_instrument["prev_bar_close"] = float(bar.close)
+            current_instrument.prev_bar_close = float(bar.close)
             return
         
         # Check time-based exit (overrides all other exits if enabled)
@@ -1258,31 +1387,19 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             if close_qty > 0:
                 self.order_types.submit_short_market_order(instrument_id, int(close_qty))
             self.reset_position_tracking(current_instrument)
-            current_instrument["prev_bar_close"] = float(bar.close)
+            current_instrument.prev_bar_close = float(bar.close)
             return
         
         # Skip all other exits if time-based exit is enabled but deadline not reached
         if self.config.hold_profit_for_remaining_days:
-            current_instrument["prev_bar_close"] = float(bar.close)
+            current_instrument.prev_bar_close = float(bar.close)
             return
         
         should_exit = False
-        
-        if self.config.use_close_ema.get("enabled", False):
-            if self.check_ema_exit_long(bar, current_instrument):
-                should_exit = True
-        
-        if not should_exit and self.config.use_topt_ratio_as_exit.get("enabled", False):
-            if self.check_topt_ratio_exit_long(bar, current_instrument):
-                should_exit = True
-        
-        if not should_exit and self.config.use_fixed_rr.get("enabled", False):
-            if self.check_fixed_rr_exit_long(bar, current_instrument, position):
-                should_exit = True
-        
-        if not should_exit and self.config.use_macd_exit_system.get("enabled", False):
-            if self.check_macd_exit_long(bar, current_instrument):
+        for check in self.long_exit_rules:
+            if check(bar, current_instrument, position):
                 should_exit = True
+                break
         
         # Execute exit if any method triggered
         if should_exit:
@@ -1291,11 +1408,11 @@ class CoinFullStrategy(BaseStrategy,Strategy):
                 self.order_types.submit_short_market_order(instrument_id, int(close_qty))
             self.reset_position_tracking(current_instrument)
         
-        current_instrument["prev_bar_close"] = float(bar.close)
+        current_instrument.prev_bar_close = float(bar.close)
 
     def short_exit_logic(self, bar: Bar, current_instrument: Dict[str, Any], position):
-        current_instrument["bars_since_entry"] += 1
-        sl_price = current_instrument.get("sl_price")
+        current_instrument.bars_since_entry += 1
+        sl_price = current_instrument.sl_price
         instrument_id = bar.bar_type.instrument_id
         
         # Always check stop loss first (highest priority)
@@ -1304,7 +1421,7 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             if close_qty > 0:
                 self.order_types.submit_long_market_order(instrument_id, int(close_qty))
             self.reset_position_tracking(current_instrument)
-            current_instrument["prev_bar_close"] = float(bar.close)
+            current_instrument.prev_bar_close = float(bar.close)
             return
         
         # Check time-based exit (overrides all other exits if enabled)
@@ -1313,35 +1430,19 @@ class CoinFullStrategy(BaseStrategy,Strategy):
             if close_qty > 0:
                 self.order_types.submit_long_market_order(instrument_id, int(close_qty))
             self.reset_position_tracking(current_instrument)
-            current_instrument["prev_bar_close"] = float(bar.close)
+            current_instrument.prev_bar_close = float(bar.close)
             return
         
         # Skip all other exits if time-based exit is enabled but deadline not reached
         if self.config.hold_profit_for_remaining_days:
-            current_instrument["prev_bar_close"] = float(bar.close)
+            current_instrument.prev_bar_close = float(bar.close)
             return
         
         should_exit = False
-        
-        if self.config.use_close_ema.get("enabled", False):
-            if self.check_ema_exit_short(bar, current_instrument):
-                should_exit = True
-        
-        if not should_exit and self.config.use_rsi_as_exit.get("enabled", False):
-            if self.check_rsi_exit_short(bar, current_instrument):
-                should_exit = True
-        
-        if not should_exit and self.config.use_topt_ratio_as_exit.get("enabled", False):
-            if self.check_topt_ratio_exit_short(bar, current_instrument):
-                should_exit = True
-        
-        if not should_exit and self.config.use_fixed_rr.get("enabled", False):
-            if self.check_fixed_rr_exit_short(bar, current_instrument, position):
-                should_exit = True
-        
-        if not should_exit and self.config.use_macd_exit_system.get("enabled", False):
-            if self.check_macd_exit_short(bar, current_instrument):
+        for check in self.short_exit_rules:
+            if check(bar, current_instrument, position):
                 should_exit = True
+                break
         
         # Execute exit if any method triggered
         if should_exit:
@@ -1350,130 +1451,109 @@ class CoinFullStrategy(BaseStrategy,Strategy):
                 self.order_types.submit_long_market_order(instrument_id, int(close_qty))
             self.reset_position_tracking(current_instrument)
         
-        current_instrument["prev_bar_close"] = float(bar.close)
+        current_instrument.prev_bar_close = float(bar.close)
 
     def reset_position_tracking(self, current_instrument: Dict[str, Any]):
-        current_instrument["short_entry_price"] = None
-        current_instrument["long_entry_price"] = None
-        current_instrument["bars_since_entry"] = 0
-        current_instrument["sl_price"] = None
-        current_instrument["in_short_position"] = False
-        current_instrument["in_long_position"] = False
-        current_instrument["max_extreme_topt_long"] = None
-        current_instrument["min_extreme_topt_short"] = None
-        current_instrument["bars_over_ema_exit"] = 0
-        current_instrument["bars_under_ema_exit"] = 0
-        current_instrument["ema_exit_qualified"] = False
-
-    def check_ema_exit_long(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        exit_trend_ema = current_instrument["exit_trend_ema"]
+        current_instrument.short_entry_price = None
+        current_instrument.long_entry_price = None
+        current_instrument.bars_since_entry = 0
+        current_instrument.sl_price = None
+        current_instrument.in_short_position = False
+        current_instrument.in_long_position = False
+        current_instrument.max_extreme_topt_long = None
+        current_instrument.min_extreme_topt_short = None
+        current_instrument.bars_over_ema_exit = 0
+        current_instrument.bars_under_ema_exit = 0
+        current_instrument.ema_exit_qualified = False
+
+    def check_ema_exit_long(self, bar: Bar, current_instrument: Dict[str, Any], min_bars: int) -> bool:
+        exit_trend_ema = current_instrument.exit_trend_ema
         
         if not exit_trend_ema.initialized:
             return False
             
         current_price = float(bar.close)
         ema_value = float(exit_trend_ema.value)
-        min_bars = self.config.use_close_ema.get("min_bars_under_ema", 40)
 
-        if "ema_exit_qualified" not in current_instrument:
-            current_instrument["ema_exit_qualified"] = False
-        if "bars_under_ema_exit" not in current_instrument:
-            current_instrument["bars_under_ema_exit"] = 0
-        if "bars_over_ema_exit" not in current_instrument:
-            current_instrument["bars_over_ema_exit"] = 0
-        
         if current_price > ema_value:
-            current_instrument["bars_over_ema_exit"] += 1
-            current_instrument["bars_under_ema_exit"] = 0
+            current_instrument.bars_over_ema_exit += 1
+            current_instrument.bars_under_ema_exit = 0
             
-            if current_instrument["bars_over_ema_exit"] >= min_bars:
-                current_instrument["ema_exit_qualified"] = True
+            if current_instrument.bars_over_ema_exit >= min_bars:
+                current_instrument.ema_exit_qualified = True
         else:
-            current_instrument["bars_under_ema_exit"] += 1
-            current_instrument["bars_over_ema_exit"] = 0
+            current_instrument.bars_under_ema_exit += 1
+            current_instrument.bars_over_ema_exit = 0
             
-            if current_instrument["ema_exit_qualified"] and current_price <= ema_value:
-                current_instrument["ema_exit_qualified"] = False
+            if current_instrument.ema_exit_qualified and current_price <= ema_value:
+                current_instrument.ema_exit_qualified = False
                 return True
 
         return False
 
-    def check_ema_exit_short(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        exit_trend_ema = current_instrument["exit_trend_ema"]
+    def check_ema_exit_short(self, bar: Bar, current_instrument: Dict[str, Any], min_bars: int) -> bool:
+        exit_trend_ema = current_instrument.exit_trend_ema
         
         if not exit_trend_ema.initialized:
             return False
             
         current_price = float(bar.close)
         ema_value = float(exit_trend_ema.value)
-        min_bars = self.config.use_close_ema.get("min_bars_over_ema", 40)
 
-        if "ema_exit_qualified" not in current_instrument:
-            current_instrument["ema_exit_qualified"] = False
-        if "bars_under_ema_exit" not in current_instrument:
-            current_instrument["bars_under_ema_exit"] = 0
-        if "bars_over_ema_exit" not in current_instrument:
-            current_instrument["bars_over_ema_exit"] = 0
-        
         if current_price < ema_value:
-            current_instrument["bars_under_ema_exit"] += 1
-            current_instrument["bars_over_ema_exit"] = 0
+            current_instrument.bars_under_ema_exit += 1
+            current_instrument.bars_over_ema_exit = 0
             
-            if current_instrument["bars_under_ema_exit"] >= min_bars:
-                current_instrument["ema_exit_qualified"] = True
+            if current_instrument.bars_under_ema_exit >= min_bars:
+                current_instrument.ema_exit_qualified = True
         else:
-            current_instrument["bars_over_ema_exit"] += 1
-            current_instrument["bars_under_ema_exit"] = 0
+            current_instrument.bars_over_ema_exit += 1
+            current_instrument.bars_under_ema_exit = 0
             
-            if current_instrument["ema_exit_qualified"] and current_price >= ema_value:
-                current_instrument["ema_exit_qualified"] = False
+            if current_instrument.ema_exit_qualified and current_price >= ema_value:
+                current_instrument.ema_exit_qualified = False
                 return True
 
         return False
 
-    def check_topt_ratio_exit_long(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        min_reversal = self.config.use_topt_ratio_as_exit.get("long_min_extreme_reversal_topt_longshortratio", 0.3)
-        
+    def check_topt_ratio_exit_long(self, bar: Bar, current_instrument: Dict[str, Any], min_reversal: float) -> bool:
         divergence = self.difference_topt_longshortratio(current_instrument)
         if divergence is None:
             return False
         
         # Track maximum extreme divergence reached
-        max_extreme = current_instrument.get("max_extreme_topt_long")
+        max_extreme = current_instrument.max_extreme_topt_long
         if max_extreme is None or divergence > max_extreme:
-            current_instrument["max_extreme_topt_long"] = divergence
+            current_instrument.max_extreme_topt_long = divergence
             max_extreme = divergence
         
         # Exit if divergence has decreased by minimum reversal amount
         return max_extreme is not None and (max_extreme - divergence) >= min_reversal
 
-    def check_topt_ratio_exit_short(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        min_reversal = self.config.use_topt_ratio_as_exit.get("short_min_extreme_reversal_topt_longshortratio", 0.3)
-        
+    def check_topt_ratio_exit_short(self, bar: Bar, current_instrument: Dict[str, Any], min_reversal: float) -> bool:
         divergence = self.difference_topt_longshortratio(current_instrument)
         if divergence is None:
             return False
         
         # Track minimum extreme divergence reached (most negative)
-        min_extreme = current_instrument.get("min_extreme_topt_short")
+        min_extreme = current_instrument.min_extreme_topt_short
         if min_extreme is None or divergence < min_extreme:
-            current_instrument["min_extreme_topt_short"] = divergence
+            current_instrument.min_extreme_topt_short = divergence
             min_extreme = divergence
         
         # Exit if divergence has increased by minimum reversal amount (become less negative)
         return min_extreme is not None and (divergence - min_extreme) >= min_reversal
 
-    def check_fixed_rr_exit_long(self, bar: Bar, current_instrument: Dict[str, Any], position) -> bool:
-        entry_price = current_instrument.get("long_entry_price")
+    def check_fixed_rr_exit_long(self, bar: Bar, current_instrument: Dict[str, Any], position, *, rr_ratio: float) -> bool:
+        entry_price = current_instrument.long_entry_price
         if entry_price is None:
             entry_price = float(position.avg_px_open) if hasattr(position, 'avg_px_open') else None
         
-        sl_price = current_instrument.get("sl_price")
+        sl_price = current_instrument.sl_price
         if entry_price is None or sl_price is None:
             return False
             
         current_price = float(bar.close)
-        rr_ratio = self.config.use_fixed_rr.get("rr_tp_ratio", 1.5)
         
         risk = entry_price - sl_price
         
@@ -1481,17 +1561,16 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         
         return current_price >= target_price
 
-    def check_fixed_rr_exit_short(self, bar: Bar, current_instrument: Dict[str, Any], position) -> bool:
-        entry_price = current_instrument.get("short_entry_price")
+    def check_fixed_rr_exit_short(self, bar: Bar, current_instrument: Dict[str, Any], position, *, rr_ratio: float) -> bool:
+        entry_price = current_instrument.short_entry_price
         if entry_price is None:
             entry_price = float(position.avg_px_open) if hasattr(position, 'avg_px_open') else None
         
-        sl_price = current_instrument.get("sl_price")
+        sl_price = current_instrument.sl_price
         if entry_price is None or sl_price is None:
             return False
             
         current_price = float(bar.close)
-        rr_ratio = self.config.use_fixed_rr.get("rr_tp_ratio", 1.5)
         
         # Calculate risk amount
         risk = sl_price - entry_price
@@ -1502,24 +1581,22 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         # Exit if target is reached
         return current_price <= target_price
 
-    def check_rsi_exit_long(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        rsi_exit = current_instrument.get("rsi_exit")
+    def check_rsi_exit_long(self, bar: Bar, current_instrument: Dict[str, Any], rsi_long_exit_threshold: float) -> bool:
+        rsi_exit = current_instrument.rsi_exit
         if not rsi_exit or not rsi_exit.initialized:
             return False
         
         rsi_value = float(rsi_exit.value)
-        rsi_long_exit_threshold = self.config.use_rsi_as_exit.get("rsi_long_exit_threshold", 0.7)
         
         # Exit long position when RSI is overbought (momentum exhaustion)
         return rsi_value >= rsi_long_exit_threshold
 
-    def check_rsi_exit_short(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        rsi_exit = current_instrument.get("rsi_exit")
+    def check_rsi_exit_short(self, bar: Bar, current_instrument: Dict[str, Any], rsi_short_exit_threshold: float) -> bool:
+        rsi_exit = current_instrument.rsi_exit
         if not rsi_exit or not rsi_exit.initialized:
             return False
         
         rsi_value = float(rsi_exit.value)
-        rsi_short_exit_threshold = self.config.use_rsi_as_exit.get("rsi_short_exit_threshold", 0.3)
         
         # Exit short position when RSI is oversold (downside momentum exhaustion)
         return rsi_value <= rsi_short_exit_threshold
@@ -1528,8 +1605,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         """
         Long exit: When fast MACD line crosses slow MACD line above 0 line (from above to below)
         """
-        macd_exit = current_instrument.get("macd_exit")
-        macd_exit_signal = current_instrument.get("macd_exit_signal")
+        macd_exit = current_instrument.macd_exit
+        macd_exit_signal = current_instrument.macd_exit_signal
         
         if not macd_exit or not macd_exit_signal or not macd_exit.initialized or not macd_exit_signal.initialized:
             return False
@@ -1537,12 +1614,12 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         macd_line = float(macd_exit.value)  # Fast line
         signal_line = float(macd_exit_signal.value)  # Slow line
         
-        prev_macd = current_instrument.get("prev_macd_exit_line")
-        prev_signal = current_instrument.get("prev_macd_exit_signal")
+        prev_macd = current_instrument.prev_macd_exit_line
+        prev_signal = current_instrument.prev_macd_exit_signal
         
         # Store current values for next bar
-        current_instrument["prev_macd_exit_line"] = macd_line
-        current_instrument["prev_macd_exit_signal"] = signal_line
+        current_instrument.prev_macd_exit_line = macd_line
+        current_instrument.prev_macd_exit_signal = signal_line
         
         if prev_macd is None or prev_signal is None:
             return False
@@ -1553,8 +1630,8 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         return above_zero and bearish_crossover
 
     def check_macd_exit_short(self, bar: Bar, current_instrument: Dict[str, Any]) -> bool:
-        macd_exit = current_instrument.get("macd_exit")
-        macd_exit_signal = current_instrument.get("macd_exit_signal")
+        macd_exit = current_instrument.macd_exit
+        macd_exit_signal = current_instrument.macd_exit_signal
         
         if not macd_exit or not macd_exit_signal or not macd_exit.initialized or not macd_exit_signal.initialized:
             return False
@@ -1562,12 +1639,12 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         macd_line = float(macd_exit.value)  # Fast line
         signal_line = float(macd_exit_signal.value)  # Slow line
         
-        prev_macd = current_instrument.get("prev_macd_exit_line")
-        prev_signal = current_instrument.get("prev_macd_exit_signal")
+        prev_macd = current_instrument.prev_macd_exit_line
+        prev_signal = current_instrument.prev_macd_exit_signal
         
         # Store current values for next bar
-        current_instrument["prev_macd_exit_line"] = macd_line
-        current_instrument["prev_macd_exit_signal"] = signal_line
+        current_instrument.prev_macd_exit_line = macd_line
+        current_instrument.prev_macd_exit_signal = signal_line
         
         if prev_macd is None or prev_signal is None:
             return False
@@ -1582,98 +1659,9 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         self.base_update_standard_indicators(bar.ts_event, current_instrument, inst_id)
 
         # Only visualize indicators for enabled systems
-        trend_following_config = self.config.use_trend_following_setup if isinstance(self.config.use_trend_following_setup, dict) else {}
-        if trend_following_config.get("enabled", False):
-            entry_trend_ema_value = float(current_instrument["entry_trend_ema"].value) if current_instrument["entry_trend_ema"].value is not None else None
-            current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="entry_trend_ema", value=entry_trend_ema_value)
-        
-        close_ema_config = self.config.use_close_ema if isinstance(self.config.use_close_ema, dict) else {}
-        if close_ema_config.get("enabled", False):
-            exit_trend_ema_value = float(current_instrument["exit_trend_ema"].value) if current_instrument["exit_trend_ema"].value is not None else None
-            current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="exit_trend_ema", value=exit_trend_ema_value)
-        
-        # Spike reversion EMA (position 0)
-        spike_reversion_config = self.config.use_spike_reversion_system if isinstance(self.config.use_spike_reversion_system, dict) else {}
-        if spike_reversion_config.get("enabled", False):
-            reversion_ema_value = float(current_instrument["reversion_ema"].value) if current_instrument["reversion_ema"].value is not None else None
-            current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="reversion_ema", value=reversion_ema_value)
-
-        # HTF EMA bias filter (position 0)
-        htf_ema_config = self.config.use_htf_ema_bias_filter if isinstance(self.config.use_htf_ema_bias_filter, dict) else {}
-        if htf_ema_config.get("enabled", False):
-            htf_ema_value = float(current_instrument["htf_ema"].value) if current_instrument["htf_ema"].value is not None else None
-            current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="htf_ema", value=htf_ema_value)
-
-        # Directional Movement difference (position 1)
-        dm_config = self.config.use_directional_movement_filter if isinstance(self.config.use_directional_movement_filter, dict) else {}
-        if dm_config.get("enabled", False):
-            dm = current_instrument["directional_movement"]
-            if dm and dm.initialized:
-                di_diff_value = abs(dm.pos - dm.neg)
-                current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="di_diff", value=di_diff_value)
-            else:
-                current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="di_diff", value=None)
+        for visualize in self.visual_rules:
+            visualize(bar, current_instrument)
 
-        # RSI for reversion system (position 1)
-        rsi_config = self.config.use_rsi_simple_reversion_system if isinstance(self.config.use_rsi_simple_reversion_system, dict) else {}
-        if rsi_config.get("enabled", False):
-            rsi_value = float(current_instrument["rsi"].value) if current_instrument["rsi"].value is not None else None
-            current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="rsi", value=rsi_value)
-            
-            # Add condition mode visualization
-            usage_method = rsi_config.get("usage_method", "execution")
-            if usage_method == "condition":
-                rsi_overbought = current_instrument["rsi_overbought"]
-                rsi_oversold = current_instrument["rsi_oversold"]
-                current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="rsi_overbought_level", value=rsi_overbought)
-                current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="rsi_oversold_level", value=rsi_oversold)
-        
-        # MACD for reversion system (position 1)
-        macd_config = self.config.use_macd_simple_reversion_system if isinstance(self.config.use_macd_simple_reversion_system, dict) else {}
-        if macd_config.get("enabled", False):
-            macd = current_instrument["macd"]
-            macd_signal_ema = current_instrument["macd_signal_ema"]
-            if macd and macd.value is not None and macd_signal_ema and macd_signal_ema.value is not None:
-                macd_value = float(macd.value)
-                signal_value = float(macd_signal_ema.value)
-                current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="macd", value=macd_value)
-                current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="macd_signal", value=signal_value)
-
-        # Aroon Oscillator (position 1)
-        aroon_config = self.config.use_aroon_simple_trend_system if isinstance(self.config.use_aroon_simple_trend_system, dict) else {}
-        if aroon_config.get("enabled", False):
-            aroon = current_instrument["aroon"]
-            aroon_osc_value = float(aroon.value) if aroon.value is not None else None
-            current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="aroon_osc", value=aroon_osc_value)
-
-        # Donchian Channel (position 0)
-        donchian_config = self.config.use_donchian_breakout_system if isinstance(self.config.use_donchian_breakout_system, dict) else {}
-        if donchian_config.get("enabled", False):
-            donchian = current_instrument["donchian"]
-            donchian_upper_value = float(donchian.upper) if donchian.upper is not None else None
-            donchian_lower_value = float(donchian.lower) if donchian.lower is not None else None
-            donchian_middle_value = float(donchian.middle) if donchian.middle is not None else None
-            current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="donchian_upper", value=donchian_upper_value)
-            current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="donchian_lower", value=donchian_lower_value)
-            current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="donchian_middle", value=donchian_middle_value)
-
-        # RSI for exit method (position 1)
-        if self.config.use_rsi_as_exit.get("enabled", False):       
-            rsi_exit = current_instrument.get("rsi_exit")
-            if rsi_exit and rsi_exit.value is not None:
-                rsi_exit_value = float(rsi_exit.value)
-                current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="rsi_exit", value=rsi_exit_value)
-        
-        # MACD for exit method (position 1)
-        if self.config.use_macd_exit_system.get("enabled", False):
-            macd_exit = current_instrument.get("macd_exit")
-            macd_exit_signal = current_instrument.get("macd_exit_signal")
-            if macd_exit and macd_exit.value is not None and macd_exit_signal and macd_exit_signal.value is not None:
-                macd_exit_value = float(macd_exit.value)
-                macd_exit_signal_value = float(macd_exit_signal.value)
-                current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="macd_exit", value=macd_exit_value)
-                current_instrument["collector"].add_indicator(timestamp=bar.ts_event, name="macd_exit_signal", value=macd_exit_signal_value)
-        
     def on_order_filled(self, order_filled) -> None:
         return self.base_on_order_filled(order_filled)
 
@@ -1682,10 +1670,10 @@ class CoinFullStrategy(BaseStrategy,Strategy):
         current_instrument = self.instrument_dict.get(instrument_id)
         if current_instrument is not None:
             self.reset_position_tracking(current_instrument)
-            current_instrument["bars_above_ema"] = 0
-            current_instrument["bars_below_ema"] = 0
-            current_instrument["bars_above_reversion_ema"] = 0
-            current_instrument["bars_below_reversion_ema"] = 0
+            current_instrument.bars_above_ema = 0
+            current_instrument.bars_below_ema = 0
+            current_instrument.bars_above_reversion_ema = 0
+            current_instrument.bars_below_reversion_ema = 0
         return self.base_on_position_closed(position_closed)
 
     def on_error(self, error: Exception) -> None:
@@ -17,6 +17,7 @@ from nautilus_trader.indicators.volatility import AverageTrueRange
 from tools.help_funcs.base_strategy import BaseStrategy
 from tools.order_management.order_types import OrderTypes
 from tools.order_management.risk_manager import RiskManager
+from tools.help_funcs.rolling_stats import DAY_NS, RollingQuantile, RollingTimeSum, RollingVariance
 from nautilus_trader.model.data import DataType
 from data.download.crypto_downloads.custom_class.bybit_metrics_data import BybitMetricsData
 from data.download.crypto_downloads.custom_class.fear_and_greed_data import FearAndGreedData
@@ -156,6 +157,9 @@ class CoinListingShortConfig(StrategyConfig):
     only_execute_short: bool = False
     hold_profit_for_remaining_days: bool = False
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
     max_leverage: Decimal = 10.0
 
 class CoinListingShortStrategy(BaseStrategy, Strategy):
@@ -207,8 +211,7 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
             current_instrument["min_price"] = coin_filters.get("min_price", 0.1)
             current_instrument["min_24h_volume"] = coin_filters.get("min_24h_volume", 5000000)
             current_instrument["min_sum_open_interest_value"] = coin_filters.get("min_sum_open_interest_value", 500000)
-            current_instrument["volume_history"] = []
-            current_instrument["price_history"] = []
+            current_instrument["volume_window"] = RollingTimeSum(DAY_NS, width=2)
             current_instrument["rolling_24h_volume"] = 0.0
             current_instrument["rolling_24h_dollar_volume"] = 0.0
             current_instrument["latest_open_interest_value"] = 0.0
@@ -231,11 +234,13 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
             # Scaled values (separate from raw values) - EXIT scaling
             current_instrument["latest_open_interest_value_scaled_exit"] = 0.0
 
-            # Historical storage for scaling - ENTRY Binance metrics
-            current_instrument["latest_open_interest_value_history_entry"] = []
+            # Historical storage for scaling - ENTRY Binance metrics (rolling order statistics, no sort per bar)
+            entry_window = self.config.entry_scale_binance_metrics["rolling_window_bars_binance"]
+            current_instrument["latest_open_interest_value_history_entry"] = RollingQuantile(entry_window)
 
             # Historical storage for scaling - EXIT Binance metrics
-            current_instrument["latest_open_interest_value_history_exit"] = []
+            exit_window = self.config.exit_scale_binance_metrics["rolling_window_bars_binance"]
+            current_instrument["latest_open_interest_value_history_exit"] = RollingQuantile(exit_window)
 
             # ENTRY Scaling configs - use values from YAML configuration
             entry_binance_config = self.config.entry_scale_binance_metrics
@@ -332,8 +337,8 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
         "risk_multiplier_min_z_threshold": btc_config.get("risk_multiplier_min_z_threshold", 2.0),
         "btc_instrument_id": None,
         
-        # Rolling z-score calculation components
-        "price_history": [],
+        # Rolling z-score calculation components, windows built by _setup_price_windows
+        "price_windows": {},
         "current_zscore": 0.0,
         "current_zscore_1": 0.0,
         "current_zscore_2": 0.0,
@@ -368,8 +373,8 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
         "risk_multiplier_min_z_threshold": sol_config.get("risk_multiplier_min_z_threshold", 4.0),
         "sol_instrument_id": None,
         
-        # Rolling z-score calculation components
-        "price_history": [],
+        # Rolling z-score calculation components, windows built by _setup_price_windows
+        "price_windows": {},
         "current_zscore": 0.0,
         "current_zscore_1": 0.0,
         "current_zscore_2": 0.0,
@@ -457,27 +462,17 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
     def update_rolling_24h_volume(self, bar: Bar, current_instrument: Dict[str, Any]) -> None:
         current_volume = float(bar.volume) if hasattr(bar, 'volume') else 0.0
         current_price = float(bar.close)
-        
-        if "volume_history" not in current_instrument:
-            current_instrument["volume_history"] = []
-        if "price_history" not in current_instrument:
-            current_instrument["price_history"] = []
-            
-        volume_history = current_instrument["volume_history"]
-        price_history = current_instrument["price_history"]
-        
-        volume_history.append(current_volume)
-        price_history.append(current_price)
-        
-        max_bars = 96
-        if len(volume_history) > max_bars:
-            volume_history.pop(0)
-            price_history.pop(0)
-        
-        current_instrument["rolling_24h_volume"] = sum(volume_history)
-        dollar_volumes = [vol * price for vol, price in zip(volume_history, price_history)]
-        current_instrument["rolling_24h_dollar_volume"] = sum(dollar_volumes)
-    
+
+        # true 24h window (volume, dollar volume) with running sums, independent of the bar interval
+        volume_window = current_instrument.get("volume_window")
+        if volume_window is None:
+            volume_window = RollingTimeSum(DAY_NS, width=2)
+            current_instrument["volume_window"] = volume_window
+        volume_window.append(bar.ts_event, current_volume, current_volume * current_price)
+
+        current_instrument["rolling_24h_volume"] = volume_window.sum(0)
+        current_instrument["rolling_24h_dollar_volume"] = volume_window.sum(1)
+
     def on_data(self, data) -> None:
         if isinstance(data, BybitMetricsData):
             self.on_metrics_data(data)
@@ -736,7 +731,6 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
         if not current_instrument.get("entry_scale_binance_enabled", True):
             return
 
-        rolling_window = current_instrument.get("entry_rolling_window_bars_binance", 100)
         upper_threshold = current_instrument.get("entry_upper_percentile_threshold_binance", 95)
         lower_threshold = current_instrument.get("entry_lower_percentile_threshold_binance", 5)
 
@@ -749,21 +743,18 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
             current_value = current_instrument[metric_key]
             history = current_instrument[history_key]
             
+            # RollingQuantile sized by rolling_window_bars_binance, evicts the oldest value itself
             history.append(current_value)
             
-            if len(history) > rolling_window:
-                history.pop(0)
-            
             # Calculate percentile-based scaling
             if len(history) > 1:  # Need at least 2 values for percentiles
-                sorted_values = sorted(history)
-                n = len(sorted_values)
+                n = len(history)
                 
                 lower_pos = (lower_threshold / 100.0) * (n - 1)
                 upper_pos = (upper_threshold / 100.0) * (n - 1)
                 
-                lower_val = sorted_values[int(lower_pos)]
-                upper_val = sorted_values[int(upper_pos)]
+                lower_val = history.kth(int(lower_pos))
+                upper_val = history.kth(int(upper_pos))
                 
                 if current_value <= lower_val:
                     scaled_value = -1.0
@@ -787,7 +778,6 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
         if not current_instrument.get("exit_scale_binance_enabled", True):
             return
 
-        rolling_window = current_instrument.get("exit_rolling_window_bars_binance", 100)
         upper_threshold = current_instrument.get("exit_upper_percentile_threshold_binance", 95)
         lower_threshold = current_instrument.get("exit_lower_percentile_threshold_binance", 5)
 
@@ -800,21 +790,18 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
             current_value = current_instrument[metric_key]
             history = current_instrument[history_key]
             
+            # RollingQuantile sized by rolling_window_bars_binance, evicts the oldest value itself
             history.append(current_value)
             
-            if len(history) > rolling_window:
-                history.pop(0)
-            
             # Calculate percentile-based scaling
             if len(history) > 1:  # Need at least 2 values for percentiles
-                sorted_values = sorted(history)
-                n = len(sorted_values)
+                n = len(history)
                 
                 lower_pos = (lower_threshold / 100.0) * (n - 1)
                 upper_pos = (upper_threshold / 100.0) * (n - 1)
                 
-                lower_val = sorted_values[int(lower_pos)]
-                upper_val = sorted_values[int(upper_pos)]
+                lower_val = history.kth(int(lower_pos))
+                upper_val = history.kth(int(upper_pos))
                 
                 if current_value <= lower_val:
                     scaled_value = -1.0
@@ -899,13 +886,13 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
             self.btc_context["btc_instrument_id"] = bar.bar_type.instrument_id
 
         current_price = float(bar.close)
-        self.btc_context["price_history"].append(current_price)
-        
-        window_size = self.btc_context["rolling_zscore"]
-        if len(self.btc_context["price_history"]) > window_size:
-            self.btc_context["price_history"].pop(0)
-        
-        self.update_btc_risk_metrics()
+        if not self.btc_context["price_windows"]:
+            self._setup_price_windows(self.btc_context)
+        self.update_btc_risk_metrics(current_price)
+        # leak-safe: the current price only enters the statistics of the following bars
+        if current_price == current_price:
+            for price_window in self.btc_context["price_windows"].values():
+                price_window.append(current_price)
     
     def process_sol_bar(self, bar: Bar) -> None:
         if not self.config.sol_performance_risk_scaling.get("enabled", False):
@@ -918,175 +905,118 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
             self.sol_context["sol_instrument_id"] = bar.bar_type.instrument_id
 
         current_price = float(bar.close)
-        self.sol_context["price_history"].append(current_price)
-        
-        window_size = self.sol_context["rolling_zscore"]
-        if len(self.sol_context["price_history"]) > window_size:
-            self.sol_context["price_history"].pop(0)
-        
-        self.update_sol_risk_metrics()
-        
-    # Helper: leak-safe rolling z-score with clamping
-    def _compute_rolling_zscore(self, prices: List[float], window: int, min_z: float, max_z: float) -> float:
-        if len(prices) < 2:
+        if not self.sol_context["price_windows"]:
+            self._setup_price_windows(self.sol_context)
+        self.update_sol_risk_metrics(current_price)
+        # leak-safe: the current price only enters the statistics of the following bars
+        if current_price == current_price:
+            for price_window in self.sol_context["price_windows"].values():
+                price_window.append(current_price)
+        
+    def _setup_price_windows(self, context: Dict[str, Any]) -> None:
+        # previous prices per z-score window; the extra windows are capped by the main one (as before with one price list)
+        main_window = max(int(context["rolling_zscore"]) - 1, 1)
+        context["price_windows"]["rolling_zscore"] = RollingVariance(main_window)
+        for i in range(1, 6):
+            key = f"rolling_zscore_{i}"
+            win = context.get(key)
+            if win is not None:
+                context["price_windows"][key] = RollingVariance(max(min(int(win), main_window), 1))
+
+    # Helper: leak-safe rolling z-score with clamping (window holds the previous prices only)
+    def _compute_rolling_zscore(self, window: RollingVariance, current_price: float, min_z: float, max_z: float) -> float:
+        if len(window) < 2:
             return 0.0
-        stats_data = prices[:-1]
-        if len(stats_data) < 2:
-            return 0.0
-        if len(stats_data) > window:
-            rolling_data = stats_data[-window:]
-        else:
-            rolling_data = stats_data
-
-        mean = sum(rolling_data) / len(rolling_data)
-        if len(rolling_data) > 1:
-            variance = sum((x - mean) ** 2 for x in rolling_data) / (len(rolling_data) - 1)
-            std = variance ** 0.5
-        else:
-            std = 0.0
-
-        current_price = prices[-1]
-        z = (current_price - mean) / std if std > 0 else 0.0
+        std = window.std() or 0.0
+        z = (current_price - window.mean) / std if std > 0 else 0.0
         # Clamp
         return max(min_z, min(max_z, z))
 
-    def update_btc_risk_metrics(self) -> None:
-        if not hasattr(self, 'btc_context') or len(self.btc_context["price_history"]) < 2:
-            if hasattr(self, 'btc_context'):
-                self.btc_context["current_risk_multiplier"] = 1.0
+    def update_btc_risk_metrics(self, current_price: float) -> None:
+        if not hasattr(self, 'btc_context'):
             return
-
-        price_history = self.btc_context["price_history"]
-        window_size = self.btc_context["rolling_zscore"]
-
-        if len(price_history) >= 2:
-            stats_data = price_history[:-1]
-            
-            if len(stats_data) > window_size:
-                rolling_data = stats_data[-window_size:]
-            else:
-                rolling_data = stats_data
-
-            if any(x is None or x != x for x in rolling_data):
-                self.btc_context["current_risk_multiplier"] = 1.0
-                return
-                
-            self.btc_context["rolling_mean"] = sum(rolling_data) / len(rolling_data)
-
-            if len(rolling_data) > 1:
-                variance = sum((x - self.btc_context["rolling_mean"]) ** 2 for x in rolling_data) / (len(rolling_data) - 1)
-                raw_std = variance ** 0.5
-                min_std_threshold = abs(self.btc_context["rolling_mean"]) * 0.001
-                self.btc_context["rolling_std"] = max(raw_std, min_std_threshold)
-            else:
-                self.btc_context["rolling_std"] = abs(self.btc_context["rolling_mean"]) * 0.001
-            
-            # Calculate main z-score (clamped)
-            current_price = price_history[-1]
-            if current_price is None or current_price != current_price:
-                self.btc_context["current_risk_multiplier"] = 1.0
-                return
-
-            if self.btc_context["rolling_std"] > 0:
-                raw_z = (current_price - self.btc_context["rolling_mean"]) / self.btc_context["rolling_std"]
-            else:
-                raw_z = 0.0
-
-            # Clamp z-score to configured bounds
-            zscore_main = max(self.btc_context["min_zscore"], 
-                              min(self.btc_context["max_zscore"], raw_z))
-            self.btc_context["current_zscore"] = zscore_main
-
-            # Compute additional window z-scores and store them
-            min_z = self.btc_context["min_zscore"]
-            max_z = self.btc_context["max_zscore"]
-            current_zscores = {"rolling_zscore": zscore_main}
-
-            for i in range(1, 6):
-                key = f"rolling_zscore_{i}"
-                win = self.btc_context.get(key)
-                if win is None:
-                    continue
-                z_i = self._compute_rolling_zscore(price_history, int(win), min_z, max_z)
-                self.btc_context[f"current_zscore_{i}"] = z_i
-                current_zscores[key] = z_i
-
-            self.btc_context["current_zscores"] = current_zscores
-            
-            # Risk multiplier still derived from main window
-            risk_multiplier = self._zscore_to_risk_multiplier_btc(zscore_main)
-            self.btc_context["current_risk_multiplier"] = risk_multiplier
-        else:
+        price_window = self.btc_context["price_windows"].get("rolling_zscore")
+        if price_window is None or len(price_window) == 0 or current_price != current_price:
             self.btc_context["current_risk_multiplier"] = 1.0
-
-    def update_sol_risk_metrics(self) -> None:
-        if not hasattr(self, 'sol_context') or len(self.sol_context["price_history"]) < 2:
-            if hasattr(self, 'sol_context'):
-                self.sol_context["current_risk_multiplier"] = 1.0
             return
 
-        price_history = self.sol_context["price_history"]
-        window_size = self.sol_context["rolling_zscore"]
+        self.btc_context["rolling_mean"] = price_window.mean
+        min_std_threshold = abs(self.btc_context["rolling_mean"]) * 0.001
+        self.btc_context["rolling_std"] = max(price_window.std() or 0.0, min_std_threshold)
 
-        if len(price_history) >= 2:
-            stats_data = price_history[:-1]
-            
-            if len(stats_data) > window_size:
-                rolling_data = stats_data[-window_size:]
-            else:
-                rolling_data = stats_data
+        # Calculate main z-score (clamped)
+        if self.btc_context["rolling_std"] > 0:
+            raw_z = (current_price - self.btc_context["rolling_mean"]) / self.btc_context["rolling_std"]
+        else:
+            raw_z = 0.0
+
+        # Clamp z-score to configured bounds
+        zscore_main = max(self.btc_context["min_zscore"], 
+                          min(self.btc_context["max_zscore"], raw_z))
+        self.btc_context["current_zscore"] = zscore_main
+
+        # Compute additional window z-scores and store them
+        min_z = self.btc_context["min_zscore"]
+        max_z = self.btc_context["max_zscore"]
+        current_zscores = {"rolling_zscore": zscore_main}
+
+        for i in range(1, 6):
+            key = f"rolling_zscore_{i}"
+            window = self.btc_context["price_windows"].get(key)
+            if window is None:
+                continue
+            z_i = self._compute_rolling_zscore(window, current_price, min_z, max_z)
+            self.btc_context[f"current_zscore_{i}"] = z_i
+            current_zscores[key] = z_i
 
-            if any(x is None or x != x for x in rolling_data):
-                self.sol_context["current_risk_multiplier"] = 1.0
-                return
-                
-            self.sol_context["rolling_mean"] = sum(rolling_data) / len(rolling_data)
+        self.btc_context["current_zscores"] = current_zscores
 
-            if len(rolling_data) > 1:
-                variance = sum((x - self.sol_context["rolling_mean"]) ** 2 for x in rolling_data) / (len(rolling_data) - 1)
-                raw_std = variance ** 0.5
-                min_std_threshold = abs(self.sol_context["rolling_mean"]) * 0.001
-                self.sol_context["rolling_std"] = max(raw_std, min_std_threshold)
-            else:
-                self.sol_context["rolling_std"] = abs(self.sol_context["rolling_mean"]) * 0.001
-            
-            # Calculate main z-score (clamped)
-            current_price = price_history[-1]
-            if current_price is None or current_price != current_price:
-                self.sol_context["current_risk_multiplier"] = 1.0
-                return
+        # Risk multiplier still derived from main window
+        risk_multiplier = self._zscore_to_risk_multiplier_btc(zscore_main)
+        self.btc_context["current_risk_multiplier"] = risk_multiplier
 
-            if self.sol_context["rolling_std"] > 0:
-                raw_z = (current_price - self.sol_context["rolling_mean"]) / self.sol_context["rolling_std"]
-            else:
-                raw_z = 0.0
-
-            # Clamp z-score to configured bounds
-            zscore_main = max(self.sol_context["min_zscore"], 
-                              min(self.sol_context["max_zscore"], raw_z))
-            self.sol_context["current_zscore"] = zscore_main
-
-            # Compute additional window z-scores and store them
-            min_z = self.sol_context["min_zscore"]
-            max_z = self.sol_context["max_zscore"]
-            current_zscores = {"rolling_zscore": zscore_main}
-
-            for i in range(1, 6):
-                key = f"rolling_zscore_{i}"
-                win = self.sol_context.get(key)
-                if win is None:
-                    continue
-                z_i = self._compute_rolling_zscore(price_history, int(win), min_z, max_z)
-                self.sol_context[f"current_zscore_{i}"] = z_i
-                current_zscores[key] = z_i
+    def update_sol_risk_metrics(self, current_price: float) -> None:
+        if not hasattr(self, 'sol_context'):
+            return
+        price_window = self.sol_context["price_windows"].get("rolling_zscore")
+        if price_window is None or len(price_window) == 0 or current_price != current_price:
+            self.sol_context["current_risk_multiplier"] = 1.0
+            return
 
-            self.sol_context["current_zscores"] = current_zscores
+        self.sol_context["rolling_mean"] = price_window.mean
+        min_std_threshold = abs(self.sol_context["rolling_mean"]) * 0.001
+        self.sol_context["rolling_std"] = max(price_window.std() or 0.0, min_std_threshold)
 
-            # Risk multiplier still derived from main window
-            risk_multiplier = self._zscore_to_risk_multiplier_sol(zscore_main)
-            self.sol_context["current_risk_multiplier"] = risk_multiplier
+        # Calculate main z-score (clamped)
+        if self.sol_context["rolling_std"] > 0:
+            raw_z = (current_price - self.sol_context["rolling_mean"]) / self.sol_context["rolling_std"]
         else:
-            self.sol_context["current_risk_multiplier"] = 1.0
+            raw_z = 0.0
+
+        # Clamp z-score to configured bounds
+        zscore_main = max(self.sol_context["min_zscore"], 
+                          min(self.sol_context["max_zscore"], raw_z))
+        self.sol_context["current_zscore"] = zscore_main
+
+        # Compute additional window z-scores and store them
+        min_z = self.sol_context["min_zscore"]
+        max_z = self.sol_context["max_zscore"]
+        current_zscores = {"rolling_zscore": zscore_main}
+
+        for i in range(1, 6):
+            key = f"rolling_zscore_{i}"
+            window = self.sol_context["price_windows"].get(key)
+            if window is None:
+                continue
+            z_i = self._compute_rolling_zscore(window, current_price, min_z, max_z)
+            self.sol_context[f"current_zscore_{i}"] = z_i
+            current_zscores[key] = z_i
+
+        self.sol_context["current_zscores"] = current_zscores
+
+        # Risk multiplier still derived from main window
+        risk_multiplier = self._zscore_to_risk_multiplier_sol(zscore_main)
+        self.sol_context["current_risk_multiplier"] = risk_multiplier
 
     def _zscore_to_risk_multiplier_btc(self, zscore: float) -> float:
         min_risk = self.btc_context["risk_multiplier_max_z_threshold"]  # 0.2 (low risk when BTC bullish)
@@ -1318,7 +1248,8 @@ class CoinListingShortStrategy(BaseStrategy, Strategy):
             exit_trend_ema.handle_bar(bar)
         
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
         if self.config.use_aroon_simple_trend_system.get("enabled", False):
             aroon = current_instrument["aroon"]
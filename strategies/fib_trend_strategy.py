@@ -34,6 +34,9 @@ class FibTrendStrategyConfig(StrategyConfig):
     fib_sl_buffer: float = 0.001
 
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
     only_trade_rth: bool = True
 
 class FibTrendStrategy(BaseStrategy, Strategy):
@@ -144,7 +147,8 @@ class FibTrendStrategy(BaseStrategy, Strategy):
             
         self.entry_logic(bar, current_instrument)
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
     # -------------------------------------------------
     # Entry Logic per Instrument
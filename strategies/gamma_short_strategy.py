@@ -14,6 +14,7 @@ from nautilus_trader.indicators.averages import ExponentialMovingAverage
 from tools.help_funcs.base_strategy import BaseStrategy
 from tools.order_management.order_types import OrderTypes
 from tools.order_management.risk_manager import RiskManager
+from tools.help_funcs.rolling_stats import DAY_NS, RollingQuantile, RollingTimeSum, RollingVariance
 from nautilus_trader.model.data import DataType
 from data.download.crypto_downloads.custom_class.metrics_data import MetricsData
 
@@ -131,12 +132,20 @@ class GammaShortConfig(StrategyConfig):
 
     only_execute_short: bool = False
     hold_profit_for_remaining_days: bool = False
+    # False: BTC / SOL multipliers are updated on arrival of their bar (baseline, depends on bar order within a ts);
+    # True: once per time step in on_bar_slice, coins always use the multiplier of the previous step
+    risk_scaling_per_slice: bool = False
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
 
 class GammaShortStrategy(BaseStrategy, Strategy):
 
     def __init__(self, config: GammaShortConfig):
         super().__init__(config)
+        if not config.risk_scaling_per_slice:
+            self.bar_slice_dispatcher = None
         self.risk_manager = RiskManager(config)
         self.risk_manager.set_strategy(self)
         self.order_types = OrderTypes(self) 
@@ -179,8 +188,7 @@ class GammaShortStrategy(BaseStrategy, Strategy):
             current_instrument["min_price"] = coin_filters.get("min_price", 0.1)
             current_instrument["min_24h_volume"] = coin_filters.get("min_24h_volume", 5000000)
             current_instrument["min_sum_open_interest_value"] = coin_filters.get("min_sum_open_interest_value", 500000)
-            current_instrument["volume_history"] = []
-            current_instrument["price_history"] = []
+            current_instrument["volume_window"] = RollingTimeSum(DAY_NS, width=2)
             current_instrument["rolling_24h_volume"] = 0.0
             current_instrument["rolling_24h_dollar_volume"] = 0.0
             current_instrument["latest_open_interest_value"] = 0.0
@@ -210,15 +218,17 @@ class GammaShortStrategy(BaseStrategy, Strategy):
             current_instrument["count_long_short_ratio_scaled_exit"] = 0.0
             current_instrument["latest_open_interest_value_scaled_exit"] = 0.0
 
-            # Historical storage for scaling - ENTRY Binance metrics
-            current_instrument["sum_toptrader_long_short_ratio_history_entry"] = []
-            current_instrument["count_long_short_ratio_history_entry"] = []
-            current_instrument["latest_open_interest_value_history_entry"] = []
+            # Historical storage for scaling - ENTRY Binance metrics (rolling order statistics, no sort per bar)
+            entry_window = self.config.entry_scale_binance_metrics["rolling_window_bars_binance"]
+            current_instrument["sum_toptrader_long_short_ratio_history_entry"] = RollingQuantile(entry_window)
+            current_instrument["count_long_short_ratio_history_entry"] = RollingQuantile(entry_window)
+            current_instrument["latest_open_interest_value_history_entry"] = RollingQuantile(entry_window)
 
             # Historical storage for scaling - EXIT Binance metrics
-            current_instrument["sum_toptrader_long_short_ratio_history_exit"] = []
-            current_instrument["count_long_short_ratio_history_exit"] = []
-            current_instrument["latest_open_interest_value_history_exit"] = []
+            exit_window = self.config.exit_scale_binance_metrics["rolling_window_bars_binance"]
+            current_instrument["sum_toptrader_long_short_ratio_history_exit"] = RollingQuantile(exit_window)
+            current_instrument["count_long_short_ratio_history_exit"] = RollingQuantile(exit_window)
+            current_instrument["latest_open_interest_value_history_exit"] = RollingQuantile(exit_window)
 
             # ENTRY Scaling configs - use values from YAML configuration
             entry_binance_config = self.config.entry_scale_binance_metrics
@@ -298,8 +308,8 @@ class GammaShortStrategy(BaseStrategy, Strategy):
         "risk_multiplier_min_z_threshold": btc_config.get("risk_multiplier_min_z_threshold", 2.0),
         "btc_instrument_id": None,
         
-        # Rolling z-score calculation components
-        "price_history": [],
+        # Rolling z-score calculation components (window of the previous prices, current price excluded)
+        "price_window": RollingVariance(max(btc_config.get("rolling_zscore", 200) - 1, 1)),
         "current_zscore": 0.0,
         "rolling_mean": 0.0,
         "rolling_std": 0.0,
@@ -322,8 +332,8 @@ class GammaShortStrategy(BaseStrategy, Strategy):
         "risk_multiplier_min_z_threshold": sol_config.get("risk_multiplier_min_z_threshold", 4.0),
         "sol_instrument_id": None,
         
-        # Rolling z-score calculation components
-        "price_history": [],
+        # Rolling z-score calculation components (window of the previous prices, current price excluded)
+        "price_window": RollingVariance(max(sol_config.get("rolling_zscore", 500) - 1, 1)),
         "current_zscore": 0.0,
         "rolling_mean": 0.0,
         "rolling_std": 0.0,
@@ -344,27 +354,17 @@ class GammaShortStrategy(BaseStrategy, Strategy):
     def update_rolling_24h_volume(self, bar: Bar, current_instrument: Dict[str, Any]) -> None:
         current_volume = float(bar.volume) if hasattr(bar, 'volume') else 0.0
         current_price = float(bar.close)
-        
-        if "volume_history" not in current_instrument:
-            current_instrument["volume_history"] = []
-        if "price_history" not in current_instrument:
-            current_instrument["price_history"] = []
-            
-        volume_history = current_instrument["volume_history"]
-        price_history = current_instrument["price_history"]
-        
-        volume_history.append(current_volume)
-        price_history.append(current_price)
-        
-        max_bars = 96
-        if len(volume_history) > max_bars:
-            volume_history.pop(0)
-            price_history.pop(0)
-        
-        current_instrument["rolling_24h_volume"] = sum(volume_history)
-        dollar_volumes = [vol * price for vol, price in zip(volume_history, price_history)]
-        current_instrument["rolling_24h_dollar_volume"] = sum(dollar_volumes)
-    
+
+        # true 24h window (volume, dollar volume) with running sums, independent of the bar interval
+        volume_window = current_instrument.get("volume_window")
+        if volume_window is None:
+            volume_window = RollingTimeSum(DAY_NS, width=2)
+            current_instrument["volume_window"] = volume_window
+        volume_window.append(bar.ts_event, current_volume, current_volume * current_price)
+
+        current_instrument["rolling_24h_volume"] = volume_window.sum(0)
+        current_instrument["rolling_24h_dollar_volume"] = volume_window.sum(1)
+
     def on_data(self, data) -> None:
         if isinstance(data, MetricsData):
             self.on_metrics_data(data)
@@ -649,7 +649,6 @@ class GammaShortStrategy(BaseStrategy, Strategy):
         if not current_instrument.get("entry_scale_binance_enabled", True):
             return
 
-        rolling_window = current_instrument.get("entry_rolling_window_bars_binance", 100)
         upper_threshold = current_instrument.get("entry_upper_percentile_threshold_binance", 95)
         lower_threshold = current_instrument.get("entry_lower_percentile_threshold_binance", 5)
 
@@ -663,21 +662,18 @@ class GammaShortStrategy(BaseStrategy, Strategy):
             current_value = current_instrument[metric_key]
             history = current_instrument[history_key]
             
+            # RollingQuantile sized by rolling_window_bars_binance, evicts the oldest value itself
             history.append(current_value)
             
-            if len(history) > rolling_window:
-                history.pop(0)
-            
             # Calculate percentile-based scaling
             if len(history) > 1:  # Need at least 2 values for percentiles
-                sorted_values = sorted(history)
-                n = len(sorted_values)
+                n = len(history)
                 
                 lower_pos = (lower_threshold / 100.0) * (n - 1)
                 upper_pos = (upper_threshold / 100.0) * (n - 1)
                 
-                lower_val = sorted_values[int(lower_pos)]
-                upper_val = sorted_values[int(upper_pos)]
+                lower_val = history.kth(int(lower_pos))
+                upper_val = history.kth(int(upper_pos))
                 
                 if current_value <= lower_val:
                     scaled_value = -1.0
@@ -701,7 +697,6 @@ class GammaShortStrategy(BaseStrategy, Strategy):
         if not current_instrument.get("exit_scale_binance_enabled", True):
             return
 
-        rolling_window = current_instrument.get("exit_rolling_window_bars_binance", 100)
         upper_threshold = current_instrument.get("exit_upper_percentile_threshold_binance", 95)
         lower_threshold = current_instrument.get("exit_lower_percentile_threshold_binance", 5)
 
@@ -715,21 +710,18 @@ class GammaShortStrategy(BaseStrategy, Strategy):
             current_value = current_instrument[metric_key]
             history = current_instrument[history_key]
             
+            # RollingQuantile sized by rolling_window_bars_binance, evicts the oldest value itself
             history.append(current_value)
             
-            if len(history) > rolling_window:
-                history.pop(0)
-            
             # Calculate percentile-based scaling
             if len(history) > 1:  # Need at least 2 values for percentiles
-                sorted_values = sorted(history)
-                n = len(sorted_values)
+                n = len(history)
                 
                 lower_pos = (lower_threshold / 100.0) * (n - 1)
                 upper_pos = (upper_threshold / 100.0) * (n - 1)
                 
-                lower_val = sorted_values[int(lower_pos)]
-                upper_val = sorted_values[int(upper_pos)]
+                lower_val = history.kth(int(lower_pos))
+                upper_val = history.kth(int(upper_pos))
                 
                 if current_value <= lower_val:
                     scaled_value = -1.0
@@ -810,13 +802,9 @@ class GammaShortStrategy(BaseStrategy, Strategy):
             self.btc_context["btc_instrument_id"] = bar.bar_type.instrument_id
 
         current_price = float(bar.close)
-        self.btc_context["price_history"].append(current_price)
-        
-        window_size = self.btc_context["rolling_zscore"]
-        if len(self.btc_context["price_history"]) > window_size:
-            self.btc_context["price_history"].pop(0)
-        
-        self.update_btc_risk_metrics()
+        self.update_btc_risk_metrics(current_price)
+        # leak-safe: the current price only enters the statistics of the following bars
+        self.btc_context["price_window"].append(current_price)
     
     def process_sol_bar(self, bar: Bar) -> None:
         if not self.config.sol_performance_risk_scaling.get("enabled", False):
@@ -829,100 +817,60 @@ class GammaShortStrategy(BaseStrategy, Strategy):
             self.sol_context["sol_instrument_id"] = bar.bar_type.instrument_id
 
         current_price = float(bar.close)
-        self.sol_context["price_history"].append(current_price)
-        
-        window_size = self.sol_context["rolling_zscore"]
-        if len(self.sol_context["price_history"]) > window_size:
-            self.sol_context["price_history"].pop(0)
-        
-        self.update_sol_risk_metrics()
+        self.update_sol_risk_metrics(current_price)
+        # leak-safe: the current price only enters the statistics of the following bars
+        self.sol_context["price_window"].append(current_price)
         
 
-    def update_btc_risk_metrics(self) -> None:
-        if not hasattr(self, 'btc_context') or len(self.btc_context["price_history"]) < 2:
-            if hasattr(self, 'btc_context'):
-                self.btc_context["current_risk_multiplier"] = 1.0
+    def update_btc_risk_metrics(self, current_price: float) -> None:
+        if not hasattr(self, 'btc_context'):
+            return
+        price_window = self.btc_context["price_window"]
+        if len(price_window) == 0 or self.btc_context["rolling_zscore"] < 2:
+            self.btc_context["current_risk_multiplier"] = 1.0
             return
 
-        price_history = self.btc_context["price_history"]
-        window_size = self.btc_context["rolling_zscore"]
-
-        if len(price_history) >= 2:
-            # Use leak-safe approach: exclude current price from statistics calculation
-            stats_data = price_history[:-1]
-            
-            # Apply the window size properly
-            if len(stats_data) > window_size:
-                rolling_data = stats_data[-window_size:]  # Take last window_size points
-            else:
-                rolling_data = stats_data  # Use all available data if less than window
-                
-            self.btc_context["rolling_mean"] = sum(rolling_data) / len(rolling_data)
+        # O(1) mean / sample std of the last rolling_zscore - 1 prices
+        self.btc_context["rolling_mean"] = price_window.mean
+        self.btc_context["rolling_std"] = price_window.std() or 0.0
 
-            if len(rolling_data) > 1:
-                variance = sum((x - self.btc_context["rolling_mean"]) ** 2 for x in rolling_data) / (len(rolling_data) - 1)
-                self.btc_context["rolling_std"] = variance ** 0.5
-            else:
-                self.btc_context["rolling_std"] = 0.0
-            
-            # Calculate z-score for current price
-            current_price = price_history[-1]
-            if self.btc_context["rolling_std"] > 0:
-                self.btc_context["current_zscore"] = (current_price - self.btc_context["rolling_mean"]) / self.btc_context["rolling_std"]
-            else:
-                self.btc_context["current_zscore"] = 0.0
-            
-            # Clamp z-score to configured bounds
-            zscore = max(self.btc_context["min_zscore"], 
-                        min(self.btc_context["max_zscore"], self.btc_context["current_zscore"]))
-            
-            risk_multiplier = self._zscore_to_risk_multiplier_btc(zscore)
-            self.btc_context["current_risk_multiplier"] = risk_multiplier
+        # Calculate z-score for current price
+        if self.btc_context["rolling_std"] > 0:
+            self.btc_context["current_zscore"] = (current_price - self.btc_context["rolling_mean"]) / self.btc_context["rolling_std"]
         else:
-            self.btc_context["current_risk_multiplier"] = 1.0
+            self.btc_context["current_zscore"] = 0.0
 
-    def update_sol_risk_metrics(self) -> None:
-        if not hasattr(self, 'sol_context') or len(self.sol_context["price_history"]) < 2:
-            if hasattr(self, 'sol_context'):
-                self.sol_context["current_risk_multiplier"] = 1.0
-            return
+        # Clamp z-score to configured bounds
+        zscore = max(self.btc_context["min_zscore"], 
+                    min(self.btc_context["max_zscore"], self.btc_context["current_zscore"]))
 
-        price_history = self.sol_context["price_history"]
-        window_size = self.sol_context["rolling_zscore"]
+        risk_multiplier = self._zscore_to_risk_multiplier_btc(zscore)
+        self.btc_context["current_risk_multiplier"] = risk_multiplier
 
-        if len(price_history) >= 2:
-            # Use leak-safe approach: exclude current price from statistics calculation
-            stats_data = price_history[:-1]
-            
-            # Apply the window size properly
-            if len(stats_data) > window_size:
-                rolling_data = stats_data[-window_size:]  # Take last window_size points
-            else:
-                rolling_data = stats_data  # Use all available data if less than window
-                
-            self.sol_context["rolling_mean"] = sum(rolling_data) / len(rolling_data)
+    def update_sol_risk_metrics(self, current_price: float) -> None:
+        if not hasattr(self, 'sol_context'):
+            return
+        price_window = self.sol_context["price_window"]
+        if len(price_window) == 0 or self.sol_context["rolling_zscore"] < 2:
+            self.sol_context["current_risk_multiplier"] = 1.0
+            return
 
-            if len(rolling_data) > 1:
-                variance = sum((x - self.sol_context["rolling_mean"]) ** 2 for x in rolling_data) / (len(rolling_data) - 1)
-                self.sol_context["rolling_std"] = variance ** 0.5
-            else:
-                self.sol_context["rolling_std"] = 0.0
-            
-            # Calculate z-score for current price
-            current_price = price_history[-1]
-            if self.sol_context["rolling_std"] > 0:
-                self.sol_context["current_zscore"] = (current_price - self.sol_context["rolling_mean"]) / self.sol_context["rolling_std"]
-            else:
-                self.sol_context["current_zscore"] = 0.0
-            
-            # Clamp z-score to configured bounds
-            zscore = max(self.sol_context["min_zscore"], 
-                        min(self.sol_context["max_zscore"], self.sol_context["current_zscore"]))
-            
-            risk_multiplier = self._zscore_to_risk_multiplier_sol(zscore)
-            self.sol_context["current_risk_multiplier"] = risk_multiplier
+        # O(1) mean / sample std of the last rolling_zscore - 1 prices
+        self.sol_context["rolling_mean"] = price_window.mean
+        self.sol_context["rolling_std"] = price_window.std() or 0.0
+
+        # Calculate z-score for current price
+        if self.sol_context["rolling_std"] > 0:
+            self.sol_context["current_zscore"] = (current_price - self.sol_context["rolling_mean"]) / self.sol_context["rolling_std"]
         else:
-            self.sol_context["current_risk_multiplier"] = 1.0
+            self.sol_context["current_zscore"] = 0.0
+
+        # Clamp z-score to configured bounds
+        zscore = max(self.sol_context["min_zscore"], 
+                    min(self.sol_context["max_zscore"], self.sol_context["current_zscore"]))
+
+        risk_multiplier = self._zscore_to_risk_multiplier_sol(zscore)
+        self.sol_context["current_risk_multiplier"] = risk_multiplier
 
     def _zscore_to_risk_multiplier_btc(self, zscore: float) -> float:
         min_risk = self.btc_context["risk_multiplier_max_z_threshold"]  # 0.2 (low risk when BTC bullish)
@@ -1069,23 +1017,34 @@ class GammaShortStrategy(BaseStrategy, Strategy):
         
         return self.calculate_fixed_position_size(instrument_id, entry_price)
 
-    def on_bar(self, bar: Bar) -> None:
+    def on_bar_slice(self, ts: int, bars_by_instrument) -> None:
+        # only with risk_scaling_per_slice: BTC / SOL risk multipliers once per time step, all coins of the next
+        # step see the same multiplier (instead of depending on whether the BTC / SOL bar came before the coin bar)
+        for instrument_id, bar in bars_by_instrument.items():
+            if self.is_btc_instrument(instrument_id) or self.is_sol_instrument(instrument_id):
+                self.process_risk_scaling_bar(bar)
+
+    def process_risk_scaling_bar(self, bar: Bar) -> None:
+        """updates the BTC / SOL risk multiplier and logs z-score / multiplier with the bar they were computed on"""
         instrument_id = bar.bar_type.instrument_id
-        
+        current_instrument = self.instrument_dict.get(instrument_id)
         if self.is_btc_instrument(instrument_id):
             self.process_btc_bar(bar)
-            
-            btc_instrument = self.instrument_dict.get(instrument_id)
-            if btc_instrument is not None:
-                self.update_btc_visualizer_data(bar, btc_instrument)
-            return
-        
-        if self.is_sol_instrument(instrument_id):
+            if current_instrument is not None:
+                self.update_btc_visualizer_data(bar, current_instrument)
+        else:
             self.process_sol_bar(bar)
-            
-            sol_instrument = self.instrument_dict.get(instrument_id)
-            if sol_instrument is not None:
-                self.update_sol_visualizer_data(bar, sol_instrument)
+            if current_instrument is not None:
+                self.update_sol_visualizer_data(bar, current_instrument)
+
+    def on_bar(self, bar: Bar) -> None:
+        instrument_id = bar.bar_type.instrument_id
+        self.base_dispatch_bar_slice(bar)
+        
+        if self.is_btc_instrument(instrument_id) or self.is_sol_instrument(instrument_id):
+            # with risk_scaling_per_slice they are handled in on_bar_slice
+            if self.bar_slice_dispatcher is None:
+                self.process_risk_scaling_bar(bar)
             return
             
         current_instrument = self.instrument_dict.get(instrument_id)
@@ -1106,7 +1065,8 @@ class GammaShortStrategy(BaseStrategy, Strategy):
             aroon.handle_bar(bar)
         
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
         if self.config.use_aroon_simple_trend_system.get("enabled", False):
             aroon = current_instrument["aroon"]
@@ -32,6 +32,9 @@ class Mean5mregimesStrategyConfig(StrategyConfig):
     gap_threshold_pct: float = 0.1
     vix_fear_threshold: float = 25.0
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
     invest_percent: float = 0.10
     only_trade_rth: bool = True
     initialization_window: int = 150
@@ -394,7 +397,8 @@ class Mean5mregimesStrategy(BaseStrategy, Strategy):
         self.check_for_long_exit(bar, adaptive_params, current_instrument)
         self.check_for_short_exit(bar, adaptive_params, current_instrument)
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
         current_instrument["prev_close"] = bar.close
 
     def count_open_position(self, instrument_id: InstrumentId) -> int:
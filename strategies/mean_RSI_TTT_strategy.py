@@ -28,6 +28,9 @@ class MeanRSITTTStrategyConfig(StrategyConfig):
     ttt_max_counter: int
     run_id: str
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
 
 class MeanRSITTTStrategy(BaseStrategy, Strategy):
     def __init__(self, config: MeanRSITTTStrategyConfig):
@@ -94,7 +97,8 @@ class MeanRSITTTStrategy(BaseStrategy, Strategy):
         current_instrument['breakout_analyser'].update_bars(bar)
         current_instrument['rsi'].handle_bar(bar) 
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
         # Check for TTT Breakout
         is_breakout, breakout_dir = current_instrument['breakout_analyser'].is_tttbreakout()
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone, timedelta
+from collections import deque
 from typing import Any, Dict, Optional, List, Union
 from nautilus_trader.trading import Strategy
 from nautilus_trader.trading.config import StrategyConfig
@@ -16,6 +17,8 @@ from nautilus_trader.indicators.trend import DirectionalMovement
 from tools.help_funcs.base_strategy import BaseStrategy
 from tools.order_management.order_types import OrderTypes
 from tools.order_management.risk_manager import RiskManager
+from tools.help_funcs.indicator_warmup import IndicatorWarmup, bar_arrays, load_indicator_snapshot, save_indicator_snapshot
+from tools.help_funcs.rolling_stats import RollingSum
 # from nautilus_trader.model.data import DataType
 # from data.download.crypto_downloads.custom_class.bybit_metrics_data import BybitMetricsData
 
@@ -135,6 +138,11 @@ class ShortThaBitchStratConfig(StrategyConfig):
     only_execute_short: bool = False
     hold_profit_for_remaining_days: bool = False
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
+    # live: indicator state is written here on stop and resumed on the next start (None = no snapshots)
+    indicator_snapshot_path: Optional[str] = None
     max_concurrent_positions: int = 50
     max_leverage: Decimal = 10.0
 
@@ -147,18 +155,25 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
         self.order_types = OrderTypes(self) 
         self.onboard_dates = self.load_onboard_dates()
         self._init_relative_strength()
+        # live bars are only tracked for the warm-up state if it is snapshotted on stop
+        self._track_warmup = bool(getattr(config, "indicator_snapshot_path", None))
+        # historical bars are buffered per instrument and folded into the warm-up once per request
+        # (request callback, or the first live bar of the instrument if that comes first)
+        self._historical_bars: Dict[InstrumentId, List[Bar]] = {}
+        self._historical_requests: Dict[Any, InstrumentId] = {}
+        self._live_instruments = set()
         self.add_instrument_context()
 
     def _init_relative_strength(self):
         rs_config = self.config.relative_strength_entry if isinstance(self.config.relative_strength_entry, dict) else {}
         if rs_config.get("enabled", False):
             lookback = rs_config.get("lookback_bars", 10)
-            self.btc_price_history = []
             self.btc_lookback = lookback
+            self.btc_price_history = deque(maxlen=lookback + 1)
             self.btc_current_price = None
         else:
-            self.btc_price_history = []
             self.btc_lookback = 10
+            self.btc_price_history = deque(maxlen=11)
             self.btc_current_price = None
 
     def add_instrument_context(self):
@@ -220,9 +235,10 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
             if atr_burst_config.get("enabled", False):
                 atr_burst_period = atr_burst_config.get("atr_period_calc", 40)
                 current_instrument["atr_burst"] = AverageTrueRange(atr_burst_period)
-                current_instrument["atr_history"] = []
-                current_instrument["tr_history"] = []
                 current_instrument["tr_lb"] = atr_burst_config.get("tr_lb", 3)
+                # running sums of the last tr_lb ATR values / upside true ranges
+                current_instrument["atr_history"] = RollingSum(current_instrument["tr_lb"])
+                current_instrument["tr_history"] = RollingSum(current_instrument["tr_lb"])
                 current_instrument["burst_detected"] = False
                 current_instrument["bars_since_burst"] = 0
                 current_instrument["burst_threshold"] = atr_burst_config.get("atr_burst_threshold", 10)
@@ -272,13 +288,51 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
             if atr_burst_config.get("enabled", False):
                 current_instrument["collector"].initialise_logging_indicator("tr_atr_ratio", 1)
 
+            current_instrument["warmup"] = IndicatorWarmup(self._warmup_specs(atr_period))
+
+    def _warmup_specs(self, atr_period: int) -> Dict[str, dict]:
+        """indicators whose state is computed vectorised from historical bars (see IndicatorWarmup)"""
+        specs = {"atr": {"kind": "atr", "period": atr_period}}
+        htf_ema_config = self.config.use_htf_ema_bias_filter if isinstance(self.config.use_htf_ema_bias_filter, dict) else {}
+        if htf_ema_config.get("enabled", False):
+            specs["htf_ema"] = {"kind": "ema", "period": htf_ema_config.get("ema_period", 200)}
+        macd_config = self.config.use_macd_simple_reversion_system if isinstance(self.config.use_macd_simple_reversion_system, dict) else {}
+        if macd_config.get("enabled", False):
+            specs["macd"] = {
+                "kind": "macd",
+                "fast_period": macd_config.get("macd_fast_period", 12),
+                "slow_period": macd_config.get("macd_slow_period", 26),
+                "signal_period": macd_config.get("macd_signal_period", 9),
+                "signal_key": "macd_signal_ema",
+                "prev_keys": ["prev_macd_line", "prev_macd_signal"],
+            }
+        macd_exit_config = self.config.use_macd_exit_system if isinstance(self.config.use_macd_exit_system, dict) else {}
+        if macd_exit_config.get("enabled", False):
+            specs["macd_exit"] = {
+                "kind": "macd",
+                "fast_period": macd_exit_config.get("macd_fast_exit_period", 10),
+                "slow_period": macd_exit_config.get("macd_slow_exit_period", 32),
+                "signal_period": macd_exit_config.get("macd_signal_exit_period", 10),
+                "signal_key": "macd_exit_signal",
+                "prev_keys": ["prev_macd_exit_line", "prev_macd_exit_signal"],
+            }
+        retest_config = self.config.retest_entry if isinstance(self.config.retest_entry, dict) else {}
+        if retest_config.get("enabled", False):
+            specs["retest_ema"] = {"kind": "ema", "period": retest_config.get("breakdown_ema_period", 50)}
+        return specs
+
 
     def on_start(self):
         super().on_start()
         # self._subscribe_to_metrics_data()  # Disabled - not configured in YAML
-        self._request_historical_bars()
+        resumed = self._resume_indicator_snapshot()
+        self._request_historical_bars(resumed)
+
+    def on_stop(self) -> None:
+        self._save_indicator_snapshot()
+        super().on_stop()
 
-    def _request_historical_bars(self):
+    def _historical_lookback_minutes(self) -> int:
         # Calculate how many bars we need based on indicator periods
         log_growth_config = self.config.log_growth_atr_risk if isinstance(self.config.log_growth_atr_risk, dict) else {}
         htf_ema_config = self.config.use_htf_ema_bias_filter if isinstance(self.config.use_htf_ema_bias_filter, dict) else {}
@@ -297,8 +351,48 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
             atr_burst_config.get("atr_period_calc", 40) + 100
         )
         
-        # Add 10% buffer to ensure we have enough data
-        bars_needed = int(max_lookback * 1.1)
+        # Add 10% buffer to ensure we have enough data, 15-minute bars
+        return int(max_lookback * 1.1) * 15
+
+    def _resume_indicator_snapshot(self) -> Dict[InstrumentId, int]:
+        """seeds the indicators from the last stop snapshot, returns the snapshot ts of every resumed instrument"""
+        path = getattr(self.config, "indicator_snapshot_path", None)
+        if not path:
+            return {}
+        snapshot = load_indicator_snapshot(path)
+        # older snapshots would leave a gap the historical request does not cover
+        oldest_ts = self.clock.timestamp_ns() - self._historical_lookback_minutes() * 60 * 1_000_000_000
+        resumed = {}
+        for inst_id, current_instrument in self.instrument_dict.items():
+            warmup = IndicatorWarmup.from_dict(snapshot.get(str(inst_id)), current_instrument["warmup"].specs)
+            if warmup is None or warmup.last_ts is None or warmup.last_ts < oldest_ts:
+                continue
+            current_instrument["warmup"] = warmup
+            warmup.inject(current_instrument)
+            resumed[inst_id] = warmup.last_ts
+        if resumed:
+            self.log.info(f"Resumed indicator state of {len(resumed)} instruments from {path}", LogColor.BLUE)
+        return resumed
+
+    def _save_indicator_snapshot(self) -> None:
+        path = getattr(self.config, "indicator_snapshot_path", None)
+        if not path:
+            return
+        try:
+            save_indicator_snapshot(path, {str(inst_id): ctx["warmup"] for inst_id, ctx in self.instrument_dict.items() if "warmup" in ctx})
+            self.log.info(f"Indicator snapshot written: {path}", LogColor.BLUE)
+        except Exception as e:
+            self.log.error(f"Failed to write indicator snapshot {path}: {e}", LogColor.RED)
+
+    def _request_historical_bars(self, resumed: Optional[Dict[InstrumentId, int]] = None):
+        resumed = resumed or {}
+        # RSI / directional movement have no snapshot and still need the full history
+        rsi_config = self.config.use_rsi_simple_reversion_system if isinstance(self.config.use_rsi_simple_reversion_system, dict) else {}
+        dm_config = self.config.directional_movement_filter if isinstance(self.config.directional_movement_filter, dict) else {}
+        if rsi_config.get("enabled", False) or dm_config.get("enabled", False):
+            resumed = {}
+        lookback_minutes = self._historical_lookback_minutes()
+        bars_needed = lookback_minutes // 15
         
         self.log.info(f"Requesting {bars_needed} historical bars for {len(self.config.instruments)} instruments",LogColor.BLUE)
 
@@ -323,11 +417,14 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
                 bar_type = BarType.from_str(bar_types[0])
                 
                 # Calculate how far back we need to go (bars_needed * 15 minutes for 15-min bars)
-                lookback_minutes = bars_needed * 15
                 start_time = self._clock.utc_now() - timedelta(minutes=lookback_minutes)
+                if instrument_id in resumed:
+                    # state from the snapshot only has to be continued over the gap since the stop
+                    start_time = max(start_time, datetime.fromtimestamp(resumed[instrument_id] / 1e9, tz=timezone.utc))
                 
-                # Request historical bars using start time
-                self.request_bars(bar_type, start=start_time)
+                # Request historical bars using start time, seeded once the request has completed
+                request_id = self.request_bars(bar_type, start=start_time, callback=self._on_historical_request_done)
+                self._historical_requests[request_id] = instrument_id
                 
             except Exception as e:
                 self.log.error(
@@ -505,8 +602,6 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
         price = float(bar.close)
         self.btc_current_price = price
         self.btc_price_history.append(price)
-        if len(self.btc_price_history) > self.btc_lookback + 1:
-            self.btc_price_history.pop(0)
     
     def get_btc_return(self) -> Optional[float]:
         if len(self.btc_price_history) < 2:
@@ -522,10 +617,9 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
     def update_coin_price_history(self, bar: Bar, current_instrument: Dict[str, Any]):
         price = float(bar.close)
         if "price_history" not in current_instrument:
-            current_instrument["price_history"] = []
+            # lookback + 1 closes, the oldest one drops out on append
+            current_instrument["price_history"] = deque(maxlen=self.btc_lookback + 1)
         current_instrument["price_history"].append(price)
-        if len(current_instrument["price_history"]) > self.btc_lookback + 1:
-            current_instrument["price_history"].pop(0)
     
     def passes_relative_strength_entry(self, current_instrument: Dict[str, Any]) -> bool:
         rs_config = self.config.relative_strength_entry if isinstance(self.config.relative_strength_entry, dict) else {}
@@ -675,7 +769,10 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
         if not bars:
             return
         
-        # Feed all bars to indicators (silently - no logging spam)
+        # EMA / MACD / ATR bars are only buffered here (see _seed_historical_bars),
+        # only indicators without a warm-up path are still fed bar by bar (silently - no logging spam)
+        rsi_config = self.config.use_rsi_simple_reversion_system if isinstance(self.config.use_rsi_simple_reversion_system, dict) else {}
+        dm_config = self.config.directional_movement_filter if isinstance(self.config.directional_movement_filter, dict) else {}
         for bar in bars:
             instrument_id = bar.bar_type.instrument_id
             
@@ -684,46 +781,32 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
                 continue
                 
             current_instrument = self.instrument_dict.get(instrument_id)
-            if current_instrument is None:
+            if current_instrument is None or instrument_id in self._live_instruments:
                 continue
-                
-            # Update indicators with historical bars
-            if "atr" in current_instrument:
-                current_instrument["atr"].handle_bar(bar)
-            
-            htf_ema_config = self.config.use_htf_ema_bias_filter if isinstance(self.config.use_htf_ema_bias_filter, dict) else {}
-            if htf_ema_config.get("enabled", False):
-                if "htf_ema" in current_instrument:
-                    current_instrument["htf_ema"].handle_bar(bar)
-            
-            macd_config = self.config.use_macd_simple_reversion_system if isinstance(self.config.use_macd_simple_reversion_system, dict) else {}
-            if macd_config.get("enabled", False):
-                if "macd" in current_instrument:
-                    current_instrument["macd"].handle_bar(bar)
-                if "macd_signal_ema" in current_instrument and current_instrument["macd"].initialized:
-                    current_instrument["macd_signal_ema"].update_raw(current_instrument["macd"].value)
+            self._historical_bars.setdefault(instrument_id, []).append(bar)
             
-            rsi_config = self.config.use_rsi_simple_reversion_system if isinstance(self.config.use_rsi_simple_reversion_system, dict) else {}
             if rsi_config.get("enabled", False):
                 if "rsi" in current_instrument:
                     current_instrument["rsi"].handle_bar(bar)
-            
-            macd_exit_config = self.config.use_macd_exit_system if isinstance(self.config.use_macd_exit_system, dict) else {}
-            if macd_exit_config.get("enabled", False):
-                if "macd_exit" in current_instrument:
-                    current_instrument["macd_exit"].handle_bar(bar)
-                if "macd_exit_signal" in current_instrument and current_instrument["macd_exit"].initialized:
-                    current_instrument["macd_exit_signal"].update_raw(current_instrument["macd_exit"].value)
 
-            dm_config = self.config.directional_movement_filter if isinstance(self.config.directional_movement_filter, dict) else {}
             if dm_config.get("enabled", False):
                 if "directional_movement" in current_instrument:
                     current_instrument["directional_movement"].handle_bar(bar)
 
-            retest_config = self.config.retest_entry if isinstance(self.config.retest_entry, dict) else {}
-            if retest_config.get("enabled", False):
-                if "retest_ema" in current_instrument:
-                    current_instrument["retest_ema"].handle_bar(bar)
+    def _on_historical_request_done(self, request_id) -> None:
+        instrument_id = self._historical_requests.pop(request_id, None)
+        if instrument_id is not None:
+            self._seed_historical_bars(instrument_id)
+
+    def _seed_historical_bars(self, instrument_id: InstrumentId) -> None:
+        """folds the buffered historical bars of an instrument into its warm-up state and seeds the indicators once"""
+        instrument_bars = self._historical_bars.pop(instrument_id, None)
+        if not instrument_bars:
+            return
+        current_instrument = self.instrument_dict[instrument_id]
+        warmup = current_instrument["warmup"]
+        if warmup.warm_up(*bar_arrays(instrument_bars)):
+            warmup.inject(current_instrument)
 
     def on_bar(self, bar: Bar) -> None:
         instrument_id = bar.bar_type.instrument_id
@@ -739,7 +822,13 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
             return
         if "atr" not in current_instrument:
             self.add_instrument_context()
+        if instrument_id not in self._live_instruments:
+            # request callback not there yet: seed from what has arrived, later historical bars are ignored
+            self._live_instruments.add(instrument_id)
+            self._seed_historical_bars(instrument_id)
 
+        if self._track_warmup:
+            current_instrument["warmup"].add_bar(float(bar.high), float(bar.low), float(bar.close), bar.ts_event)
         current_instrument["atr"].handle_bar(bar)
         
         htf_ema_config = self.config.use_htf_ema_bias_filter if isinstance(self.config.use_htf_ema_bias_filter, dict) else {}
@@ -784,21 +873,17 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
             if atr_burst.initialized:
                 atr_history = current_instrument["atr_history"]
                 atr_history.append(float(atr_burst.value))
-                if len(atr_history) > 100:
-                    atr_history.pop(0)
                 
                 tr_lb = current_instrument["tr_lb"]
                 if len(atr_history) >= tr_lb:
-                    cumulative_atr = sum(atr_history[-tr_lb:])
+                    cumulative_atr = atr_history.sum
                     true_range = float(bar.high.as_double() - bar.low.as_double())
                     is_upside = float(bar.close.as_double() - bar.open.as_double()) > 0
                     
                     tr_history = current_instrument["tr_history"]
-                    tr_history.append(true_range if is_upside else 0)
-                    if len(tr_history) > tr_lb:
-                        tr_history.pop(0)
+                    tr_history.append(true_range if is_upside else 0.0)
                     
-                    cumulative_tr = sum(tr_history)
+                    cumulative_tr = tr_history.sum
                     tr_atr_ratio = cumulative_tr / cumulative_atr if cumulative_atr > 0 else 0
                     current_instrument["tr_atr_ratio"] = tr_atr_ratio
                     
@@ -810,7 +895,8 @@ class ShortThaBitchStrat(BaseStrategy, Strategy):
                         current_instrument["bars_since_burst"] += 1
         
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
         
         self.update_coin_price_history(bar, current_instrument)
         
@@ -46,6 +46,9 @@ class SimpleMemeShortConfig(StrategyConfig):
     only_execute_short: bool = True
     hold_profit_for_remaining_days: bool = False
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
     max_concurrent_positions: int = 50
     max_leverage: Decimal = 10.0
 
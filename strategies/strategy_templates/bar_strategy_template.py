@@ -31,6 +31,9 @@ class BarStrategyConfig(StrategyConfig):
     min_account_balance: float
     run_id: str
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
 
 class BarStrategy(BaseStrategy, Strategy):
     def __init__(self, config: BarStrategyConfig):
@@ -117,7 +120,8 @@ class BarStrategy(BaseStrategy, Strategy):
             
         self.entry_logic(bar, current_instrument)
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
     # -------------------------------------------------
     # Entry Logic per Instrument
@@ -32,6 +32,9 @@ class TickStrategyConfig(StrategyConfig):
     tick_buffer_size: int
     run_id: str
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
 
 class TickStrategy(BaseStrategy, Strategy):
     def __init__(self, config: TickStrategyConfig):
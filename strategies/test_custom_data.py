@@ -37,6 +37,9 @@ class TestCustomDataConfig(StrategyConfig):
     rsi_oversold: float
     run_id: str
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
 
 
 class TestCustomData(BaseStrategy, Strategy):
@@ -105,7 +108,8 @@ class TestCustomData(BaseStrategy, Strategy):
             return
         self.entry_logic(bar, current_instrument)
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
     # -------------------------------------------------
     # Entry Logic pro Instrument
@@ -38,6 +38,9 @@ class AlphaMemeStrategyConfig(StrategyConfig):
     rsi_oversold: float
     run_id: str
     close_positions_on_stop: bool = True
+    result_sink: str = "csv"
+    collection_level: str = "full"
+    collection_decimation: int = 10
 
 
 class AlphaMemeStrategy(BaseStrategy, Strategy):
@@ -99,7 +102,8 @@ class AlphaMemeStrategy(BaseStrategy, Strategy):
             return
         self.entry_logic(bar, current_instrument)
         self.base_collect_bar_data(bar, current_instrument)
-        self.update_visualizer_data(bar, current_instrument)
+        if self.visuals_this_bar:
+            self.update_visualizer_data(bar, current_instrument)
 
     # -------------------------------------------------
     # Entry Logic pro Instrument
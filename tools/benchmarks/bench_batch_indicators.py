@@ -0,0 +1,65 @@
+# bench_batch_indicators.py
+# python -m tools.benchmarks.bench_batch_indicators
+import time
+
+import numpy as np
+
+from tools.help_funcs.adaptive_parameter_manager_new import RobustATRCalculator
+from tools.indicators.kalman_filter_2D_own_ZScore import KalmanFilterRegressionWithZScore
+
+
+def synthetic_ohlcv(n_bars, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 30_000.0 + np.cumsum(rng.normal(0, 15, n_bars))
+    spread = np.abs(rng.normal(0, 10, n_bars))
+    return {
+        "open": np.r_[close[0], close[:-1]],
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(1, 100, n_bars),
+        "ts_event": np.arange(n_bars, dtype=np.int64) * 300_000_000_000,
+    }
+
+
+def max_diff(streamed, batched):
+    streamed = np.array([np.nan if v is None else v for v in streamed], dtype=np.float64)
+    if not np.array_equal(np.isnan(streamed), np.isnan(batched)):
+        raise AssertionError("NaN positions differ between streaming and batch")
+    return float(np.nanmax(np.abs(streamed - batched))) if np.isfinite(streamed).any() else 0.0
+
+
+def bench_kalman(ohlcv):
+    kf = KalmanFilterRegressionWithZScore()
+    t0 = time.perf_counter()
+    streamed = [kf.update(value) for value in ohlcv["close"]]
+    t_stream = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batched = KalmanFilterRegressionWithZScore().compute_batch(ohlcv)
+    t_batch = time.perf_counter() - t0
+    diffs = [max_diff([s[k] for s in streamed], batched[name]) for k, name in enumerate(("mean", "slope", "zscore"))]
+    return t_stream, t_batch, max(diffs)
+
+
+def bench_atr(ohlcv):
+    calc = RobustATRCalculator()
+    t0 = time.perf_counter()
+    streamed = []
+    prev_close = None
+    for high, low, close in zip(ohlcv["high"], ohlcv["low"], ohlcv["close"]):
+        streamed.append(calc.update(high, low, prev_close))
+        prev_close = close
+    t_stream = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    batched = RobustATRCalculator().compute_batch(ohlcv)
+    t_batch = time.perf_counter() - t0
+    diffs = [max_diff([s[k] for s in streamed], batched[name]) for k, name in enumerate(("atr", "percentile"))]
+    return t_stream, t_batch, max(diffs)
+
+
+if __name__ == "__main__":
+    ohlcv = synthetic_ohlcv(100_000)
+    for name, bench in (("Kalman", bench_kalman), ("RobustATR", bench_atr)):
+        t_stream, t_batch, diff = bench(ohlcv)
+        assert diff < 1e-6, f"{name}: batch differs from streaming by {diff}"
+        print(f"{name:10s} streaming {t_stream:7.3f}s  batch {t_batch:7.3f}s  x{t_stream / t_batch:6.1f}  max diff {diff:.2e}")
@@ -0,0 +1,87 @@
+# bench_coin_full_rules.py
+# python -m tools.benchmarks.bench_coin_full_rules
+import time
+
+import numpy as np
+from nautilus_trader.backtest.engine import BacktestEngine, BacktestEngineConfig
+from nautilus_trader.config import LoggingConfig
+from nautilus_trader.model.currencies import USDT
+from nautilus_trader.model.data import Bar, BarType
+from nautilus_trader.model.enums import AccountType, OmsType
+from nautilus_trader.model.objects import Money
+from nautilus_trader.test_kit.providers import TestInstrumentProvider
+
+from strategies.coin_full_strategy import CoinFullConfig, CoinFullStrategy
+
+# every use_* switch that adds indicators, filters, entry setups or exits
+SYSTEMS = (
+    "use_directional_movement_filter", "use_htf_ema_bias_filter", "use_min_coin_filters",
+    "use_close_ema", "use_fixed_rr", "use_rsi_as_exit", "use_macd_exit_system", "use_topt_ratio_as_exit",
+    "use_trend_following_setup", "use_spike_reversion_system", "use_rsi_simple_reversion_system",
+    "use_macd_simple_reversion_system", "use_aroon_simple_trend_system", "use_donchian_breakout_system",
+)
+
+
+def synthetic_bars(instrument, n_bars, seed=5):
+    rng = np.random.default_rng(seed)
+    bar_type = BarType.from_str(f"{instrument.id}-15-MINUTE-LAST-EXTERNAL")
+    close = 30_000.0 + np.cumsum(rng.normal(0, 25, n_bars))
+    spread = np.abs(rng.normal(0, 15, n_bars))
+    open_ = np.r_[close[0], close[:-1]]
+    volume = rng.uniform(10, 500, n_bars)
+    ts = 1_704_067_200_000_000_000 + np.arange(n_bars, dtype=np.int64) * 900_000_000_000
+    bars = [
+        Bar(
+            bar_type,
+            instrument.make_price(open_[i]),
+            instrument.make_price(max(open_[i], close[i]) + spread[i]),
+            instrument.make_price(min(open_[i], close[i]) - spread[i]),
+            instrument.make_price(close[i]),
+            instrument.make_qty(volume[i]),
+            int(ts[i]),
+            int(ts[i]),
+        )
+        for i in range(n_bars)
+    ]
+    return bar_type, bars
+
+
+def make_config(instrument, bar_type, all_enabled: bool) -> CoinFullConfig:
+    base = dict(
+        instruments=[{"instrument_id": str(instrument.id), "bar_types": [str(bar_type)], "trade_size_usdt": "150"}],
+        max_leverage=1,
+        min_account_balance=0,
+        run_id=f"bench_coin_full_{'all' if all_enabled else 'minimal'}",
+        collection_level="off",
+    )
+    defaults = CoinFullConfig(**base)
+    systems = {name: {**getattr(defaults, name), "enabled": all_enabled} for name in SYSTEMS}
+    return CoinFullConfig(**base, **systems)
+
+
+def bars_per_second(instrument, bar_type, bars, all_enabled: bool) -> float:
+    engine = BacktestEngine(BacktestEngineConfig(trader_id="BENCH-001", logging=LoggingConfig(log_level="ERROR")))
+    engine.add_venue(
+        venue=instrument.id.venue,
+        oms_type=OmsType.NETTING,
+        account_type=AccountType.MARGIN,
+        base_currency=USDT,
+        starting_balances=[Money(100_000, USDT)],
+    )
+    engine.add_instrument(instrument)
+    engine.add_data(bars)
+    engine.add_strategy(CoinFullStrategy(make_config(instrument, bar_type, all_enabled)))
+    t0 = time.perf_counter()
+    engine.run()
+    elapsed = time.perf_counter() - t0
+    engine.dispose()
+    return len(bars) / elapsed
+
+
+if __name__ == "__main__":
+    instrument = TestInstrumentProvider.btcusdt_perp_binance()
+    bar_type, bars = synthetic_bars(instrument, 50_000)
+    minimal = bars_per_second(instrument, bar_type, bars, all_enabled=False)
+    full = bars_per_second(instrument, bar_type, bars, all_enabled=True)
+    print(f"CoinFull minimal config  {minimal:10.0f} bars/s")
+    print(f"CoinFull all systems on  {full:10.0f} bars/s  (x{minimal / full:.2f} slower)")
@@ -0,0 +1,85 @@
+# bench_instrument_state.py
+# python -m tools.benchmarks.bench_instrument_state
+import sys
+import timeit
+
+from tools.help_funcs.instrument_state import BASE_INSTRUMENT_FIELDS, instrument_state_class
+
+# field count of CoinFullStrategy.instrument_state_fields
+FIELDS = BASE_INSTRUMENT_FIELDS + tuple(f"field_{i}" for i in range(60)) + (
+    "atr", "sl_price", "prev_donchian_upper", "prev_donchian_lower", "volume_window", "prev_bar_close",
+    "sum_toptrader_long_short_ratio", "count_long_short_ratio",
+)
+DEFAULTS = {"sum_toptrader_long_short_ratio": 0.0, "count_long_short_ratio": 0.0}
+
+
+def dict_context():
+    # previous pattern: free-form dict, optional keys only exist once assigned
+    ctx = {name: 0.0 for name in FIELDS}
+    for name in ("sl_price", "prev_donchian_upper", "prev_donchian_lower", "prev_bar_close"):
+        del ctx[name]
+    ctx["atr"] = object()
+    ctx["volume_window"] = object()
+    return ctx
+
+
+def state_context():
+    ctx = instrument_state_class(FIELDS, DEFAULTS)()
+    for name in FIELDS:
+        if getattr(ctx, name) is None and name not in ("sl_price", "prev_donchian_upper", "prev_donchian_lower", "prev_bar_close"):
+            setattr(ctx, name, 0.0)
+    ctx.atr = object()
+    ctx.volume_window = object()
+    return ctx
+
+
+def dict_bar(ctx):
+    """per-bar reads of CoinFull before the migration (in / .get / [])"""
+    if "atr" not in ctx:
+        return
+    ctx["volume_window"]
+    ctx.get("sum_toptrader_long_short_ratio", 0.0)
+    ctx.get("count_long_short_ratio", 0.0)
+    if "prev_donchian_upper" not in ctx or "prev_donchian_lower" not in ctx:
+        pass
+    ctx.get("prev_bar_close")
+    ctx.get("sl_price")
+    ctx["collector"]
+    ctx["realized_pnl"]
+    ctx["prev_bar_close"] = 1.0
+
+
+def state_bar(ctx):
+    """same reads as plain slot loads with `is None` checks"""
+    if ctx.atr is None:
+        return
+    ctx.volume_window
+    ctx.sum_toptrader_long_short_ratio
+    ctx.count_long_short_ratio
+    if ctx.prev_donchian_upper is None or ctx.prev_donchian_lower is None:
+        pass
+    ctx.prev_bar_close
+    ctx.sl_price
+    ctx.collector
+    ctx.realized_pnl
+    ctx.prev_bar_close = 1.0
+
+
+def ns_per_call(stmt, ctx, number=1_000_000):
+    timer = timeit.Timer(stmt, globals={"ctx": ctx, "dict_bar": dict_bar, "state_bar": state_bar})
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+if __name__ == "__main__":
+    d, s = dict_context(), state_context()
+    print(f"{'access':<34s} {'dict':>9s} {'state':>9s}")
+    for label, dict_stmt, state_stmt in (
+        ("read field", "ctx['atr']", "ctx.atr"),
+        ("presence check", "'atr' in ctx", "ctx.atr is None"),
+        ("optional read", "ctx.get('sl_price')", "ctx.sl_price"),
+        ("write field", "ctx['prev_bar_close'] = 1.0", "ctx.prev_bar_close = 1.0"),
+        ("CoinFull per-bar pattern (11 ops)", "dict_bar(ctx)", "state_bar(ctx)"),
+    ):
+        t_dict, t_state = ns_per_call(dict_stmt, d), ns_per_call(state_stmt, s)
+        print(f"{label:<34s} {t_dict:7.1f}ns {t_state:7.1f}ns  x{t_dict / t_state:4.1f}")
+    print(f"{'bytes per instrument (container)':<34s} {sys.getsizeof(d):9d} {sys.getsizeof(s):9d}  ({len(FIELDS)} fields)")
@@ -0,0 +1,74 @@
+# bench_kalman_regression.py
+# python -m tools.benchmarks.bench_kalman_regression
+import time
+
+import numpy as np
+
+from tools.indicators.kalman_filter_2D_own_ZScore import KalmanFilterRegressionWithZScore
+
+
+def reference_outputs(kf, value):
+    """slope / zscore exactly as the np.polyfit / np.std implementation computes them from the current buffers"""
+    buffer = list(kf.buffer)
+    slope = np.polyfit(np.arange(len(buffer)), buffer, 1)[0] if len(buffer) >= 2 else 0.0
+    zscore = None
+    history = list(kf.kalman_distance_history)
+    if len(history) >= 5:
+        distance_std = np.std(history, ddof=1)
+        if distance_std > 0.0001:
+            zscore = np.clip((value - kf.current_kalman_mean) / distance_std, -80.0, 80.0)
+        else:
+            zscore = 0.0
+    return slope, zscore
+
+
+def check_parity(values, **kwargs):
+    kf = KalmanFilterRegressionWithZScore(**kwargs)
+    worst_slope = worst_z = 0.0
+    for value in values:
+        mean, slope, zscore = kf.update(value)
+        if not kf.is_initialized() or kf.current_kalman_mean is None:
+            continue
+        ref_slope, ref_z = reference_outputs(kf, value)
+        scale = max(1.0, abs(ref_slope))
+        worst_slope = max(worst_slope, abs(slope - ref_slope) / scale)
+        if (zscore is None) != (ref_z is None):
+            raise AssertionError("zscore availability differs")
+        if zscore is not None:
+            worst_z = max(worst_z, abs(zscore - ref_z))
+    return worst_slope, worst_z
+
+
+def legacy_cost(values, window, zscore_window):
+    """per-bar cost of the replaced calls (polyfit over the regression buffer + np.std over the distances)"""
+    buffer = []
+    distances = []
+    t0 = time.perf_counter()
+    for value in values:
+        buffer = (buffer + [value])[-window:]
+        distances = (distances + [abs(value - buffer[-1])])[-zscore_window:]
+        if len(buffer) >= 2:
+            np.polyfit(np.arange(len(buffer)), np.array(buffer), 1)
+        if len(distances) >= 5:
+            np.std(distances, ddof=1)
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(3)
+    n_bars = 200_000
+    prices = 30_000.0 + np.cumsum(rng.normal(0, 15, n_bars))
+    for params in ({"window": 10, "zscore_window": 20}, {"window": 50, "zscore_window": 200}):
+        worst_slope, worst_z = check_parity(prices[:20_000], **params)
+        assert worst_slope < 1e-9 and worst_z < 1e-9, "parity with np.polyfit / np.std broken"
+        kf = KalmanFilterRegressionWithZScore(**params)
+        t0 = time.perf_counter()
+        for price in prices:
+            kf.update(price)
+        t_new = time.perf_counter() - t0
+        t_old = legacy_cost(prices, params["window"], params["zscore_window"])
+        print(
+            f"window={params['window']:>3} zscore_window={params['zscore_window']:>3}: "
+            f"after {n_bars / t_new:>9,.0f} bars/s | replaced polyfit+std alone {n_bars / t_old:>9,.0f} bars/s "
+            f"| max rel slope diff {worst_slope:.1e} | max zscore diff {worst_z:.1e}"
+        )
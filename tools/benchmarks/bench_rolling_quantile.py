@@ -0,0 +1,49 @@
+# bench_rolling_quantile.py
+# python -m tools.benchmarks.bench_rolling_quantile
+import bisect
+import time
+
+import numpy as np
+
+from tools.help_funcs.rolling_stats import RollingQuantile
+
+
+def sort_per_bar(values, window):
+    """previous pattern: list.pop(0) + sorted() + index lookups / bisect rank on every bar"""
+    history = []
+    out = []
+    for value in values:
+        history.append(value)
+        if len(history) > window:
+            history.pop(0)
+        sorted_values = sorted(history)
+        n = len(sorted_values)
+        out.append((sorted_values[int(0.05 * (n - 1))], sorted_values[int(0.95 * (n - 1))], bisect.bisect_left(sorted_values, value) / n))
+    return out
+
+
+def rolling_quantile(values, window):
+    history = RollingQuantile(window)
+    out = []
+    for value in values:
+        history.append(value)
+        n = len(history)
+        out.append((history.kth(int(0.05 * (n - 1))), history.kth(int(0.95 * (n - 1))), history.rank(value)))
+    return out
+
+
+def per_bar_us(func, values, window):
+    t0 = time.perf_counter()
+    result = func(values, window)
+    return (time.perf_counter() - t0) / len(values) * 1e6, result
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(5)
+    print(f"{'window':>7s} {'sort/bar':>10s} {'rolling':>10s} {'speedup':>8s}")
+    for window in (100, 250, 500, 1000, 2500, 5000):
+        values = rng.lognormal(0, 1, max(20_000, 4 * window)).tolist()
+        t_sort, ref = per_bar_us(sort_per_bar, values, window)
+        t_rolling, out = per_bar_us(rolling_quantile, values, window)
+        assert out == ref, f"window {window}: results differ"
+        print(f"{window:7d} {t_sort:8.2f}us {t_rolling:8.2f}us {t_sort / t_rolling:7.1f}x")
@@ -0,0 +1,107 @@
+# bench_vwap_zscore.py
+# python -m tools.benchmarks.bench_vwap_zscore
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from tools.indicators.VWAP_ZScore_HTF import VWAPZScoreHTFAnchored
+
+
+class _FullResumStats:
+    """old behaviour: VWAP and std re-computed over all samples of the segment / window on every bar"""
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    @property
+    def count(self):
+        return len(self.samples)
+
+    def add(self, price, volume):
+        self.samples.append((price, volume, None, None))
+
+    def vwap(self):
+        if not self.samples:
+            return None
+        total_pv = sum(adj_price * adj_volume for adj_price, adj_volume, _, _ in self.samples)
+        total_volume = sum(adj_volume for _, adj_volume, _, _ in self.samples)
+        if total_volume == 0:
+            return None
+        return total_pv / total_volume
+
+    def std(self):
+        return np.std([price for price, _, _, _ in self.samples], ddof=1)
+
+
+class LegacyVWAPZScore(VWAPZScoreHTFAnchored):
+    """reference for the running-sums version: same indicator, O(segment length) per bar"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.current_segment['stats'] = _FullResumStats([])
+
+    def _start_new_segment(self, reason: str = 'unknown'):
+        super()._start_new_segment(reason)
+        self.current_segment['stats'] = _FullResumStats([])
+
+    def _append_rolling(self, adj_price, adj_volume, price, volume):
+        self.rolling_price_volume_data.append((adj_price, adj_volume, price, volume))
+
+    def _active_stats(self):
+        if self.anchor_method == "rolling":
+            return _FullResumStats(self.rolling_price_volume_data)
+        return self.current_segment['stats']
+
+
+def synthetic_bars(n_bars: int, seed: int = 7, bar_ns: int = 300_000_000_000):
+    """5m random-walk bars starting on a monday"""
+    rng = np.random.default_rng(seed)
+    closes = 500.0 + np.cumsum(rng.normal(0, 0.5, n_bars))
+    opens = np.r_[closes[0], closes[:-1]] + rng.normal(0, 0.05, n_bars)
+    spread = np.abs(rng.normal(0, 0.3, n_bars))
+    volumes = rng.lognormal(8, 1, n_bars)
+    start = 1_704_067_200_000_000_000  # 2024-01-01 00:00 UTC
+    return [
+        SimpleNamespace(
+            open=opens[i], high=max(opens[i], closes[i]) + spread[i], low=min(opens[i], closes[i]) - spread[i],
+            close=closes[i], volume=volumes[i], ts_event=start + i * bar_ns,
+        )
+        for i in range(n_bars)
+    ]
+
+
+def run(indicator_cls, bars, **kwargs):
+    indicator = indicator_cls(**kwargs)
+    outputs = []
+    t0 = time.perf_counter()
+    for bar in bars:
+        outputs.append(indicator.update(bar))
+    return time.perf_counter() - t0, outputs
+
+
+def max_abs_diff(a, b):
+    diff = 0.0
+    for (v1, z1), (v2, z2) in zip(a, b):
+        for x, y in ((v1, v2), (z1, z2)):
+            if (x is None) != (y is None):
+                return float("inf")
+            if x is not None:
+                diff = max(diff, abs(x - y))
+    return diff
+
+
+if __name__ == "__main__":
+    n_bars = 4 * 7 * 288  # four weeks of 5m bars
+    bars = synthetic_bars(n_bars)
+    for params in (
+        {"anchor_method": "weekly"},
+        {"anchor_method": "daily"},
+        {"anchor_method": "rolling", "rolling_window_bars": 2016},
+    ):
+        t_old, out_old = run(LegacyVWAPZScore, bars, **params)
+        t_new, out_new = run(VWAPZScoreHTFAnchored, bars, **params)
+        print(
+            f"{params['anchor_method']:>8}: before {n_bars / t_old:>10,.0f} bars/s | after {n_bars / t_new:>10,.0f} bars/s "
+            f"| x{t_old / t_new:.1f} | max abs diff {max_abs_diff(out_old, out_new):.2e}"
+        )
@@ -0,0 +1,87 @@
+# check_warmup_parity.py
+# python -m tools.benchmarks.check_warmup_parity
+import time
+
+import numpy as np
+from nautilus_trader.indicators.averages import ExponentialMovingAverage
+from nautilus_trader.indicators.trend import MovingAverageConvergenceDivergence
+from nautilus_trader.indicators.volatility import AverageTrueRange
+
+from tools.help_funcs.indicator_warmup import IndicatorWarmup
+
+# same specs as ShortThaBitchStrat._warmup_specs with every warm-up system enabled
+SPECS = {
+    "atr": {"kind": "atr", "period": 14},
+    "htf_ema": {"kind": "ema", "period": 200},
+    "macd": {
+        "kind": "macd", "fast_period": 12, "slow_period": 26, "signal_period": 9,
+        "signal_key": "macd_signal_ema", "prev_keys": ["prev_macd_line", "prev_macd_signal"],
+    },
+}
+
+
+def synthetic_hlc(n_bars, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 2.0 + np.cumsum(rng.normal(0, 0.01, n_bars))
+    spread = np.abs(rng.normal(0, 0.005, n_bars))
+    ts = np.arange(n_bars, dtype=np.int64) * 900_000_000_000
+    return close + spread, close - spread, close, ts
+
+
+def fresh_context():
+    return {
+        "atr": AverageTrueRange(SPECS["atr"]["period"]),
+        "htf_ema": ExponentialMovingAverage(SPECS["htf_ema"]["period"]),
+        "macd": MovingAverageConvergenceDivergence(SPECS["macd"]["fast_period"], SPECS["macd"]["slow_period"]),
+        "macd_signal_ema": ExponentialMovingAverage(SPECS["macd"]["signal_period"]),
+    }
+
+
+def feed(ctx, high, low, close):
+    # bar by bar like ShortThaBitchStrat.on_bar
+    for h, l, c in zip(high, low, close):
+        ctx["atr"].update_raw(h, l, c)
+        ctx["htf_ema"].update_raw(c)
+        ctx["macd"].update_raw(c)
+        if ctx["macd"].initialized:
+            ctx["macd_signal_ema"].update_raw(ctx["macd"].value)
+
+
+INDICATOR_KEYS = ("atr", "htf_ema", "macd", "macd_signal_ema")
+
+
+def values(ctx):
+    return np.array([ctx[key].value for key in INDICATOR_KEYS])
+
+
+def max_rel_diff(a, b):
+    return float(np.max(np.abs(a - b) / np.maximum(np.abs(b), 1e-12)))
+
+
+if __name__ == "__main__":
+    n_history, n_live = 5_000, 500
+    high, low, close, ts = synthetic_hlc(n_history + n_live)
+    hist = slice(0, n_history)
+    live = slice(n_history, None)
+
+    replayed = fresh_context()
+    t0 = time.perf_counter()
+    feed(replayed, high[hist], low[hist], close[hist])
+    t_replay = time.perf_counter() - t0
+
+    seeded = fresh_context()
+    t0 = time.perf_counter()
+    warmup = IndicatorWarmup(SPECS)
+    warmup.warm_up(high[hist], low[hist], close[hist], ts[hist])
+    warmup.inject(seeded)
+    t_seed = time.perf_counter() - t0
+
+    diff_seed = max_rel_diff(values(seeded), values(replayed))
+    # the seeded indicators must also continue identically (hidden EMA / true-range state)
+    feed(replayed, high[live], low[live], close[live])
+    feed(seeded, high[live], low[live], close[live])
+    diff_live = max_rel_diff(values(seeded), values(replayed))
+    assert all(seeded[key].initialized == replayed[key].initialized for key in INDICATOR_KEYS), "initialized flags differ"
+    assert diff_seed < 1e-9 and diff_live < 1e-9, f"seeded vs replay: {diff_seed:.2e} after warm-up, {diff_live:.2e} after live bars"
+    print(f"replay {t_replay:7.3f}s  seed {t_seed:7.3f}s  x{t_replay / t_seed:6.1f}  "
+          f"max rel diff {diff_seed:.2e} (warm-up) {diff_live:.2e} (+{n_live} live bars)")
@@ -1,6 +1,8 @@
 import numpy as np
 from collections import deque
 from tools.help_funcs.distrubition_monitor import ATRDistributionMonitor, SlopeDistributionMonitor, ZScoreDistributionMonitor
+from tools.help_funcs.batch_utils import ema_kernel, ohlcv_column, rolling_windows
+from tools.help_funcs.rolling_stats import RollingQuantile
 
 
 class RobustATRCalculator:
@@ -8,7 +10,7 @@ class RobustATRCalculator:
         self.atr_window = atr_window
         self.percentile_window = percentile_window
         self.alpha = 2.0 / (atr_window + 1) 
-        self.atr_history = deque(maxlen=percentile_window)
+        self.atr_history = RollingQuantile(percentile_window)
         self.current_atr = None
         self.current_percentile = 0.5
         self.prev_close = None
@@ -52,12 +54,44 @@ class RobustATRCalculator:
         self.prev_close = prev_close if prev_close is not None else high
         
         if len(self.atr_history) > 10:
-            sorted_history = sorted(list(self.atr_history))
-            percentile = self._calculate_percentile_efficient(self.current_atr, sorted_history)
+            # rank in the sorted window without sorting it per bar (same as _calculate_percentile_efficient)
+            percentile = self.atr_history.rank(self.current_atr)
             self.current_percentile = self._soft_clamp(percentile)
         
         return self.current_atr, self.current_percentile
 
+    def compute_batch(self, ohlcv_arrays) -> dict:
+        """
+        atr / percentile series of a fresh calculator fed with update(high, low, prev_close=previous close),
+        EMA as (numba) kernel, percentile ranks vectorised over the rolling atr window
+        """
+        high = ohlcv_column(ohlcv_arrays, "high")
+        low = ohlcv_column(ohlcv_arrays, "low")
+        close = ohlcv_column(ohlcv_arrays, "close")
+        n = len(high)
+        tr = high - low
+        if n > 1:
+            prev_close = close[:-1]
+            tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)))
+        atr = ema_kernel(tr, self.alpha)
+
+        ranks = np.full(n, np.nan)
+        window = self.percentile_window
+        for i in range(10, min(window - 1, n)):
+            ranks[i] = np.count_nonzero(atr[:i + 1] < atr[i]) / (i + 1)
+        for row, windows in rolling_windows(atr, window):
+            if window > 10:
+                ranks[row:row + len(windows)] = np.count_nonzero(windows < windows[:, -1:], axis=1) / window
+        # _soft_clamp vectorised (defaults 0.05 / 0.95 / 10.0), 0.5 until the history has > 10 values
+        lo, hi, steepness = 0.05, 0.95, 10.0
+        with np.errstate(over="ignore"):
+            clamped = np.where(
+                ranks <= lo, lo + (hi - lo) / (1 + np.exp(steepness * (lo - ranks))),
+                np.where(ranks >= hi, hi - (hi - lo) / (1 + np.exp(steepness * (ranks - hi))), ranks),
+            )
+        percentile = np.where(np.isnan(ranks), 0.5, clamped)
+        return {"atr": atr, "percentile": percentile}
+
 
 class AdaptiveParameterManager:
     def __init__(self, base_params: dict, adaptive_factors: dict, kalman_filter=None):
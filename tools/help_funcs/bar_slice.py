@@ -0,0 +1,100 @@
+# bar_slice.py
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+
+class BarSlice(dict):
+    """
+    bars of one ts_event by instrument id (dict), plus numpy columns over the instruments of the step
+    for cross-sectional calculations; columns are built on first access and share the dict order
+    """
+
+    def __init__(self, ts: int, contexts: Dict[Any, Dict[str, Any]]):
+        super().__init__()
+        self.ts = ts
+        self._contexts = contexts
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @property
+    def instrument_ids(self) -> list:
+        return list(self.keys())
+
+    def _bar_column(self, field: str) -> np.ndarray:
+        column = self._columns.get(field)
+        if column is None:
+            column = np.fromiter((float(getattr(bar, field)) for bar in self.values()), dtype=np.float64, count=len(self))
+            self._columns[field] = column
+        return column
+
+    @property
+    def opens(self) -> np.ndarray:
+        return self._bar_column("open")
+
+    @property
+    def highs(self) -> np.ndarray:
+        return self._bar_column("high")
+
+    @property
+    def lows(self) -> np.ndarray:
+        return self._bar_column("low")
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self._bar_column("close")
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self._bar_column("volume")
+
+    def metric(self, key: str, default: float = np.nan) -> np.ndarray:
+        """instrument context value per instrument (e.g. "rolling_24h_volume"), missing / None -> default"""
+        values = []
+        for instrument_id in self.keys():
+            value = self._contexts.get(instrument_id, {}).get(key)
+            values.append(default if value is None else float(value))
+        return np.asarray(values, dtype=np.float64)
+
+
+class BarSliceDispatcher:
+    """
+    buffers bars per ts_event across instruments and hands the finished slice to callback(ts, bar_slice)
+    as soon as the first bar of a later timestamp arrives (or on flush), so the cross-sectional state of
+    step t is always ready before any bar of step t+1 is processed; stale bars (older ts) are ignored
+
+    a slice holds one bar per instrument: only the primary bar type (first of the context's bar_types,
+    else the first one seen) takes part, bars of further bar types of the same instrument are skipped
+    instead of overwriting it
+    """
+
+    def __init__(self, callback: Callable[[int, BarSlice], None], contexts: Dict[Any, Dict[str, Any]]):
+        self.callback = callback
+        self.contexts = contexts
+        self._slice: Optional[BarSlice] = None
+        self._primary_bar_types: Dict[Any, Any] = {}
+
+    def _primary_bar_type(self, instrument_id, bar_type):
+        primary = self._primary_bar_types.get(instrument_id)
+        if primary is None:
+            bar_types = self.contexts.get(instrument_id, {}).get("bar_types")
+            primary = self._primary_bar_types[instrument_id] = bar_types[0] if bar_types else bar_type
+        return primary
+
+    def add(self, bar) -> None:
+        instrument_id = bar.bar_type.instrument_id
+        if bar.bar_type != self._primary_bar_type(instrument_id, bar.bar_type):
+            return
+        ts = bar.ts_event
+        if self._slice is not None:
+            if ts < self._slice.ts:
+                return
+            if ts > self._slice.ts:
+                self.flush()
+        if self._slice is None:
+            self._slice = BarSlice(ts, self.contexts)
+        self._slice[instrument_id] = bar
+
+    def flush(self) -> None:
+        finished, self._slice = self._slice, None
+        if finished:
+            self.callback(finished.ts, finished)
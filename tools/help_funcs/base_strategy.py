@@ -4,13 +4,24 @@ from nautilus_trader.model.data import Bar, BarType
 from decimal import Decimal
 from nautilus_trader.common.enums import LogColor
 from core.visualizing.backtest_visualizer_prototype import BacktestDataCollector
+from operator import attrgetter, itemgetter
 from typing import Any, Dict, Optional
 from nautilus_trader.model.identifiers import InstrumentId
 from nautilus_trader.model.currencies import USDT
 from  tools.help_funcs.help_funcs_strategy import extract_interval_from_bar_type
+from tools.help_funcs.bar_slice import BarSlice, BarSliceDispatcher
+from tools.help_funcs.instrument_state import BASE_INSTRUMENT_FIELDS, instrument_state_class
+
+
+COLLECTION_LEVELS = ("full", "decimated", "equity_only", "off")
 
 
 class BaseStrategy(Strategy):
+    # context keys of the strategy -> __slots__ of an InstrumentState (attribute access, no per-instrument dict)
+    instrument_state_fields: tuple = ()
+    # non-None start values of declared fields (immutable only), all other fields start as None
+    instrument_state_defaults: dict = {}
+
     def __init__(self, config: StrategyConfig):
         super().__init__(config)
 
@@ -18,14 +29,35 @@ class BaseStrategy(Strategy):
         self.realized_pnl = 0
         self.close_positions_on_stop = config.close_positions_on_stop
         self.run_id = config.run_id
+        # "csv" (default) or "parquet", see BacktestDataCollector sinks
+        self.result_sink = getattr(config, "result_sink", "csv")
+        # visual logging: "full", "decimated" (every Nth bar), "equity_only" (only general equity metrics)
+        # or "off" (only total_equity once per ts, so drawdown / daily returns stay real)
+        self.collection_level = getattr(config, "collection_level", "full")
+        if self.collection_level not in COLLECTION_LEVELS:
+            raise ValueError(f"Unbekanntes collection_level: {self.collection_level!r} (erlaubt: {COLLECTION_LEVELS})")
+        self.collection_decimation = max(1, int(getattr(config, "collection_decimation", 10)))
+        self._collection_bar_counts: Dict[InstrumentId, int] = {}
+        self.visuals_this_bar = self.collection_level == "full"
 
-        self.instrument_dict: Dict[InstrumentId, Dict[str, Any]] = {}
+        self.instrument_dict: Dict[InstrumentId, Any] = {}
         self._base_initialize_instrument_contexts()
-        self.general_collector = BacktestDataCollector("general", config.run_id)
+        self.general_collector = BacktestDataCollector("general", config.run_id, sink=self.result_sink)
         self.general_collector.initialise_logging_indicator("total_position", 1)
         self.general_collector.initialise_logging_indicator("total_unrealized_pnl", 2)
         self.general_collector.initialise_logging_indicator("total_realized_pnl", 3)
         self.general_collector.initialise_logging_indicator("total_equity", 4)
+        # drawdown / time under water / daily returns are tracked while logging (no re-read in extract_metrics)
+        self.general_collector.track_equity("total_equity")
+        # general metrics state: last logged ts, realized pnl total, USDT balance per venue keyed by account event count
+        self._general_metrics_ts = None
+        self._total_realized_pnl = 0.0
+        self._venues = list(dict.fromkeys(inst_id.venue for inst_id in self.instrument_dict))
+        self._venue_balances: Dict[Any, tuple] = {}
+        # time slices: strategies that override on_bar_slice get it once per ts_event (see base_dispatch_bar_slice)
+        self.bar_slice_dispatcher = None
+        if type(self).on_bar_slice is not BaseStrategy.on_bar_slice:
+            self.bar_slice_dispatcher = BarSliceDispatcher(self.on_bar_slice, self.instrument_dict)
 
     def _base_initialize_instrument_contexts(self):
         """builds instrument_dict from yaml config with bar types, collectors, and decimal conversions"""
@@ -44,6 +76,17 @@ class BaseStrategy(Strategy):
                     return val
             return val
 
+        # strategies that declare instrument_state_fields get slotted contexts, all others keep plain dicts
+        state_cls = dict
+        if self.instrument_state_fields:
+            spec_keys = [k for spec in self.config.instruments for k in spec if k not in ("instrument_id", "bar_types")]
+            state_cls = instrument_state_class(BASE_INSTRUMENT_FIELDS + tuple(spec_keys) + tuple(self.instrument_state_fields),
+                                               self.instrument_state_defaults)
+        # per-bar reads in the base code: slot load for InstrumentState, key lookup for dicts (no item view on the hot path)
+        getter = itemgetter if state_cls is dict else attrgetter
+        self._ctx_collector = getter("collector")
+        self._ctx_realized_pnl = getter("realized_pnl")
+
         for spec in self.config.instruments:
             if "instrument_id" not in spec or "bar_types" not in spec:
                 raise ValueError("Jedes Instrument benötigt 'instrument_id' und 'bar_types'.")
@@ -64,7 +107,7 @@ class BaseStrategy(Strategy):
             inst_id = InstrumentId.from_str(inst_id_str)
 
             # Start with dynamic copy of all extra keys
-            current_instrument = {}
+            current_instrument = state_cls()
             for k, v in spec.items():
                 if k in ("instrument_id", "bar_types"):
                     continue
@@ -77,7 +120,7 @@ class BaseStrategy(Strategy):
             current_instrument.setdefault("unrealized_pnl", 0.0)
 
             # Collector
-            collector = BacktestDataCollector(str(inst_id), self.run_id)
+            collector = BacktestDataCollector(str(inst_id), self.run_id, sink=self.result_sink)
             collector.initialise_logging_indicator("position", -1)
             collector.initialise_logging_indicator("realized_pnl", -1)
             collector.initialise_logging_indicator("unrealized_pnl", -1)
@@ -173,6 +216,7 @@ class BaseStrategy(Strategy):
         id_ctx = self.get_instrument_context(id)
         realized_pnl = position_closed.realized_pnl.as_double()  # Realized PnL
         id_ctx["realized_pnl"] += float(realized_pnl) if realized_pnl else 0
+        self._total_realized_pnl += float(realized_pnl) if realized_pnl else 0
         #id_ctx["commissions"] += float(position_closed.commission) if position_closed.commission else 0
         id_ctx["collector"].add_closed_trade(position_closed, total_fee)
 
@@ -181,18 +225,62 @@ class BaseStrategy(Strategy):
         self.base_on_stop()
         self.stop()
 
+    def base_dispatch_bar_slice(self, bar: Bar) -> None:
+        """call at the top of on_bar: a bar of a new ts_event closes the previous slice (-> on_bar_slice)"""
+        if self.bar_slice_dispatcher is not None:
+            self.bar_slice_dispatcher.add(bar)
+
+    def on_bar_slice(self, ts: int, bars_by_instrument: BarSlice) -> None:
+        """cross-sectional hook, once per time step with the bars of all instruments (closes / volumes / metric arrays)"""
+        pass
+
     def base_collect_bar_data(self, bar: Bar, current_instrument: Dict[str, Any]):
-        current_instrument["collector"].add_bar(timestamp=bar.ts_event, open_=bar.open, high=bar.high, low=bar.low, close=bar.close, volume=bar.volume, bar_type = bar.bar_type)
+        """
+        logs bar + general metrics according to collection_level and sets visuals_this_bar for update_visualizer_data;
+        only bar / indicator logging is reduced, the general metrics (equity -> drawdown, daily returns) stay per ts
+        """
+        level = self.collection_level
+        if level == "off":
+            self.visuals_this_bar = False
+            self._update_general_metrics(bar.ts_event, equity_only=True)
+            return
         self._update_general_metrics(bar.ts_event)
+        if level == "decimated":
+            inst_id = bar.bar_type.instrument_id
+            count = self._collection_bar_counts.get(inst_id, 0)
+            self._collection_bar_counts[inst_id] = count + 1
+            self.visuals_this_bar = count % self.collection_decimation == 0
+            if not self.visuals_this_bar:
+                return
+        elif level == "equity_only":
+            self.visuals_this_bar = False
+            return
+        self._ctx_collector(current_instrument).add_bar(timestamp=bar.ts_event, open_=bar.open, high=bar.high, low=bar.low, close=bar.close, volume=bar.volume, bar_type = bar.bar_type)
 
-    def _update_general_metrics(self, ts):
-        # Aggregation über alle Instrumente
+    def _update_general_metrics(self, ts, force: bool = False, equity_only: bool = False):
+        """
+        one snapshot per ts, taken when the first bar of ts reaches the strategy and stamped with that ts:
+        it holds everything processed up to this moment (the whole previous step plus the engine's matching
+        of the arriving bar) and never state of a later bar; force logs ts unconditionally (final snapshot in on_stop)
+        """
+        if not force and self._general_metrics_ts is not None and ts <= self._general_metrics_ts:
+            return
+        self._general_metrics_ts = ts
+        self._log_general_metrics(ts, equity_only)
+
+    def _log_general_metrics(self, ts, equity_only: bool = False):
+        """
+        Aggregation über alle Instrumente, einmal pro Timestamp: flat instruments contribute nothing, so only
+        instruments with open positions are queried; realized pnl is summed on position-closed events and
+        venue balances are cached per account state event (cost independent of the instrument count);
+        equity_only logs just total_equity (collection_level "off")
+        """
         total_position = 0.0
         total_unrealized = 0.0
-        total_realized = 0.0
-        seen_venues = set()
-        total_balances = 0.0
-        for inst_id, data in self.instrument_dict.items():
+        open_instruments = dict.fromkeys(position.instrument_id for position in self.cache.positions_open())
+        for inst_id in open_instruments:
+            if inst_id not in self.instrument_dict:
+                continue
             net_pos = self.portfolio.net_exposure(inst_id)    
             if net_pos is not None:
                 if self.portfolio.is_net_short(inst_id):
@@ -201,21 +289,32 @@ class BaseStrategy(Strategy):
             unreal = self.portfolio.unrealized_pnl(inst_id)
             if unreal:
                 total_unrealized += float(unreal)
-            total_realized += float(data["realized_pnl"])
-            venue = inst_id.venue
-            if venue not in seen_venues:
-                seen_venues.add(venue)
-                account = self.portfolio.account(venue)
-                if account:
-                    total_balances += account.balance_total(USDT).as_double()
-        total_equity = total_balances + total_unrealized
+        total_equity = self._total_venue_balances() + total_unrealized
+        if equity_only:
+            self.general_collector.add_indicator(timestamp=ts, name="total_equity", value=total_equity)
+            return
         self.general_collector.add_indicator(timestamp=ts, name="total_position", value=total_position)
         self.general_collector.add_indicator(timestamp=ts, name="total_unrealized_pnl", value=total_unrealized)
-        self.general_collector.add_indicator(timestamp=ts, name="total_realized_pnl", value=total_realized)
+        self.general_collector.add_indicator(timestamp=ts, name="total_realized_pnl", value=self._total_realized_pnl)
         self.general_collector.add_indicator(timestamp=ts, name="total_equity", value=total_equity)
 
+    def _total_venue_balances(self) -> float:
+        """USDT balances summed over venues, re-read only when the account has a new state event"""
+        total_balances = 0.0
+        for venue in self._venues:
+            account = self.portfolio.account(venue)
+            if not account:
+                continue
+            event_count = account.event_count
+            cached = self._venue_balances.get(venue)
+            if cached is None or cached[0] != event_count:
+                cached = (event_count, account.balance_total(USDT).as_double())
+                self._venue_balances[venue] = cached
+            total_balances += cached[1]
+        return total_balances
+
     def base_update_standard_indicators(self, timestamp, instrument_ctx, inst_id):
-        collector = instrument_ctx["collector"]
+        collector = self._ctx_collector(instrument_ctx)
         net_exp = self.portfolio.net_exposure(inst_id).as_double()
         #net_position = self.portfolio.net_position(inst_id)
         if self.portfolio.is_net_short(inst_id):
@@ -229,10 +328,12 @@ class BaseStrategy(Strategy):
         equity = usdt_balance.as_double() + (float(unrealized_pnl) if unrealized_pnl else 0)
         collector.add_indicator(timestamp=timestamp, name="position", value=net_exp)
         collector.add_indicator(timestamp=timestamp, name="unrealized_pnl", value=float(unrealized_pnl) if unrealized_pnl else None)
-        collector.add_indicator(timestamp=timestamp, name="realized_pnl", value=float(instrument_ctx["realized_pnl"]))
+        collector.add_indicator(timestamp=timestamp, name="realized_pnl", value=float(self._ctx_realized_pnl(instrument_ctx)))
         collector.add_indicator(timestamp=timestamp, name="equity", value=equity)
 
     def on_stop(self) -> None:
+        if self.bar_slice_dispatcher is not None:
+            self.bar_slice_dispatcher.flush()
         self.base_on_stop()
         self.stopped = True
         # Aggregiere pro Instrument
@@ -250,14 +351,8 @@ class BaseStrategy(Strategy):
             # timeframe ist z. B. "1m" oder "5m"
 
             bar_types = current_instrument["bar_types"]
-            # Robust Ermittlung des letzten Timestamps über alle vorhandenen Bar-Listen
-            bars_dict = getattr(current_instrument["collector"], "bars", {}) or {}
-            last_timestamp = None
-            for bar_list in bars_dict.values():
-                if bar_list:
-                    ts = bar_list[-1].get("timestamp")
-                    if ts is not None and (last_timestamp is None or ts > last_timestamp):
-                        last_timestamp = ts
+            # letzter Timestamp über alle Timeframes (bleibt auch nach Flushes erhalten)
+            last_timestamp = current_instrument["collector"].last_bar_timestamp()
             if last_timestamp is not None:
                 # Fallback falls keine Bars gesammelt wurden
                 
@@ -265,12 +360,15 @@ class BaseStrategy(Strategy):
                 current_instrument["collector"].add_indicator(timestamp=last_timestamp, name="position", value=net_position if net_position is not None else None)
                 current_instrument["collector"].add_indicator(timestamp=last_timestamp, name="unrealized_pnl", value=0.0)
                 current_instrument["collector"].add_indicator(timestamp=last_timestamp, name="realized_pnl", value=float(current_instrument["realized_pnl"]))
+            if last_timestamp is not None or current_instrument["collector"].trades:
+                # trades are always persisted, also when bar logging is reduced/off
                 # logging_message = f"{inst_id}: " + current_instrument["collector"].save_data()
                 current_instrument["collector"].save_data()
             # Legacy aggregat
             self.realized_pnl += current_instrument["realized_pnl"]
         # Nach Instrument-Aggregation finaler General-Snapshot
+        self._total_realized_pnl = sum(float(ctx["realized_pnl"]) for ctx in self.instrument_dict.values())
         ts_now = self.clock.timestamp_ns()
-        self._update_general_metrics(ts_now)
+        self._update_general_metrics(ts_now, force=True)
         # general_msg = self.general_collector.save_data()
         self.general_collector.save_data()
\ No newline at end of file
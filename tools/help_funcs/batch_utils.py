@@ -0,0 +1,97 @@
+# batch_utils.py
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, kernels then run as plain python
+    njit = None
+
+
+def maybe_njit(func):
+    """numba.njit(cache=True) if numba is installed, otherwise the python function unchanged"""
+    if njit is None:
+        return func
+    return njit(cache=True)(func)
+
+
+@maybe_njit
+def ema_kernel(values, alpha, initial=np.nan):
+    """EMA series value = alpha * x + (1 - alpha) * value, starting at initial (or at the first value if NaN)"""
+    out = np.empty(len(values))
+    current = initial
+    for i in range(len(values)):
+        if current != current:
+            current = values[i]
+        else:
+            current = alpha * values[i] + (1 - alpha) * current
+        out[i] = current
+    return out
+
+
+def ohlcv_column(ohlcv_arrays, name: str, dtype=np.float64) -> np.ndarray:
+    """one column of a dict of arrays / DataFrame / structured array as contiguous numpy array"""
+    return np.ascontiguousarray(np.asarray(ohlcv_arrays[name], dtype=dtype))
+
+
+def has_column(ohlcv_arrays, name: str) -> bool:
+    try:
+        ohlcv_arrays[name]
+    except (KeyError, ValueError, IndexError):
+        return False
+    return True
+
+
+def timestamps(ohlcv_arrays, prefer: str = "ts_event") -> np.ndarray:
+    """ns timestamps (ts_event / ts_init / timestamp), whichever exists first"""
+    for name in (prefer, "ts_event", "ts_init", "timestamp"):
+        if has_column(ohlcv_arrays, name):
+            return ohlcv_column(ohlcv_arrays, name, np.int64)
+    raise KeyError("ohlcv_arrays braucht eine Timestamp-Spalte (ts_event, ts_init oder timestamp)")
+
+
+def iter_bars(ohlcv_arrays) -> Iterator[Any]:
+    """lightweight bar records (open/high/low/close/volume/ts_event/ts_init as float/int) for replaying update(bar)"""
+    o = ohlcv_column(ohlcv_arrays, "open")
+    h = ohlcv_column(ohlcv_arrays, "high")
+    l = ohlcv_column(ohlcv_arrays, "low")
+    c = ohlcv_column(ohlcv_arrays, "close")
+    v = ohlcv_column(ohlcv_arrays, "volume")
+    ts = timestamps(ohlcv_arrays)
+    ts_init = ohlcv_column(ohlcv_arrays, "ts_init", np.int64) if has_column(ohlcv_arrays, "ts_init") else ts
+    for i in range(len(c)):
+        yield SimpleNamespace(
+            open=float(o[i]), high=float(h[i]), low=float(l[i]), close=float(c[i]), volume=float(v[i]),
+            ts_event=int(ts[i]), ts_init=int(ts_init[i]),
+        )
+
+
+def rolling_windows(values: np.ndarray, window: int, chunk_rows: int = 8192):
+    """
+    yields (start_row, windows) with windows[k] = values[row - window + 1 : row + 1] for full windows only,
+    chunked so that memory stays at chunk_rows * window
+    """
+    if len(values) < window:
+        return
+    view = sliding_window_view(values, window)
+    for start in range(0, len(view), chunk_rows):
+        yield start + window - 1, view[start:start + chunk_rows]
+
+
+def segment_starts(segment_ids: np.ndarray) -> np.ndarray:
+    """boolean mask of the first row of every run of equal segment ids"""
+    starts = np.ones(len(segment_ids), dtype=bool)
+    if len(segment_ids) > 1:
+        starts[1:] = segment_ids[1:] != segment_ids[:-1]
+    return starts
+
+
+def segment_cumsum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """cumulative sum that restarts at every True in starts"""
+    total = np.cumsum(values)
+    segment_index = np.cumsum(starts) - 1
+    before_start = np.r_[0.0, total][np.flatnonzero(starts)]
+    return total - before_start[segment_index]
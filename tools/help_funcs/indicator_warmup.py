@@ -0,0 +1,229 @@
+# indicator_warmup.py
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from tools.help_funcs.batch_utils import ema_kernel
+
+INDICATOR_SNAPSHOT_DIR = Path(__file__).resolve().parents[2] / "data" / "DATA_STORAGE" / "indicator_snapshots"
+WARMUP_KINDS = ("ema", "macd", "atr")
+
+
+def _alpha(period: int) -> float:
+    # same smoothing as nautilus ExponentialMovingAverage
+    return 2.0 / (period + 1.0)
+
+
+def _initial_state(spec: dict) -> dict:
+    kind = spec["kind"]
+    if kind == "ema":
+        return {"value": None, "count": 0}
+    if kind == "macd":
+        return {"fast": None, "slow": None, "count": 0, "line": None, "signal": None, "signal_count": 0}
+    if kind == "atr":
+        return {"true_ranges": [], "prev_close": None, "count": 0}
+    raise ValueError(f"Unbekannter Warm-up-Typ: {kind!r} (erlaubt: {WARMUP_KINDS})")
+
+
+def _last_ema(values: np.ndarray, period: int, value: Optional[float]) -> float:
+    return float(ema_kernel(values, _alpha(period), np.nan if value is None else value)[-1])
+
+
+def _continue_ema(state: dict, spec: dict, high, low, close) -> dict:
+    return {"value": _last_ema(close, spec["period"], state["value"]), "count": state["count"] + len(close)}
+
+
+def _continue_macd(state: dict, spec: dict, high, low, close) -> dict:
+    fast = ema_kernel(close, _alpha(spec["fast_period"]), np.nan if state["fast"] is None else state["fast"])
+    slow = ema_kernel(close, _alpha(spec["slow_period"]), np.nan if state["slow"] is None else state["slow"])
+    line = fast - slow
+    # the signal EMA only sees macd values once the macd is initialized (strategy: if macd.initialized)
+    counts = state["count"] + np.arange(1, len(close) + 1)
+    signal_input = line[counts >= max(spec["fast_period"], spec["slow_period"])]
+    new_state = {
+        "fast": float(fast[-1]),
+        "slow": float(slow[-1]),
+        "count": int(counts[-1]),
+        "line": float(line[-1]),
+        "signal": state["signal"],
+        "signal_count": state["signal_count"] + len(signal_input),
+    }
+    if len(signal_input):
+        new_state["signal"] = _last_ema(signal_input, spec["signal_period"], state["signal"])
+    return new_state
+
+
+def _continue_atr(state: dict, spec: dict, high, low, close) -> dict:
+    # true range like nautilus AverageTrueRange(use_previous=True), first bar uses its own close
+    first_prev = close[0] if state["prev_close"] is None else state["prev_close"]
+    prev_close = np.r_[first_prev, close[:-1]]
+    true_ranges = np.maximum(prev_close, high) - np.minimum(low, prev_close)
+    window = np.r_[np.asarray(state["true_ranges"], dtype=np.float64), true_ranges][-spec["period"]:]
+    return {"true_ranges": window.tolist(), "prev_close": float(close[-1]), "count": state["count"] + len(close)}
+
+
+CONTINUE_FUNCS = {"ema": _continue_ema, "macd": _continue_macd, "atr": _continue_atr}
+
+
+def _seed_ema(ema, value: Optional[float], count: int, period: int) -> None:
+    # EMA of a constant is the constant: `period` inputs restore value + initialized flag
+    ema.reset()
+    if value is None:
+        return
+    for _ in range(min(count, period)):
+        ema.update_raw(value)
+
+
+def _seed_macd(macd, state: dict, spec: dict) -> None:
+    """
+    restores fast / slow EMA of a nautilus MACD (only macd.value is public):
+    n-1 inputs x0 and one input y1 with fast = x0 + a_f * (y1 - x0), slow = x0 + a_s * (y1 - x0)
+    """
+    macd.reset()
+    if state["fast"] is None:
+        return
+    inputs = min(state["count"], max(spec["fast_period"], spec["slow_period"]))
+    alpha_fast, alpha_slow = _alpha(spec["fast_period"]), _alpha(spec["slow_period"])
+    if inputs < 2 or alpha_fast == alpha_slow:
+        for _ in range(inputs):
+            macd.update_raw(state["fast"])
+        return
+    step = (state["fast"] - state["slow"]) / (alpha_fast - alpha_slow)
+    x0 = state["fast"] - alpha_fast * step
+    for _ in range(inputs - 1):
+        macd.update_raw(x0)
+    macd.update_raw(x0 + step)
+
+
+def _seed_atr(atr, state: dict) -> None:
+    # bars with high = prev_close + tr, low = close = prev_close reproduce the true-range window exactly
+    atr.reset()
+    prev_close = state["prev_close"]
+    if prev_close is None:
+        return
+    for true_range in state["true_ranges"]:
+        atr.update_raw(prev_close + true_range, prev_close, prev_close)
+
+
+class IndicatorWarmup:
+    """
+    EMA / MACD / ATR state of one instrument, continued vectorised over bar arrays and seeded into the
+    nautilus indicators of the instrument context (instead of replaying the history bar by bar)
+
+    specs: {context_key: {"kind": "ema", "period": n}
+                         | {"kind": "macd", "fast_period", "slow_period", "signal_period", "signal_key", "prev_keys"}
+                         | {"kind": "atr", "period": n}}
+    """
+
+    def __init__(self, specs: Dict[str, dict], fold_every: int = 1000):
+        self.specs = specs
+        self.fold_every = fold_every
+        self.state = {name: _initial_state(spec) for name, spec in specs.items()}
+        self.last_ts: Optional[int] = None
+        self._pending: List[tuple] = []
+
+    def add_bar(self, high: float, low: float, close: float, ts: int) -> None:
+        """live bars are only buffered and folded into the state every fold_every bars"""
+        self._pending.append((high, low, close, ts))
+        if len(self._pending) >= self.fold_every:
+            self._fold()
+
+    def _fold(self) -> None:
+        if not self._pending:
+            return
+        pending = np.asarray(self._pending, dtype=np.float64)
+        ts = np.fromiter((row[3] for row in self._pending), dtype=np.int64, count=len(self._pending))
+        self._pending = []
+        self._continue(pending[:, 0], pending[:, 1], pending[:, 2], ts)
+
+    def warm_up(self, high, low, close, ts) -> int:
+        """continues the state over historical bars (ascending ts), bars up to the last known ts are skipped"""
+        self._fold()
+        return self._continue(
+            np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64),
+            np.asarray(close, dtype=np.float64), np.asarray(ts, dtype=np.int64),
+        )
+
+    def _continue(self, high, low, close, ts) -> int:
+        if self.last_ts is not None:
+            newer = ts > self.last_ts
+            high, low, close, ts = high[newer], low[newer], close[newer], ts[newer]
+        if len(ts) == 0:
+            return 0
+        for name, spec in self.specs.items():
+            self.state[name] = CONTINUE_FUNCS[spec["kind"]](self.state[name], spec, high, low, close)
+        self.last_ts = int(ts[-1])
+        return len(ts)
+
+    def inject(self, current_instrument: Dict[str, Any]) -> None:
+        """resets the context's nautilus indicators and seeds them with the current state"""
+        self._fold()
+        for name, spec in self.specs.items():
+            indicator = current_instrument.get(name)
+            if indicator is None:
+                continue
+            state = self.state[name]
+            if spec["kind"] == "ema":
+                _seed_ema(indicator, state["value"], state["count"], spec["period"])
+            elif spec["kind"] == "atr":
+                _seed_atr(indicator, state)
+            else:
+                _seed_macd(indicator, state, spec)
+                signal = current_instrument.get(spec.get("signal_key"))
+                if signal is not None:
+                    _seed_ema(signal, state["signal"], state["signal_count"], spec["signal_period"])
+                prev_keys = spec.get("prev_keys")
+                if prev_keys and state["signal"] is not None and state["signal_count"] >= spec["signal_period"]:
+                    current_instrument[prev_keys[0]] = state["line"]
+                    current_instrument[prev_keys[1]] = state["signal"]
+
+    def to_dict(self) -> dict:
+        self._fold()
+        return {"specs": self.specs, "last_ts": self.last_ts, "state": self.state}
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict], specs: Dict[str, dict], fold_every: int = 1000) -> Optional["IndicatorWarmup"]:
+        """None if there is no snapshot or it was taken with other indicator parameters"""
+        if not data or json.loads(json.dumps(specs)) != data.get("specs"):
+            return None
+        warmup = cls(specs, fold_every)
+        warmup.state.update(data.get("state", {}))
+        warmup.last_ts = data.get("last_ts")
+        return warmup
+
+
+def bar_arrays(bars) -> tuple:
+    """(high, low, close, ts_event) arrays from nautilus bars"""
+    high = np.fromiter((float(bar.high) for bar in bars), dtype=np.float64, count=len(bars))
+    low = np.fromiter((float(bar.low) for bar in bars), dtype=np.float64, count=len(bars))
+    close = np.fromiter((float(bar.close) for bar in bars), dtype=np.float64, count=len(bars))
+    ts = np.fromiter((bar.ts_event for bar in bars), dtype=np.int64, count=len(bars))
+    order = np.argsort(ts, kind="stable")
+    return high[order], low[order], close[order], ts[order]
+
+
+def save_indicator_snapshot(path, warmups: Dict[str, IndicatorWarmup]) -> Path:
+    """writes {instrument_id: warmup state} as json (tmp file + replace, so a crash never leaves half a snapshot)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {str(key): warmup.to_dict() for key, warmup in warmups.items()}
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_indicator_snapshot(path) -> Dict[str, dict]:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[indicator_warmup] Snapshot {path} unreadable: {e}")
+        return {}
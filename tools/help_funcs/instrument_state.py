@@ -0,0 +1,136 @@
+# instrument_state.py
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+BASE_INSTRUMENT_FIELDS = ("instrument_id", "bar_types", "collector", "realized_pnl", "unrealized_pnl")
+BASE_INSTRUMENT_DEFAULTS = {"realized_pnl": 0.0, "unrealized_pnl": 0.0}
+
+_STATE_CLASSES: Dict[Tuple, type] = {}
+
+
+class InstrumentState:
+    """
+    per-instrument context with __slots__ instead of a free-form dict: every declared field always exists
+    (None or its declared default), so the per-bar path reads plain slots (current_instrument.atr) and checks
+    `is None` instead of .get / in; no __getattr__ fallback on purpose, it disables CPython's slot-load fast path.
+    the item interface (["collector"], .get, in) is only a cold-path view for shared base code and snapshot / restore
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+    _defaults: Tuple[Tuple[str, Any], ...] = ()
+
+    def __init__(self, values: Optional[Dict[str, Any]] = None):
+        for name, default in self._defaults:
+            setattr(self, name, default)
+        if values:
+            self.restore(values)
+
+    def __getitem__(self, key):
+        if key not in self._field_set:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._field_set:
+            raise KeyError(f"{type(self).__name__}: Feld {key!r} ist nicht deklariert (instrument_state_fields)")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._field_set
+
+    def get(self, key, default=None):
+        if key not in self._field_set:
+            return default
+        return getattr(self, key)
+
+    def setdefault(self, key, default=None):
+        # declared fields are always set, only keeps the dict call sites in the base code working
+        return self[key]
+
+    def keys(self):
+        return self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.snapshot()!r})"
+
+    def snapshot(self, keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """plain dict of all fields (or only keys)"""
+        if keys is None:
+            keys = self._fields
+        return {key: getattr(self, key) for key in keys if key in self._field_set}
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        for key, value in data.items():
+            self[key] = value
+
+
+def instrument_state_class(fields: Iterable[str], defaults: Optional[Dict[str, Any]] = None) -> type:
+    """
+    InstrumentState subclass with one slot per field (cached per fields + defaults), unset fields start as None;
+    defaults are shared between instruments, so only immutable values (numbers, bools, strings)
+    """
+    defaults = {**BASE_INSTRUMENT_DEFAULTS, **(defaults or {})}
+    reserved = set(dir(InstrumentState))
+    slot_fields = []
+    for name in fields:
+        if name in slot_fields:
+            continue
+        if not isinstance(name, str) or not name.isidentifier() or name in reserved:
+            raise ValueError(f"InstrumentState: {name!r} ist kein gültiger Feldname")
+        slot_fields.append(name)
+    slot_fields = tuple(slot_fields)
+    field_defaults = tuple((name, defaults.get(name)) for name in slot_fields)
+    cache_key = (slot_fields, field_defaults)
+    cls = _STATE_CLASSES.get(cache_key)
+    if cls is None:
+        cls = type("InstrumentStateSlots", (InstrumentState,), {
+            "__slots__": slot_fields,
+            "_fields": slot_fields,
+            "_field_set": frozenset(slot_fields),
+            "_defaults": field_defaults,
+        })
+        _STATE_CLASSES[cache_key] = cls
+    return cls
+
+
+def snapshot_instrument_states(instrument_dict: Dict[Any, InstrumentState], keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    struct-of-arrays snapshot of numeric fields over all instruments:
+    {"instrument_ids": [...], key: float array} with NaN for None values
+    """
+    instrument_ids = list(instrument_dict.keys())
+    snapshot: Dict[str, Any] = {"instrument_ids": [str(instrument_id) for instrument_id in instrument_ids]}
+    for key in keys:
+        column = np.full(len(instrument_ids), np.nan)
+        for i, instrument_id in enumerate(instrument_ids):
+            value = getattr(instrument_dict[instrument_id], key, None)
+            if value is not None:
+                column[i] = float(value)
+        snapshot[key] = column
+    return snapshot
+
+
+def restore_instrument_states(instrument_dict: Dict[Any, InstrumentState], snapshot: Dict[str, Any]) -> int:
+    """writes a snapshot back by instrument id (NaN entries are left untouched), returns the number of restored instruments"""
+    positions = {instrument_id: i for i, instrument_id in enumerate(snapshot.get("instrument_ids", []))}
+    keys = [key for key in snapshot if key != "instrument_ids"]
+    restored = 0
+    for instrument_id, current_instrument in instrument_dict.items():
+        i = positions.get(str(instrument_id))
+        if i is None:
+            continue
+        for key in keys:
+            value = snapshot[key][i]
+            if not np.isnan(value):
+                setattr(current_instrument, key, float(value))
+        restored += 1
+    return restored
@@ -0,0 +1,147 @@
+# quantstats_reports.py
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional
+
+import matplotlib
+matplotlib.use('Agg')
+import pandas as pd
+import quantstats as qs
+
+from core.visualizing.backtest_visualizer_prototype import find_result_file, read_result_file
+
+BENCHMARK_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "DATA_STORAGE" / "benchmarks"
+
+
+def load_daily_returns(general_dir):
+    """daily returns of a run: daily_returns.csv written by the general collector, else resampled from total_equity"""
+    general_dir = Path(general_dir)
+    returns_csv = general_dir / "daily_returns.csv"
+    if returns_csv.exists():
+        df = pd.read_csv(returns_csv)
+        return pd.Series(df["value"].values, index=pd.to_datetime(df["timestamp"], unit="ns"))
+    equity_csv = find_result_file(general_dir / "indicators", "total_equity")
+    if equity_csv is None:
+        return None
+    return daily_returns_from_equity(equity_csv)
+
+
+def daily_returns_from_equity(equity_csv):
+    # Equity-Kurve laden, Duplikate entfernen, Zeitstempel als Index
+    equity_df = read_result_file(equity_csv, columns=["timestamp", "value"])
+    equity = pd.Series(equity_df["value"].values, index=pd.to_datetime(equity_df["timestamp"], unit="ns"))
+    equity = equity[~equity.index.duplicated(keep='first')]
+    # Fix: Resample auf Tagesbasis, damit QuantStats mit Yahoo-Finance-Benchmark funktioniert
+    equity_daily = equity.resample("1D").last().dropna()
+    return equity_daily.pct_change(fill_method=None).dropna()
+
+
+def load_benchmark_returns(symbol, start, end, cache_dir: Path = BENCHMARK_CACHE_DIR):
+    """
+    benchmark returns for [start, end] (days), downloaded once and cached as
+    <cache_dir>/<symbol>_<start>_<end>.parquet
+    """
+    start = pd.Timestamp(start).normalize()
+    end = pd.Timestamp(end).normalize()
+    safe_symbol = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(symbol))
+    cache_file = Path(cache_dir) / f"{safe_symbol}_{start:%Y%m%d}_{end:%Y%m%d}.parquet"
+    if cache_file.exists():
+        return pd.read_parquet(cache_file)["returns"]
+
+    benchmark = qs.utils.download_returns(symbol)
+    benchmark = benchmark[~benchmark.index.duplicated(keep='first')]
+    benchmark = benchmark[start:end]
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    benchmark.rename("returns").to_frame().to_parquet(cache_file)
+    return benchmark
+
+
+def slice_benchmark(benchmark, returns):
+    """benchmark restricted to the days of a run (incl. the first equity close before the first return)"""
+    if benchmark is None or returns is None or returns.empty:
+        return None
+    return benchmark[returns.index.min() - pd.Timedelta(days=1):returns.index.max()]
+
+
+def write_quantstats_report(run_dir, run_id, benchmark=None):
+    """worker entry point: one html report from the run's daily returns, returns the report path (None if no equity)"""
+    run_dir = Path(run_dir)
+    returns = load_daily_returns(run_dir / "general")
+    if returns is None:
+        return None
+    out_file = run_dir / "quantstats_report.html"
+    qs.reports.html(returns, benchmark=slice_benchmark(benchmark, returns), output=str(out_file), title=f"QuantStats Report - {run_id}")
+    return out_file
+
+
+def select_top_runs(run_dirs, run_ids, metrics_df: Optional[pd.DataFrame], top_k, metric, maximize=True):
+    """best top_k runs by metric from the sweep summary; all runs if top_k is falsy or the metric is unknown"""
+    if not top_k or metrics_df is None or metric not in metrics_df.columns or "run_id" not in metrics_df.columns:
+        return list(run_dirs), list(run_ids)
+    scores = pd.to_numeric(metrics_df.drop_duplicates("run_id").set_index("run_id")[metric], errors="coerce")
+    runs = pd.DataFrame({"run_dir": list(run_dirs), "run_id": list(run_ids)})
+    runs["score"] = runs["run_id"].map(scores)
+    # NaN scores (failed / missing metric) always last
+    runs = runs.sort_values("score", ascending=not maximize, na_position="last", kind="stable").head(int(top_k))
+    return runs["run_dir"].tolist(), runs["run_id"].tolist()
+
+
+def generate_quantstats_reports(
+    run_dirs: List[Path],
+    run_ids: List[str],
+    benchmark_symbol=None,
+    workers: Optional[int] = None,
+) -> List[Path]:
+    """writes quantstats_report.html for every run over a process pool, the benchmark is fetched once for all runs"""
+    run_dirs = [Path(d) for d in run_dirs]
+    benchmark = None
+    if benchmark_symbol:
+        spans = []
+        for run_dir in run_dirs:
+            returns_csv = run_dir / "general" / "daily_returns.csv"
+            if returns_csv.exists():
+                ts = pd.read_csv(returns_csv, usecols=["timestamp"])["timestamp"]
+                if not ts.empty:
+                    spans.append((ts.min(), ts.max()))
+        try:
+            if spans:
+                start = pd.to_datetime(min(s for s, _ in spans), unit="ns") - pd.Timedelta(days=1)
+                end = pd.to_datetime(max(e for _, e in spans), unit="ns")
+                benchmark = load_benchmark_returns(benchmark_symbol, start, end)
+            else:
+                # legacy runs without daily_returns.csv -> full history, sliced per run
+                benchmark = qs.utils.download_returns(benchmark_symbol)
+        except Exception as e:
+            print(f"[QuantStats] Benchmark {benchmark_symbol} unavailable: {e}")
+
+    workers = max(1, min(int(workers or os.cpu_count() or 1), max(len(run_dirs), 1)))
+    written = []
+
+    def _done(run_id, out_file):
+        if out_file is None:
+            print(f"[QuantStats] total_equity.csv missing for {run_id} -> skipped")
+            return
+        print(f"[QuantStats] Report written: {out_file}")
+        written.append(out_file)
+
+    if workers <= 1:
+        for run_dir, run_id in zip(run_dirs, run_ids):
+            try:
+                _done(run_id, write_quantstats_report(run_dir, run_id, benchmark))
+            except Exception as e:
+                print(f"[QuantStats] Failed for {run_id}: {e}")
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(write_quantstats_report, run_dir, run_id, benchmark): run_id
+            for run_dir, run_id in zip(run_dirs, run_ids)
+        }
+        for future in as_completed(futures):
+            run_id = futures[future]
+            try:
+                _done(run_id, future.result())
+            except Exception as e:
+                print(f"[QuantStats] Failed for {run_id}: {e}")
+    return written
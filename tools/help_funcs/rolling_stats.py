@@ -0,0 +1,342 @@
+# rolling_stats.py
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from typing import Optional
+
+DAY_NS = 24 * 60 * 60 * 1_000_000_000
+
+
+class RollingVariance:
+    """
+    fixed-size window with O(1) mean / sample std (Welford add + remove)
+    the moments are rebuilt from the window once per full turnover to cancel rounding drift
+    """
+
+    def __init__(self, maxlen: int):
+        self.values = deque(maxlen=maxlen)
+        self._evictions = 0
+        self._reset_moments()
+
+    def _reset_moments(self):
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self):
+        return len(self.values)
+
+    def _add(self, value: float):
+        n = len(self.values)
+        delta = value - self.mean
+        self.mean += delta / n
+        self._m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float):
+        n = len(self.values)
+        if n == 0:
+            self._reset_moments()
+            return
+        delta = value - self.mean
+        self.mean -= delta / n
+        self._m2 -= delta * (value - self.mean)
+
+    def append(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            evicted = self.values.popleft()
+            self._remove(evicted)
+            self._evictions += 1
+        self.values.append(value)
+        self._add(value)
+        if self._evictions >= self.values.maxlen:
+            self._rebuild()
+
+    def _rebuild(self):
+        values = list(self.values)
+        self.values.clear()
+        self._reset_moments()
+        self._evictions = 0
+        for value in values:
+            self.values.append(value)
+            self._add(value)
+
+    def variance(self, ddof: int = 1) -> Optional[float]:
+        n = len(self.values)
+        if n - ddof <= 0:
+            return None
+        return max(self._m2, 0.0) / (n - ddof)
+
+    def std(self, ddof: int = 1) -> Optional[float]:
+        variance = self.variance(ddof)
+        return None if variance is None else math.sqrt(variance)
+
+    def clear(self):
+        self.values.clear()
+        self._evictions = 0
+        self._reset_moments()
+
+
+class RollingSum:
+    """
+    fixed-size window with an O(1) running sum (instead of sum(history[-n:]) per bar)
+    the sum is rebuilt from the window once per full turnover to cancel rounding drift
+    """
+
+    def __init__(self, maxlen: int):
+        self.values = deque(maxlen=maxlen)
+        self._evictions = 0
+        self.sum = 0.0
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            self.sum -= self.values.popleft()
+            self._evictions += 1
+        self.values.append(value)
+        self.sum += value
+        if self._evictions >= self.values.maxlen:
+            self._evictions = 0
+            self.sum = math.fsum(self.values)
+
+    def clear(self):
+        self.values.clear()
+        self._evictions = 0
+        self.sum = 0.0
+
+
+class RollingSlope:
+    """
+    least-squares slope of the window against x = 0..n-1 (like np.polyfit(range(n), window, 1)[0]) in O(1):
+    keeps Σy and Σ(i·y) relative to the window start, y shifted by a reference value for precision
+    """
+
+    def __init__(self, maxlen: int):
+        self.values = deque(maxlen=maxlen)
+        self._evictions = 0
+        self._offset = None
+        self._sum_y = 0.0
+        self._sum_iy = 0.0
+
+    def __len__(self):
+        return len(self.values)
+
+    def append(self, value: float):
+        if self._offset is None:
+            self._offset = value
+        y = value - self._offset
+        n = len(self.values)
+        if n == self.values.maxlen:
+            y0 = self.values.popleft() - self._offset
+            # every remaining index moves one step to the left
+            self._sum_iy -= self._sum_y - y0
+            self._sum_y -= y0
+            n -= 1
+            self._evictions += 1
+        self.values.append(value)
+        self._sum_iy += n * y
+        self._sum_y += y
+        if self._evictions >= self.values.maxlen:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._evictions = 0
+        self._offset = self.values[-1]
+        self._sum_y = 0.0
+        self._sum_iy = 0.0
+        for i, value in enumerate(self.values):
+            y = value - self._offset
+            self._sum_y += y
+            self._sum_iy += i * y
+
+    def slope(self) -> float:
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        sum_x = n * (n - 1) / 2.0
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6.0
+        return (n * self._sum_iy - sum_x * self._sum_y) / (n * sum_xx - sum_x * sum_x)
+
+    def clear(self):
+        self.values.clear()
+        self._evictions = 0
+        self._offset = None
+        self._sum_y = 0.0
+        self._sum_iy = 0.0
+
+
+class RollingQuantile:
+    """
+    fixed-size window with order statistics (rank, k-th value, quantile) instead of sorting the window per bar:
+    the values are kept sorted in buckets of <= 2 * bucket_size, insert / evict cost a bisect plus a short
+    list shift, lookups walk the bucket lengths (window 5000 -> ~40 buckets)
+    """
+
+    def __init__(self, maxlen: int, bucket_size: int = 64):
+        self.values = deque(maxlen=maxlen)
+        self.bucket_size = bucket_size
+        self._buckets = []
+        self._maxes = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def append(self, value: float):
+        if len(self.values) == self.values.maxlen:
+            self._remove(self.values[0])
+        self.values.append(value)
+        self._insert(value)
+
+    def _insert(self, value: float):
+        if not self._buckets:
+            self._buckets.append([value])
+            self._maxes.append(value)
+            return
+        i = min(bisect_left(self._maxes, value), len(self._buckets) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, value)
+        self._maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self.bucket_size:
+            self._buckets.insert(i + 1, bucket[self.bucket_size:])
+            del bucket[self.bucket_size:]
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, self._buckets[i + 1][-1])
+
+    def _remove(self, value: float):
+        # first bucket whose max >= value holds the value (all earlier maxes are smaller)
+        i = bisect_left(self._maxes, value)
+        bucket = self._buckets[i]
+        del bucket[bisect_left(bucket, value)]
+        if bucket:
+            self._maxes[i] = bucket[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+
+    def count_less(self, value: float) -> int:
+        """number of window values < value"""
+        i = bisect_left(self._maxes, value)
+        count = sum(len(bucket) for bucket in self._buckets[:i])
+        if i < len(self._buckets):
+            count += bisect_left(self._buckets[i], value)
+        return count
+
+    def count_less_equal(self, value: float) -> int:
+        i = bisect_right(self._maxes, value)
+        count = sum(len(bucket) for bucket in self._buckets[:i])
+        if i < len(self._buckets):
+            count += bisect_right(self._buckets[i], value)
+        return count
+
+    def rank(self, value: float) -> float:
+        """share of window values < value (like bisect_left on the sorted window / n), 0.5 for an empty window"""
+        if not self.values:
+            return 0.5
+        return self.count_less(value) / len(self.values)
+
+    def kth(self, k: int) -> float:
+        """k-th smallest value (0-based, negative k counts from the largest like list indexing)"""
+        n = len(self.values)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError(f"kth: Index {k} außerhalb des Fensters (Länge {n})")
+        for bucket in self._buckets:
+            if k < len(bucket):
+                return bucket[k]
+            k -= len(bucket)
+        raise IndexError(f"kth: Index {k} außerhalb des Fensters (Länge {n})")
+
+    def quantile(self, q: float) -> Optional[float]:
+        """linear interpolation like pd.Series.quantile, None for an empty window"""
+        n = len(self.values)
+        if n == 0:
+            return None
+        pos = q * (n - 1)
+        lo = int(math.floor(pos))
+        hi = min(lo + 1, n - 1)
+        low_value = self.kth(lo)
+        return low_value + (self.kth(hi) - low_value) * (pos - lo)
+
+    def clear(self):
+        self.values.clear()
+        self._buckets = []
+        self._maxes = []
+
+
+class RollingTimeSum:
+    """
+    running sums over a time window (e.g. 24h of bars, independent of the bar interval) in a circular buffer:
+    rows with ts <= newest ts - window_ns are evicted, the buffer doubles only if more rows fall into the window;
+    the sums are rebuilt from the buffer once per full turnover to cancel rounding drift
+    """
+
+    def __init__(self, window_ns: int, width: int = 1, capacity: int = 128):
+        self.window_ns = int(window_ns)
+        self.width = width
+        self._ts = [0] * capacity
+        self._rows = [None] * capacity
+        self._start = 0
+        self._count = 0
+        self._evictions = 0
+        self.sums = [0.0] * width
+
+    def __len__(self):
+        return self._count
+
+    def append(self, ts: int, *values: float):
+        if len(values) != self.width:
+            raise ValueError(f"RollingTimeSum erwartet {self.width} Werte, erhalten: {len(values)}")
+        capacity = len(self._ts)
+        cutoff = ts - self.window_ns
+        while self._count and self._ts[self._start] <= cutoff:
+            row = self._rows[self._start]
+            for j in range(self.width):
+                self.sums[j] -= row[j]
+            self._rows[self._start] = None
+            self._start = (self._start + 1) % capacity
+            self._count -= 1
+            self._evictions += 1
+        if self._count == capacity:
+            self._grow()
+            capacity = len(self._ts)
+        end = (self._start + self._count) % capacity
+        self._ts[end] = ts
+        self._rows[end] = values
+        for j in range(self.width):
+            self.sums[j] += values[j]
+        self._count += 1
+        if self._evictions >= capacity:
+            self._rebuild()
+
+    def _ordered(self):
+        capacity = len(self._ts)
+        for k in range(self._count):
+            i = (self._start + k) % capacity
+            yield self._ts[i], self._rows[i]
+
+    def _grow(self):
+        ordered = list(self._ordered())
+        capacity = 2 * len(self._ts)
+        self._ts = [ts for ts, _ in ordered] + [0] * (capacity - len(ordered))
+        self._rows = [row for _, row in ordered] + [None] * (capacity - len(ordered))
+        self._start = 0
+
+    def _rebuild(self):
+        self._evictions = 0
+        self.sums = [math.fsum(row[j] for _, row in self._ordered()) for j in range(self.width)]
+
+    def sum(self, column: int = 0) -> float:
+        return self.sums[column]
+
+    def clear(self):
+        capacity = len(self._ts)
+        self._ts = [0] * capacity
+        self._rows = [None] * capacity
+        self._start = 0
+        self._count = 0
+        self._evictions = 0
+        self.sums = [0.0] * self.width
@@ -0,0 +1,665 @@
+# sweep_runner.py
+import copy
+import hashlib
+import json
+import math
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+import msgspec
+import pandas as pd
+import yaml
+from nautilus_trader.backtest.engine import BacktestEngine
+from nautilus_trader.backtest.node import BacktestNode
+from nautilus_trader.backtest.config import BacktestEngineConfig, BacktestRunConfig
+from nautilus_trader.model.currencies import Currency
+from nautilus_trader.model.enums import AccountType, OmsType
+from nautilus_trader.model.identifiers import ClientId, Venue
+from nautilus_trader.model.objects import Money
+from nautilus_trader.trading.config import ImportableStrategyConfig, StrategyFactory
+
+from tools.help_funcs.help_funcs_execution import _clear_directory, extract_metrics
+from core.visualizing.backtest_visualizer_prototype import RESULT_SINKS, RUN_EQUITY_STATS, find_result_file, read_result_file
+from tools.help_funcs.yaml_loader import set_nested_parameter
+from tools.help_funcs.tpe_optimizer import DiscreteTPE
+
+
+def resolve_worker_count(sweep_params: Dict[str, Any], n_runs: int) -> int:
+    """reads sweep.workers from the yaml ('auto' -> all cores), capped at the number of runs"""
+    workers = sweep_params.get("workers", 1)
+    if workers in ("auto", None, 0):
+        workers = os.cpu_count() or 1
+    return max(1, min(int(workers), max(n_runs, 1)))
+
+
+# config keys that only change what gets logged / plotted / reported, not the backtest itself
+NON_OUTCOME_KEYS = (
+    "run_id", "collection_level", "collection_decimation", "result_sink",
+    "visualize", "load_qs", "qs_bench", "qs_top_k",
+)
+
+
+def compute_run_hash(
+    strategy_path: str,
+    config_params: Dict[str, Any],
+    data_sources: List[Dict[str, Any]],
+    start_date: Any,
+    end_date: Any,
+    venue_params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """stable content hash of everything that determines a run's outcome (run_id / logging detail are excluded)"""
+    payload = {
+        "strategy_path": strategy_path,
+        "config": {k: v for k, v in config_params.items() if k not in NON_OUTCOME_KEYS},
+        "data_sources": data_sources,
+        "start_date": start_date,
+        "end_date": end_date,
+        "venue": venue_params or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:12]
+
+
+def is_run_complete(run_dir: Path, result_sink: Optional[str] = None) -> bool:
+    """
+    a run counts as cached once its metrics and the final collector output (general/trades.csv) exist;
+    with result_sink the equity series must also be in that format (the sink is not part of the run hash)
+    """
+    run_dir = Path(run_dir)
+    if not (run_dir / "performance_metrics.csv").exists() or not (run_dir / "general" / "trades.csv").exists():
+        return False
+    if result_sink is None:
+        return True
+    equity_file = find_result_file(run_dir / "general" / "indicators", "total_equity")
+    return equity_file is not None and equity_file.suffix == RESULT_SINKS[result_sink].extension
+
+
+def _take_equity_stats() -> Dict[str, Dict[str, Any]]:
+    """equity statistics the strategies of this process published during the last run (run_id -> summary)"""
+    stats = dict(RUN_EQUITY_STATS)
+    RUN_EQUITY_STATS.clear()
+    return stats
+
+
+def _run_single_backtest(run_config: BacktestRunConfig):
+    """worker entry point: runs exactly one config in its own BacktestNode, returns (BacktestResult, equity stats)"""
+    node = BacktestNode(configs=[run_config])
+    try:
+        results = node.run()
+    finally:
+        node.dispose()
+    return (results[0] if results else None), _take_equity_stats()
+
+
+def run_backtests_parallel(
+    run_configs: List[BacktestRunConfig],
+    max_workers: int = 1,
+    on_result: Optional[Callable[[int, Any], None]] = None,
+) -> List[Any]:
+    """
+    runs every config in its own BacktestNode, sharded over a process pool
+    on_result(index, result) is called in the parent as soon as a run finishes (result is None if the run failed,
+    otherwise a (BacktestResult, equity stats per run_id) tuple)
+    returns the results in the order of run_configs
+    """
+    results: List[Any] = [None] * len(run_configs)
+
+    def _handle(idx: int, result: Any) -> None:
+        results[idx] = result
+        if on_result is not None:
+            on_result(idx, result)
+
+    if max_workers <= 1:
+        for idx, run_config in enumerate(run_configs):
+            try:
+                result = _run_single_backtest(run_config)
+            except Exception as e:
+                print(f"[sweep] Run {idx} failed: {e}")
+                result = None
+            _handle(idx, result)
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_run_single_backtest, cfg): idx for idx, cfg in enumerate(run_configs)}
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[sweep] Run {idx} failed: {e}")
+                result = None
+            _handle(idx, result)
+    return results
+
+
+# per-process engine with all instruments/data preloaded (see run_backtests_shared)
+_SHARED_ENGINE: Optional[BacktestEngine] = None
+
+
+def _build_shared_engine(engine_config, venue_configs, data_configs, start_date, end_date) -> BacktestEngine:
+    """creates a BacktestEngine without strategies and loads instruments + catalog data of all data configs once"""
+    engine = BacktestEngine(config=msgspec.structs.replace(engine_config, strategies=[]))
+    for venue_config in venue_configs:
+        engine.add_venue(
+            venue=Venue(venue_config.name),
+            oms_type=OmsType[venue_config.oms_type],
+            account_type=AccountType[venue_config.account_type],
+            base_currency=Currency.from_str(venue_config.base_currency) if venue_config.base_currency else None,
+            starting_balances=[Money.from_str(b) for b in venue_config.starting_balances],
+            bar_adaptive_high_low_ordering=venue_config.bar_adaptive_high_low_ordering,
+        )
+    added_instruments = set()
+    for data_config in data_configs:
+        loaded = BacktestNode.load_data_config(data_config, start_date, end_date)
+        for instrument in loaded.instruments or []:
+            if instrument.id not in added_instruments:
+                engine.add_instrument(instrument)
+                added_instruments.add(instrument.id)
+        client_id = ClientId(data_config.client_id) if data_config.client_id else None
+        engine.add_data(loaded.data, client_id=client_id)
+    return engine
+
+
+def _init_shared_worker(engine_config, venue_configs, data_configs, start_date, end_date) -> None:
+    global _SHARED_ENGINE
+    _SHARED_ENGINE = _build_shared_engine(engine_config, venue_configs, data_configs, start_date, end_date)
+
+
+def _run_on_shared_engine(strategy_config: ImportableStrategyConfig, start_date, end_date):
+    """worker entry point: swaps the strategy on the preloaded engine, runs the window and resets the engine"""
+    engine = _SHARED_ENGINE
+    engine.clear_strategies()
+    engine.add_strategy(StrategyFactory.create(strategy_config))
+    try:
+        engine.run(start=start_date, end=end_date)
+        return engine.get_result(), _take_equity_stats()
+    finally:
+        engine.reset()
+
+
+def run_backtests_shared(
+    run_configs: List[BacktestRunConfig],
+    max_workers: int = 1,
+    on_result: Optional[Callable[[int, Any], None]] = None,
+) -> List[Any]:
+    """
+    same contract as run_backtests_parallel, but every worker process loads the catalog data once into a
+    BacktestEngine and reuses it (reset between runs) instead of re-reading the parquet files per run
+    all configs must share data, venues and engine settings - only strategy config and date window may differ
+    """
+    results: List[Any] = [None] * len(run_configs)
+    if not run_configs:
+        return results
+
+    template = run_configs[0]
+    data_start = min((cfg.start for cfg in run_configs), key=pd.Timestamp)
+    data_end = max((cfg.end for cfg in run_configs), key=pd.Timestamp)
+    init_args = (template.engine, template.venues, template.data, data_start, data_end)
+    tasks = [(cfg.engine.strategies[0], cfg.start, cfg.end) for cfg in run_configs]
+
+    def _handle(idx: int, result: Any) -> None:
+        results[idx] = result
+        if on_result is not None:
+            on_result(idx, result)
+
+    if max_workers <= 1:
+        _init_shared_worker(*init_args)
+        try:
+            for idx, task in enumerate(tasks):
+                try:
+                    result = _run_on_shared_engine(*task)
+                except Exception as e:
+                    print(f"[sweep] Run {idx} failed: {e}")
+                    result = None
+                _handle(idx, result)
+        finally:
+            _SHARED_ENGINE.dispose()
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_shared_worker, initargs=init_args) as pool:
+        futures = {pool.submit(_run_on_shared_engine, *task): idx for idx, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[sweep] Run {idx} failed: {e}")
+                result = None
+            _handle(idx, result)
+    return results
+
+
+@dataclass
+class PreparedRun:
+    run_id: str
+    run_dir: Path
+    run_params: Dict[str, Any]
+    start_date: Any
+    end_date: Any
+    run_config: Optional[BacktestRunConfig] = None      # None -> served from cache
+    extra_metrics: Dict[str, Any] = field(default_factory=dict)
+    metrics: Optional[Dict[str, Any]] = None
+
+
+class SweepRunner:
+    """builds hashed run folders + BacktestRunConfigs for parameter combinations and executes them on the pool"""
+
+    def __init__(
+        self,
+        params: Dict[str, Any],
+        static_params: Dict[str, Any],
+        data_configs: List[Any],
+        data_sources_normalized: List[Dict[str, Any]],
+        venue_config: Any,
+        venue_params: Dict[str, Any],
+        results_dir: Path,
+        sweep_params: Optional[Dict[str, Any]] = None,
+    ):
+        self.params = params
+        self.static_params = static_params
+        self.data_configs = data_configs
+        self.data_sources_normalized = data_sources_normalized
+        self.venue_config = venue_config
+        self.venue_params = venue_params
+        self.results_dir = Path(results_dir)
+        self.sweep_params = sweep_params or {}
+        self.strategy_path = params["strategy_path"]
+        self.config_path = params["config_path"]
+        self.start_date = params["start_date"]
+        self.end_date = params["end_date"]
+        self.use_cache = self.sweep_params.get("cache", True)
+        self.shared_data = self.sweep_params.get("shared_data", False)
+        # e.g. "equity_only" for the sweep, the best runs are re-run at "full" afterwards (see rerun_top_k_full)
+        self.collection_level = self.sweep_params.get("collection_level")
+        # every run id prepared in this sweep (cached or new), see prune_stale_runs
+        self.prepared_run_ids = set()
+
+    def build_config_params(self, run_params: Dict[str, Any]) -> Dict[str, Any]:
+        config_params = copy.deepcopy(self.static_params)
+        for param_key, param_value in run_params.items():
+            if "." in param_key:
+                set_nested_parameter(config_params, param_key, param_value)
+            else:
+                config_params[param_key] = param_value
+        return config_params
+
+    def prepare_run(
+        self,
+        run_params: Dict[str, Any],
+        start_date: Any = None,
+        end_date: Any = None,
+        extra_metrics: Optional[Dict[str, Any]] = None,
+        collection_level: Optional[str] = None,
+    ) -> PreparedRun:
+        """hashes the run, serves it from cache if complete, otherwise creates its folder + BacktestRunConfig"""
+        start_date = start_date or self.start_date
+        end_date = end_date or self.end_date
+        config_params = self.build_config_params(run_params)
+        collection_level = collection_level or self.collection_level
+        if collection_level:
+            config_params["collection_level"] = collection_level
+        level = config_params.get("collection_level", "full")
+
+        run_hash = compute_run_hash(
+            self.strategy_path, config_params, self.data_sources_normalized, start_date, end_date, self.venue_params
+        )
+        run_id = f"run_{run_hash}"
+        run_dir = self.results_dir / run_id
+        extra_metrics = {**(extra_metrics or {}), "collection_level": level}
+        prepared = PreparedRun(run_id, run_dir, run_params, start_date, end_date, extra_metrics=extra_metrics)
+        self.prepared_run_ids.add(run_id)
+
+        if self.use_cache and is_run_complete(run_dir, config_params.get("result_sink", "csv")):
+            cached = pd.read_csv(run_dir / "performance_metrics.csv")
+            # a cached run only counts if it was logged at least as detailed as requested
+            cached_level = cached["collection_level"].iloc[0] if "collection_level" in cached.columns and not cached.empty else "full"
+            if not cached.empty and cached_level in (level, "full"):
+                print(f"[sweep] Cache hit: {run_id}")
+                prepared.metrics = {**cached.iloc[0].to_dict(), **prepared.extra_metrics}
+                return prepared
+        # incomplete leftovers of an aborted run are discarded
+        _clear_directory(run_dir)
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        config_params["run_id"] = run_id
+        strategy_config = ImportableStrategyConfig(
+            strategy_path=self.strategy_path,
+            config_path=self.config_path,
+            config=config_params,
+        )
+        engine_config = BacktestEngineConfig(strategies=[strategy_config])
+        prepared.run_config = BacktestRunConfig(
+            data=self.data_configs,
+            venues=[self.venue_config],
+            engine=engine_config,
+            start=start_date,
+            end=end_date,
+        )
+
+        run_config_dict = copy.deepcopy(self.params)
+        run_config_dict.update(run_params)
+        run_config_dict.update(self.static_params)
+        run_config_dict["run_id"] = run_id
+        run_config_dict["run_hash"] = run_hash
+        run_config_dict["start_date"] = start_date
+        run_config_dict["end_date"] = end_date
+        with open(run_dir / "run_config.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(run_config_dict, f, allow_unicode=True, sort_keys=False)
+        return prepared
+
+    def prune_stale_runs(self) -> List[str]:
+        """
+        removes run_* folders of earlier grids that this sweep did not prepare, so the dashboard / regime
+        analyzer (newest run folder, all run folders) only see runs of the current all_backtest_results.csv
+        """
+        removed = []
+        if not self.results_dir.exists():
+            return removed
+        for run_dir in self.results_dir.iterdir():
+            if run_dir.is_dir() and run_dir.name.startswith("run_") and run_dir.name not in self.prepared_run_ids:
+                shutil.rmtree(run_dir, ignore_errors=True)
+                removed.append(run_dir.name)
+        if removed:
+            print(f"[sweep] Removed {len(removed)} run folders of earlier grids")
+        return removed
+
+    def execute(self, prepared_runs: List[PreparedRun]) -> List[PreparedRun]:
+        """runs all non-cached runs on the pool; metrics are written per run as soon as it finishes"""
+        pending = [r for r in prepared_runs if r.run_config is not None]
+        n_workers = resolve_worker_count(self.sweep_params, len(pending))
+        print(f"[sweep] {len(pending)} runs on {n_workers} worker(s), {len(prepared_runs) - len(pending)} cached")
+        if not pending:
+            return prepared_runs
+
+        done = 0
+
+        def _on_result(idx, payload):
+            nonlocal done
+            if payload is None or payload[0] is None:
+                return
+            result, equity_stats = payload
+            run = pending[idx]
+            metrics = extract_metrics(result, run.run_params, run.run_id, equity_stats=equity_stats.get(run.run_id))
+            metrics.update(run.extra_metrics)
+            pd.DataFrame([metrics]).to_csv(run.run_dir / "performance_metrics.csv", index=False)
+            run.metrics = metrics
+            done += 1
+            print(f"[sweep] {run.run_id} finished ({done}/{len(pending)})")
+
+        run_configs = [r.run_config for r in pending]
+        if self.shared_data:
+            run_backtests_shared(run_configs, max_workers=n_workers, on_result=_on_result)
+        else:
+            run_backtests_parallel(run_configs, max_workers=n_workers, on_result=_on_result)
+        return prepared_runs
+
+
+def _shift_date(start_date: Any, end_date: Any, fraction: float) -> str:
+    """returns the timestamp at 'fraction' of the way from start_date to end_date"""
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    return (start + (end - start) * fraction).isoformat()
+
+
+def halving_schedule(sweep_params: Dict[str, Any]) -> List[float]:
+    """fractions of the full date range per rung, e.g. min_fraction=0.2, eta=2 -> [0.2, 0.4, 0.8, 1.0]"""
+    min_fraction = float(sweep_params.get("min_fraction", 0.2))
+    eta = float(sweep_params.get("eta", 2))
+    if not 0 < min_fraction <= 1 or eta <= 1:
+        raise ValueError("sweep: 'min_fraction' muss in (0, 1] liegen und 'eta' > 1 sein.")
+    fractions = []
+    fraction = min_fraction
+    while fraction < 1.0:
+        fractions.append(fraction)
+        fraction *= eta
+    fractions.append(1.0)
+    return fractions
+
+
+def rank_runs(runs: List[PreparedRun], metric: str, maximize: bool = True) -> List[PreparedRun]:
+    """sorts runs by metric (failed runs / missing values last)"""
+    def _key(run):
+        value = _metric_value(run, metric)
+        if value is None:
+            return (1, 0.0)
+        return (0, -value if maximize else value)
+    return sorted(runs, key=_key)
+
+
+def rerun_top_k_full(runner: SweepRunner, runs: List[PreparedRun]) -> List[PreparedRun]:
+    """
+    re-runs the best sweep.full_rerun_top_k runs (by sweep.metric) with collection_level 'full' so they can be
+    inspected in the dashboard; the run ids stay the same (logging detail is not part of the hash)
+    """
+    sweep_params = runner.sweep_params
+    top_k = int(sweep_params.get("full_rerun_top_k", 0) or 0)
+    if top_k <= 0:
+        return runs
+    metric = sweep_params.get("metric", "Sharpe Ratio (252 days)")
+    maximize = sweep_params.get("maximize", True)
+
+    best = [run for run in rank_runs(runs, metric, maximize)[:top_k] if run.metrics is not None]
+    reruns = {
+        run.run_id: runner.prepare_run(
+            run.run_params,
+            start_date=run.start_date,
+            end_date=run.end_date,
+            extra_metrics={k: v for k, v in run.extra_metrics.items() if k != "collection_level"},
+            collection_level="full",
+        )
+        for run in best
+    }
+    print(f"[sweep] Re-running top {len(reruns)} runs with full collection")
+    runner.execute(list(reruns.values()))
+    # keep the original result if a re-run failed
+    return [
+        reruns[run.run_id] if run.run_id in reruns and reruns[run.run_id].metrics is not None else run
+        for run in runs
+    ]
+
+
+def run_successive_halving(runner: SweepRunner, combinations: List[Dict[str, Any]]) -> List[PreparedRun]:
+    """
+    successive halving: all combinations run on a short prefix of the date range,
+    only the best 1/eta (by sweep.metric) are promoted to the next, longer window
+    returns the furthest run of every combination (with 'rung' / 'rung_end_date' in its metrics)
+    """
+    sweep_params = runner.sweep_params
+    metric = sweep_params.get("metric", "Sharpe Ratio (252 days)")
+    maximize = sweep_params.get("maximize", True)
+    eta = float(sweep_params.get("eta", 2))
+    fractions = halving_schedule(sweep_params)
+
+    final_runs: Dict[int, PreparedRun] = {}
+    survivors = list(range(len(combinations)))
+    for rung, fraction in enumerate(fractions):
+        rung_end = runner.end_date if fraction >= 1.0 else _shift_date(runner.start_date, runner.end_date, fraction)
+        print(f"[sweep] Rung {rung}: {len(survivors)} runs until {rung_end}")
+        prepared = [
+            runner.prepare_run(
+                combinations[idx],
+                end_date=rung_end,
+                extra_metrics={"rung": rung, "rung_end_date": rung_end},
+            )
+            for idx in survivors
+        ]
+        runner.execute(prepared)
+        for idx, run in zip(survivors, prepared):
+            final_runs[idx] = run
+
+        if rung == len(fractions) - 1:
+            break
+        n_keep = max(1, int(math.ceil(len(survivors) / eta)))
+        ranked = rank_runs(prepared, metric, maximize)
+        promoted_ids = {run.run_id for run in ranked[:n_keep]}
+        survivors = [idx for idx, run in zip(survivors, prepared) if run.run_id in promoted_ids]
+
+    return [final_runs[idx] for idx in sorted(final_runs)]
+
+
+def _metric_value(run: PreparedRun, metric: str) -> Optional[float]:
+    value = (run.metrics or {}).get(metric)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def run_tpe_optimization(runner: SweepRunner, keys: List[str], values: List[List[Any]]) -> List[PreparedRun]:
+    """
+    sequential model-based search (TPE) over the yaml grid lists instead of the full cartesian product
+    proposes sweep.batch_size configs at a time (default: one per worker) until sweep.budget backtests are spent
+    """
+    sweep_params = runner.sweep_params
+    metric = sweep_params.get("metric", "Sharpe Ratio (252 days)")
+    maximize = sweep_params.get("maximize", True)
+    budget = int(sweep_params.get("budget", 50))
+    batch_size = int(sweep_params.get("batch_size") or resolve_worker_count(sweep_params, budget))
+
+    optimizer = DiscreteTPE(
+        keys,
+        values,
+        n_startup=int(sweep_params.get("n_startup", 10)),
+        gamma=float(sweep_params.get("gamma", 0.25)),
+        seed=sweep_params.get("seed"),
+    )
+    print(f"[sweep] TPE: budget {budget} of {optimizer.space_size} combinations, batch size {batch_size}")
+
+    evaluated: List[PreparedRun] = []
+    while len(evaluated) < budget:
+        points = optimizer.ask(min(batch_size, budget - len(evaluated)))
+        if not points:
+            print("[sweep] TPE: search space exhausted")
+            break
+        prepared = [
+            runner.prepare_run(optimizer.to_params(point), extra_metrics={"trial": len(evaluated) + i})
+            for i, point in enumerate(points)
+        ]
+        runner.execute(prepared)
+        for point, run in zip(points, prepared):
+            score = _metric_value(run, metric)
+            if score is not None and not maximize:
+                score = -score
+            optimizer.tell(point, score)
+        evaluated.extend(prepared)
+
+    best = rank_runs(evaluated, metric, maximize)
+    if best and best[0].metrics is not None:
+        print(f"[sweep] TPE best: {best[0].run_id} ({metric} = {best[0].metrics.get(metric)})")
+    return evaluated
+
+
+def walk_forward_folds(start_date: Any, end_date: Any, wf_params: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    splits start..end into n_folds in-sample/out-of-sample windows
+    in-sample length = is_oos_ratio * oos length; rolling folds move the in-sample window,
+    anchored folds keep it starting at start_date
+    """
+    n_folds = int(wf_params.get("n_folds", 4))
+    ratio = float(wf_params.get("is_oos_ratio", 3))
+    anchored = bool(wf_params.get("anchored", False))
+    if n_folds < 1 or ratio <= 0:
+        raise ValueError("sweep.walk_forward: 'n_folds' >= 1 und 'is_oos_ratio' > 0 erforderlich.")
+
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    oos_len = (end - start) / (ratio + n_folds)
+    is_len = oos_len * ratio
+
+    folds = []
+    for k in range(n_folds):
+        is_start = start if anchored else start + oos_len * k
+        is_end = start + is_len + oos_len * k
+        oos_end = end if k == n_folds - 1 else is_end + oos_len
+        folds.append({
+            "is_start": is_start.isoformat(),
+            "is_end": is_end.isoformat(),
+            "oos_start": is_end.isoformat(),
+            "oos_end": oos_end.isoformat(),
+        })
+    return folds
+
+
+def stitch_equity_curves(run_dirs: List[Path], out_csv: Path) -> Optional[pd.DataFrame]:
+    """chains the total_equity curves of consecutive out-of-sample runs (each fold continues from the previous end)"""
+    pieces = []
+    level = None
+    for run_dir in run_dirs:
+        equity_csv = find_result_file(Path(run_dir) / "general" / "indicators", "total_equity")
+        if equity_csv is None:
+            print(f"[walk_forward] total_equity missing in {run_dir} -> skipped")
+            continue
+        df = read_result_file(equity_csv, columns=["timestamp", "value"]).dropna(subset=["value"])
+        df = df.sort_values("timestamp")
+        if df.empty or float(df["value"].iloc[0]) == 0:
+            continue
+        if level is not None:
+            df["value"] = df["value"] / float(df["value"].iloc[0]) * level
+        level = float(df["value"].iloc[-1])
+        pieces.append(df)
+    if not pieces:
+        return None
+    stitched = pd.concat(pieces, ignore_index=True)
+    stitched["plot_id"] = 4
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    stitched.to_csv(out_csv, index=False)
+    return stitched
+
+
+def run_walk_forward(runner: SweepRunner, combinations: List[Dict[str, Any]]) -> List[PreparedRun]:
+    """
+    walk-forward optimisation: the grid runs on every in-sample window (all folds concurrently on the pool),
+    the best config per fold (by sweep.metric) is run on the following out-of-sample window and the
+    out-of-sample equity curves are stitched into results/walk_forward/total_equity.csv
+    """
+    sweep_params = runner.sweep_params
+    metric = sweep_params.get("metric", "Sharpe Ratio (252 days)")
+    maximize = sweep_params.get("maximize", True)
+    folds = walk_forward_folds(runner.start_date, runner.end_date, sweep_params.get("walk_forward") or {})
+
+    is_runs: List[List[PreparedRun]] = []
+    for k, fold in enumerate(folds):
+        print(f"[walk_forward] Fold {k}: IS {fold['is_start']} - {fold['is_end']}, OOS until {fold['oos_end']}")
+        is_runs.append([
+            runner.prepare_run(
+                run_params,
+                start_date=fold["is_start"],
+                end_date=fold["is_end"],
+                extra_metrics={"fold": k, "phase": "IS"},
+            )
+            for run_params in combinations
+        ])
+    runner.execute([run for fold_runs in is_runs for run in fold_runs])
+
+    oos_runs: List[PreparedRun] = []
+    for k, (fold, fold_runs) in enumerate(zip(folds, is_runs)):
+        best = rank_runs(fold_runs, metric, maximize)[0]
+        if best.metrics is None:
+            print(f"[walk_forward] Fold {k}: no finished in-sample run -> skipped")
+            continue
+        print(f"[walk_forward] Fold {k}: best IS run {best.run_id} ({metric} = {best.metrics.get(metric)})")
+        oos_runs.append(runner.prepare_run(
+            best.run_params,
+            start_date=fold["oos_start"],
+            end_date=fold["oos_end"],
+            extra_metrics={"fold": k, "phase": "OOS", "is_run_id": best.run_id},
+        ))
+    runner.execute(oos_runs)
+
+    wf_dir = runner.results_dir / "walk_forward"
+    stitched = stitch_equity_curves([run.run_dir for run in oos_runs if run.metrics is not None], wf_dir / "total_equity.csv")
+    if stitched is not None:
+        print(f"[walk_forward] Stitched OOS equity written to {wf_dir / 'total_equity.csv'}")
+    if oos_runs:
+        wf_dir.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame([
+            {**folds[run.extra_metrics["fold"]], **run.extra_metrics, "oos_run_id": run.run_id, **run.run_params}
+            for run in oos_runs
+        ]).to_csv(wf_dir / "walk_forward_folds.csv", index=False)
+
+    return [run for fold_runs in is_runs for run in fold_runs] + oos_runs
@@ -0,0 +1,126 @@
+# tpe_optimizer.py
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class DiscreteTPE:
+    """
+    Tree-structured Parzen Estimator over the discrete search space defined by the yaml grid lists.
+    Every parameter keeps its candidate list; numeric lists are treated as ordinal (kernel over the
+    sorted position), everything else as categorical. Scores are always maximised.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        values: List[List[Any]],
+        n_startup: int = 10,
+        gamma: float = 0.25,
+        n_ei_candidates: int = 24,
+        prior_weight: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        self.keys = list(keys)
+        self.values = [list(v) for v in values]
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+        self.prior_weight = prior_weight
+        self.rng = np.random.default_rng(seed)
+
+        self.observations: List[Tuple[Tuple[int, ...], float]] = []
+        self.pending: set = set()
+        self.space_size = int(np.prod([len(v) for v in self.values])) if self.values else 1
+
+        # sorted position per candidate index (ordinal params only)
+        self._positions: List[Optional[np.ndarray]] = []
+        for candidates in self.values:
+            if all(isinstance(c, (int, float)) and not isinstance(c, bool) for c in candidates):
+                order = np.argsort(np.asarray(candidates, dtype=float), kind="stable")
+                positions = np.empty(len(candidates), dtype=float)
+                positions[order] = np.arange(len(candidates), dtype=float)
+                self._positions.append(positions)
+            else:
+                self._positions.append(None)
+
+    def to_params(self, indices: Tuple[int, ...]) -> Dict[str, Any]:
+        return {key: self.values[i][idx] for i, (key, idx) in enumerate(zip(self.keys, indices))}
+
+    def _seen(self) -> set:
+        return {obs for obs, _ in self.observations} | self.pending
+
+    def _random_point(self) -> Tuple[int, ...]:
+        return tuple(int(self.rng.integers(len(v))) for v in self.values)
+
+    def _density(self, param: int, group: List[Tuple[int, ...]]) -> np.ndarray:
+        """parzen estimate over the candidates of one parameter, mixed with a uniform prior"""
+        n_candidates = len(self.values[param])
+        weights = np.full(n_candidates, self.prior_weight / n_candidates)
+        positions = self._positions[param]
+        if positions is None:
+            for obs in group:
+                weights[obs[param]] += 1.0
+        else:
+            bandwidth = max(1.0, n_candidates / (len(group) + 1))
+            for obs in group:
+                weights += np.exp(-0.5 * ((positions - positions[obs[param]]) / bandwidth) ** 2)
+        return weights / weights.sum()
+
+    def _split(self) -> Tuple[List[Tuple[int, ...]], List[Tuple[int, ...]]]:
+        ranked = sorted(self.observations, key=lambda o: o[1], reverse=True)
+        n_good = max(1, int(math.ceil(self.gamma * len(ranked))))
+        good = [obs for obs, _ in ranked[:n_good]]
+        bad = [obs for obs, _ in ranked[n_good:]]
+        return good, bad
+
+    def _propose_one(self, seen: set) -> Optional[Tuple[int, ...]]:
+        if len(seen) >= self.space_size:
+            return None
+        if len(self.observations) < self.n_startup:
+            for _ in range(1000):
+                point = self._random_point()
+                if point not in seen:
+                    return point
+            return None
+
+        good, bad = self._split()
+        l_dens = [self._density(p, good) for p in range(len(self.values))]
+        g_dens = [self._density(p, bad) for p in range(len(self.values))]
+
+        best_point, best_score = None, -np.inf
+        for _ in range(self.n_ei_candidates):
+            point = tuple(int(self.rng.choice(len(l), p=l)) for l in l_dens)
+            if point in seen:
+                continue
+            score = sum(math.log(l_dens[p][i]) - math.log(g_dens[p][i]) for p, i in enumerate(point))
+            if score > best_score:
+                best_point, best_score = point, score
+        if best_point is None:
+            # all sampled candidates already evaluated -> fall back to an unexplored random point
+            for _ in range(1000):
+                point = self._random_point()
+                if point not in seen:
+                    return point
+        return best_point
+
+    def ask(self, n: int = 1) -> List[Tuple[int, ...]]:
+        """proposes up to n new, not yet evaluated configurations (as candidate index tuples)"""
+        proposals = []
+        seen = self._seen()
+        for _ in range(n):
+            point = self._propose_one(seen)
+            if point is None:
+                break
+            seen.add(point)
+            self.pending.add(point)
+            proposals.append(point)
+        return proposals
+
+    def tell(self, point: Tuple[int, ...], score: Optional[float]) -> None:
+        """records the score of an evaluated configuration (None/NaN -> counted as worst)"""
+        self.pending.discard(point)
+        if score is None or (isinstance(score, float) and math.isnan(score)):
+            score = -np.inf
+        self.observations.append((point, float(score)))
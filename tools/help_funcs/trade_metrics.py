@@ -0,0 +1,225 @@
+# trade_metrics.py
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# same keys/order as BacktestDataCollector.analyse_trades
+TRADE_METRIC_COLUMNS = [
+    "final_realized_pnl",
+    "winrate",
+    "winrate_long",
+    "winrate_short",
+    "pnl_long",
+    "pnl_short",
+    "long_short_ratio",
+    "n_trades",
+    "n_long_trades",
+    "n_short_trades",
+    "avg_win",
+    "avg_loss",
+    "max_win",
+    "max_loss",
+    "max_consecutive_wins",
+    "max_consecutive_losses",
+    "commissions",
+]
+GLOBAL_METRIC_COLUMNS = [f"global_{c}" for c in TRADE_METRIC_COLUMNS]
+
+# Money / Price values are written as e.g. "12.34 USDT"
+NUMBER_PATTERN = r"([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)"
+
+
+def _to_float(series: pd.Series) -> pd.Series:
+    """vectorized number parsing: plain numbers directly, everything else via one regex pass (unparsable -> 0)"""
+    out = pd.to_numeric(series, errors="coerce")
+    unparsed = out.isna() & series.notna()
+    if unparsed.any():
+        extracted = series[unparsed].astype(str).str.extract(NUMBER_PATTERN, expand=False)
+        out = out.astype(float)
+        out[unparsed] = pd.to_numeric(extracted, errors="coerce")
+    return out.fillna(0.0).astype(np.float64)
+
+
+def _sort_key(trades: pd.DataFrame) -> pd.Series:
+    """close time of each trade (open time for trades without close) as int64 ns"""
+    key = pd.Series(np.zeros(len(trades), dtype=np.int64), index=trades.index)
+    for col in ("timestamp", "closed_timestamp"):
+        if col not in trades.columns:
+            continue
+        values = pd.to_numeric(trades[col], errors="coerce")
+        if values.isna().all() and trades[col].notna().any():
+            dt = pd.to_datetime(trades[col], errors="coerce", utc=True)
+            values = (dt - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(1, "ns")
+        key = values.where(values.notna(), key).astype(np.int64)
+    return key
+
+
+def load_trades(run_ids: Iterable[str], results_dir: Path, instrument_ids: Iterable) -> pd.DataFrame:
+    """reads every <run_id>/<instrument>/trades.csv exactly once into one frame (+ run_id / instrument columns)"""
+    frames = []
+    instruments = [str(inst) for inst in instrument_ids]
+    for run_id in run_ids:
+        run_path = results_dir / run_id
+        if not run_path.exists():
+            continue
+        for inst in instruments:
+            trades_csv = run_path / inst / "trades.csv"
+            if not trades_csv.exists():
+                continue
+            try:
+                df_tr = pd.read_csv(trades_csv)
+            except Exception as e:
+                print(f"[trade_metrics] Failed reading {trades_csv}: {e}")
+                continue
+            if df_tr.empty:
+                continue
+            df_tr["instrument"] = inst
+            df_tr["run_id"] = run_id
+            frames.append(df_tr)
+    if not frames:
+        return pd.DataFrame(columns=["run_id", "instrument"])
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def _max_streaks(codes: np.ndarray, flags: np.ndarray, n_groups: int) -> np.ndarray:
+    """longest run of True per group via run-length encoding (rows sorted by group, then time)"""
+    out = np.zeros(n_groups, dtype=np.int64)
+    if flags.size == 0:
+        return out
+    starts = np.r_[True, (flags[1:] != flags[:-1]) | (codes[1:] != codes[:-1])]
+    start_idx = np.flatnonzero(starts)
+    lengths = np.diff(np.r_[start_idx, flags.size])
+    is_flag_run = flags[start_idx]
+    np.maximum.at(out, codes[start_idx][is_flag_run], lengths[is_flag_run])
+    return out
+
+
+def compute_trade_metrics(trades: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+    """
+    trade metrics (same definitions as BacktestDataCollector.analyse_trades) for every group in `by`,
+    e.g. ["run_id", "instrument"] per instrument or ["run_id"] over all instruments of a run
+    """
+    if trades.empty:
+        return pd.DataFrame(columns=by + TRADE_METRIC_COLUMNS).set_index(by)
+
+    pnl = _to_float(trades["realized_pnl"]) if "realized_pnl" in trades.columns else pd.Series(0.0, index=trades.index)
+    fee = _to_float(trades["fee"]) if "fee" in trades.columns else pd.Series(0.0, index=trades.index)
+    if "action" in trades.columns:
+        action = trades["action"].astype(str).str.upper()
+        is_long = action.isin(("BUY", "LONG"))
+        is_short = action.eq("SHORT")
+    else:
+        size = _to_float(trades["tradesize"]) if "tradesize" in trades.columns else pd.Series(0.0, index=trades.index)
+        is_long = size > 0
+        is_short = size < 0
+
+    win = pnl > 0
+    loss = pnl < 0
+    df = trades[by].copy()
+    df["pnl"] = pnl
+    df["fee"] = fee
+    df["win"] = win
+    df["loss"] = loss
+    df["win_pnl"] = pnl.where(win, 0.0)
+    df["loss_pnl"] = pnl.where(loss, 0.0)
+    df["is_long"] = is_long
+    df["is_short"] = is_short
+    df["long_pnl"] = pnl.where(is_long, 0.0)
+    df["short_pnl"] = pnl.where(is_short, 0.0)
+    df["long_win"] = is_long & win
+    df["short_win"] = is_short & win
+    df["_ts"] = _sort_key(trades)
+    df = df.sort_values(by + ["_ts"], kind="stable")
+
+    grouped = df.groupby(by, sort=True)
+    agg = grouped.agg(
+        final_realized_pnl=("pnl", "sum"),
+        n_trades=("pnl", "size"),
+        n_wins=("win", "sum"),
+        n_losses=("loss", "sum"),
+        sum_wins=("win_pnl", "sum"),
+        sum_losses=("loss_pnl", "sum"),
+        max_win=("win_pnl", "max"),
+        max_loss=("loss_pnl", "min"),
+        n_long_trades=("is_long", "sum"),
+        n_short_trades=("is_short", "sum"),
+        pnl_long=("long_pnl", "sum"),
+        pnl_short=("short_pnl", "sum"),
+        long_wins=("long_win", "sum"),
+        short_wins=("short_win", "sum"),
+        commissions=("fee", "sum"),
+    )
+
+    codes = grouped.ngroup().to_numpy()
+    n_long = agg["n_long_trades"].to_numpy(dtype=float)
+    n_short = agg["n_short_trades"].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        agg["winrate"] = np.where(agg["n_trades"] > 0, agg["n_wins"] / agg["n_trades"], 0.0)
+        agg["winrate_long"] = np.where(n_long > 0, agg["long_wins"] / n_long, 0.0)
+        agg["winrate_short"] = np.where(n_short > 0, agg["short_wins"] / n_short, 0.0)
+        agg["long_short_ratio"] = np.where(n_short > 0, n_long / n_short, np.where(n_long > 0, np.inf, 0.0))
+        agg["avg_win"] = np.where(agg["n_wins"] > 0, agg["sum_wins"] / agg["n_wins"], 0.0)
+        agg["avg_loss"] = np.where(agg["n_losses"] > 0, agg["sum_losses"] / agg["n_losses"], 0.0)
+    agg["max_consecutive_wins"] = _max_streaks(codes, df["win"].to_numpy(), len(agg))
+    agg["max_consecutive_losses"] = _max_streaks(codes, df["loss"].to_numpy(), len(agg))
+
+    for col in ("n_trades", "n_long_trades", "n_short_trades"):
+        agg[col] = agg[col].astype(np.int64)
+    return agg[TRADE_METRIC_COLUMNS]
+
+
+def write_run_trade_files(trades: pd.DataFrame, per_instrument: pd.DataFrame, results_dir: Path) -> None:
+    """all_trades.csv per run + trade_metrics.csv for instruments that have none yet (collector normally writes it)"""
+    if trades.empty:
+        return
+    sort_col = "timestamp" if "timestamp" in trades.columns else None
+    for run_id, df_run in trades.groupby("run_id", sort=False):
+        run_path = results_dir / run_id
+        combined = df_run.drop(columns="run_id")
+        if sort_col:
+            combined = combined.sort_values(sort_col, kind="stable")
+        try:
+            combined.to_csv(run_path / "all_trades.csv", index=False)
+        except Exception as e:
+            print(f"[trade_metrics] Failed writing combined trades for {run_id}: {e}")
+
+    for record in per_instrument.reset_index().to_dict("records"):
+        run_id, inst = record.pop("run_id"), record.pop("instrument")
+        metrics_csv = results_dir / run_id / inst / "trade_metrics.csv"
+        if not metrics_csv.exists():
+            pd.DataFrame([record]).to_csv(metrics_csv, index=False)
+            print(f"[trade_metrics] Created {metrics_csv}")
+
+
+def compute_global_trade_metrics(
+    run_ids: List[str],
+    results_dir: Path,
+    instrument_ids: Iterable,
+    trades: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """global_* metrics per run (exact, from all trades of the run), indexed by run_id"""
+    if trades is None:
+        trades = load_trades(run_ids, results_dir, instrument_ids)
+    per_run = compute_trade_metrics(trades, ["run_id"])
+    per_run.columns = GLOBAL_METRIC_COLUMNS
+    # runs without a single trade still get zeros
+    existing = [run_id for run_id in run_ids if (results_dir / run_id).exists()]
+    per_run = per_run.reindex(per_run.index.union(pd.Index(existing, name="run_id")))
+    return per_run.fillna(0.0)
+
+
+def merge_trade_metrics(df_all: pd.DataFrame, results_dir: Path, instrument_ids: Iterable) -> pd.DataFrame:
+    """loads the trades of all runs in df_all once, writes the per-run trade files and joins the global metrics"""
+    if "run_id" not in df_all.columns:
+        print("[trade_metrics] run_id column missing in summary -> skipped")
+        return df_all
+    run_ids = df_all["run_id"].astype(str).tolist()
+    trades = load_trades(run_ids, results_dir, instrument_ids)
+    per_instrument = compute_trade_metrics(trades, ["run_id", "instrument"])
+    write_run_trade_files(trades, per_instrument, results_dir)
+
+    global_metrics = compute_global_trade_metrics(run_ids, results_dir, instrument_ids, trades=trades)
+    df_all = df_all.drop(columns=[c for c in GLOBAL_METRIC_COLUMNS if c in df_all.columns])
+    return df_all.join(global_metrics, on="run_id")
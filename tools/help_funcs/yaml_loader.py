@@ -4,6 +4,9 @@ import os
 import csv
 from typing import List, Dict, Any, Tuple
 
+# top-level sections that configure the runner itself and never enter the grid or the strategy config
+NON_GRID_KEYS = ("instruments", "data_sources", "sweep")
+
 
 def load_params(yaml_path: str) -> Dict[str, Any]:
     """loads yaml file, returns empty dict if file is empty"""
@@ -286,14 +289,14 @@ def load_and_split_params(yaml_path: str) -> Tuple[
     
     # Find top-level grid parameters
     for k, v in params.items():
-        if k in ("instruments", "data_sources"):
+        if k in NON_GRID_KEYS:
             continue
         if isinstance(v, list) and len(v) > 1:
             param_grid[k] = v
     
     # Find nested grid parameters
     for k, v in params.items():
-        if k in ("instruments", "data_sources"):
+        if k in NON_GRID_KEYS:
             continue
         if isinstance(v, dict):
             nested_params = _find_nested_grid_params(v, k)
@@ -308,7 +311,7 @@ def load_and_split_params(yaml_path: str) -> Tuple[
     temp_params = copy.deepcopy(params)
     
     for k, v in temp_params.items():
-        if k in ("instruments", "data_sources"):
+        if k in NON_GRID_KEYS:
             continue
         
         if k in param_grid:
@@ -1,23 +1,58 @@
+import math
+import threading
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from arch import arch_model
 from collections import deque
+from tools.help_funcs.rolling_stats import RollingQuantile
 
 class GARCH:
-    def __init__(self, returns: pd.Series, window: int = 500):
-        self.returns = self.fix_returns_scale(returns.dropna())
+    """
+    GARCH(p,q) volatility. fit() estimates on a returns series; update() streams one close per bar:
+    parameters are re-estimated every refit_every bars (optionally in a background thread), in between
+    the conditional variance is propagated recursively in O(1)
+    """
+    def __init__(self, returns: pd.Series = None, window: int = 500, p: int = 1, q: int = 1,
+                 refit_every: int = 100, min_fit_bars: int = 100, background_refit: bool = False):
+        returns = pd.Series(dtype=float) if returns is None else returns.dropna()
+        self.returns = self.fix_returns_scale(returns)
         self.window = window
+        self.p = p
+        self.q = q
+        self.refit_every = max(1, int(refit_every))
+        self.min_fit_bars = min_fit_bars
+        self.background_refit = background_refit
         self.model = None
         self.result = None
 
+        # streaming state (raw log returns, scaled at fit time)
+        self.returns_window = deque(returns.tolist()[-window:], maxlen=window)
+        self.scale = 1
+        self.params = None
+        self._resid_sq = deque(maxlen=p)      # last p squared residuals, newest last
+        self._variances = deque(maxlen=q)     # last q conditional variances, newest last
+        self._bars_since_fit = 0
+        self.current_volatility = None
+
+        self._fit_lock = threading.Lock()
+        self._fit_thread = None
+        self._pending_fit = None              # (result, scale) from the background thread
+        self._returns_since_snapshot = []
+
     @staticmethod
-    def fix_returns_scale(returns):
+    def _scale_factor(returns):
         mean_abs = abs(returns).mean()
         scale = 1
         if mean_abs < 1:
             scale = int(1 / mean_abs)
-        return returns * scale
+        return scale
+
+    @staticmethod
+    def fix_returns_scale(returns):
+        if len(returns) == 0:
+            return returns
+        return returns * GARCH._scale_factor(returns)
 
     def fit(self, p=1, q=1):
         if len(self.returns) > self.window:
@@ -28,17 +63,103 @@ class GARCH:
         self.result = self.model.fit(disp='off')
         return self.result
     
+    @staticmethod
+    def _fit_window(returns, p, q):
+        """MLE fit on a snapshot of the returns window, returns (result, scale)"""
+        returns_series = pd.Series(returns)
+        scale = GARCH._scale_factor(returns_series)
+        model = arch_model(returns_series * scale, vol='Garch', p=p, q=q)
+        return model.fit(disp='off'), scale
+
+    def _apply_fit(self, result, scale, replay=()):
+        """takes over fitted parameters + last variance state, then propagates returns observed after the snapshot"""
+        self.result = result
+        self.scale = scale
+        params = result.params
+        self.params = {
+            "mu": float(params.get("mu", 0.0)),
+            "omega": float(params["omega"]),
+            "alpha": [float(params[f"alpha[{i}]"]) for i in range(1, self.p + 1)],
+            "beta": [float(params[f"beta[{i}]"]) for i in range(1, self.q + 1)],
+        }
+        resid = np.asarray(result.resid, dtype=float)
+        variances = np.asarray(result.conditional_volatility, dtype=float) ** 2
+        self._resid_sq = deque((resid[-self.p:] ** 2).tolist(), maxlen=self.p)
+        self._variances = deque(variances[-self.q:].tolist(), maxlen=self.q)
+        self.current_volatility = float(math.sqrt(variances[-1]))
+        for ret in replay:
+            self._propagate(ret)
+        self._bars_since_fit = len(replay)
+
+    def _propagate(self, ret):
+        """O(1) GARCH recursion: sigma²_t = omega + Σ alpha_i eps²_(t-i) + Σ beta_j sigma²_(t-j)"""
+        par = self.params
+        variance = par["omega"]
+        for alpha, resid_sq in zip(par["alpha"], reversed(self._resid_sq)):
+            variance += alpha * resid_sq
+        for beta, prev_var in zip(par["beta"], reversed(self._variances)):
+            variance += beta * prev_var
+        eps = ret * self.scale - par["mu"]
+        self._resid_sq.append(eps * eps)
+        self._variances.append(variance)
+        self.current_volatility = math.sqrt(max(variance, 0.0))
+
+    def _start_background_fit(self):
+        snapshot = list(self.returns_window)
+        self._returns_since_snapshot = []
+
+        def _worker():
+            try:
+                fitted = self._fit_window(snapshot, self.p, self.q)
+            except Exception:
+                fitted = None
+            with self._fit_lock:
+                self._pending_fit = fitted
+
+        self._fit_thread = threading.Thread(target=_worker, daemon=True)
+        self._fit_thread.start()
+
+    def _take_pending_fit(self):
+        """applies a finished background fit (True), clears a failed one"""
+        alive = self._fit_thread.is_alive()
+        with self._fit_lock:
+            fitted, self._pending_fit = self._pending_fit, None
+        if fitted is None:
+            if not alive:
+                # fit failed -> keep the old parameters, retry at the next bar
+                self._fit_thread = None
+                self._returns_since_snapshot = []
+            return False
+        self._fit_thread = None
+        replay, self._returns_since_snapshot = self._returns_since_snapshot, []
+        self._apply_fit(*fitted, replay=replay)
+        return True
+
+    def _refit_due(self):
+        return len(self.returns_window) >= self.min_fit_bars and (
+            self.params is None or self._bars_since_fit >= self.refit_every
+        )
+
     def update(self, close, prev_close):
-        if prev_close is not None:
-            ret = np.log(float(close) / float(prev_close))
-            self.returns_window.append(ret)
-            returns_series = pd.Series(self.returns_window)
-            returns_series = self.fix_returns_scale(returns_series)
-            self.model = arch_model(returns_series, vol='Garch', p=self.p, q=self.q)
-            self.result = self.model.fit(disp='off')
-            self.current_volatility = self.result.conditional_volatility.iloc[-1]
-        else:
-            self.current_volatility = None
+        if prev_close is None:
+            return
+        ret = math.log(float(close) / float(prev_close))
+        self.returns_window.append(ret)
+
+        applied = False
+        if self._fit_thread is not None:
+            # background fit in flight: returns after its snapshot are replayed once it is done
+            self._returns_since_snapshot.append(ret)
+            applied = self._take_pending_fit()
+        if not applied and self.params is not None:
+            self._propagate(ret)
+            self._bars_since_fit += 1
+
+        if self._fit_thread is None and self._refit_due():
+            if self.background_refit:
+                self._start_background_fit()
+            else:
+                self._apply_fit(*self._fit_window(list(self.returns_window), self.p, self.q))
 
     def get_volatility(self):
         return self.current_volatility
@@ -58,15 +179,20 @@ class GARCH:
         forecast = self.result.forecast(horizon=steps)
         return np.sqrt(forecast.variance.iloc[-1])
     
+class GarchVolaWindow(RollingQuantile):
+    """rolling window of volatilities, quantile from the sorted buckets instead of pd.Series per bar"""
+
+
 def update_garch_vola_window(window, current_vola, maxlen):
     if window is None:
-        window = deque(maxlen=maxlen)
+        window = GarchVolaWindow(maxlen)
     if current_vola is not None:
         window.append(current_vola)
     return window
 
 def get_garch_vola_threshold(window, quantile=0.8, min_bars=200):
     if window is not None and len(window) >= min_bars:
-        vola_series = pd.Series(window)
-        return vola_series.quantile(quantile)
+        if isinstance(window, GarchVolaWindow):
+            return window.quantile(quantile)
+        return pd.Series(window).quantile(quantile)
     return None
\ No newline at end of file
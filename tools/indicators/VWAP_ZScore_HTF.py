@@ -1,7 +1,55 @@
+import math
 import numpy as np
 from collections import deque
 import datetime
 from typing import Optional, Tuple
+from tools.help_funcs.batch_utils import iter_bars
+
+
+class _RunningVWAPStats:
+    """Σpv / Σv for the VWAP and Welford mean / M2 of the price for the z-score std, O(1) add and remove"""
+    __slots__ = ("count", "sum_pv", "sum_v", "mean", "m2")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.sum_pv = 0.0
+        self.sum_v = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, price: float, volume: float):
+        self.count += 1
+        self.sum_pv += price * volume
+        self.sum_v += volume
+        delta = price - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (price - self.mean)
+
+    def remove(self, price: float, volume: float):
+        self.count -= 1
+        if self.count == 0:
+            self.reset()
+            return
+        self.sum_pv -= price * volume
+        self.sum_v -= volume
+        delta = price - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (price - self.mean)
+
+    def vwap(self) -> Optional[float]:
+        if self.count == 0 or self.sum_v == 0:
+            return None
+        return self.sum_pv / self.sum_v
+
+    def std(self) -> float:
+        # sample std (ddof=1) like np.std(prices, ddof=1)
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+
 
 class VWAPZScoreHTFAnchored:
     def __init__(
@@ -18,6 +66,9 @@ class VWAPZScoreHTFAnchored:
         log_callback = None,  # Add logging callback
         **kwargs
     ):
+        # constructor arguments, compute_batch replays on a fresh instance with the same settings
+        self._init_kwargs = {k: v for k, v in locals().items() if k not in ("self", "kwargs", "__class__")}
+        self._init_kwargs.update(kwargs)
         self.anchor_method = anchor_method
         self.anchor_on_kalman_cross = anchor_method == "kalman_cross"
         self.rolling_window_bars = rolling_window_bars
@@ -36,11 +87,14 @@ class VWAPZScoreHTFAnchored:
         self.last_week = None
         
         self.rolling_price_volume_data = deque(maxlen=rolling_window_bars)
+        # running sums of the rolling window; rebuilt from the deque once per window to cancel subtraction drift
+        self.rolling_stats = _RunningVWAPStats()
+        self._rolling_evictions = 0
         
         self.current_segment = {
             'start_bar': 0,
             'anchor_reason': 'initial',
-            'price_volume_data': [],
+            'stats': _RunningVWAPStats(),
             'bars_in_segment': 0,
             'vwap_value': None
         }
@@ -175,7 +229,7 @@ class VWAPZScoreHTFAnchored:
         self.current_segment = {
             'start_bar': self.total_bar_count,
             'anchor_reason': reason,
-            'price_volume_data': [],
+            'stats': _RunningVWAPStats(),
             'bars_in_segment': 0,
             'vwap_value': None
         }
@@ -194,37 +248,36 @@ class VWAPZScoreHTFAnchored:
             self.gap_offsets = []
             self.cumulative_gap = 0.0
 
+    def _active_stats(self) -> _RunningVWAPStats:
+        return self.rolling_stats if self.anchor_method == "rolling" else self.current_segment['stats']
+
+    def _append_rolling(self, adj_price: float, adj_volume: float, price: float, volume: float):
+        window = self.rolling_price_volume_data
+        if len(window) == window.maxlen:
+            evicted_price, evicted_volume, _, _ = window[0]
+            self.rolling_stats.remove(evicted_price, evicted_volume)
+            self._rolling_evictions += 1
+        window.append((adj_price, adj_volume, price, volume))
+        self.rolling_stats.add(adj_price, adj_volume)
+        if self._rolling_evictions >= window.maxlen:
+            self.rolling_stats.reset()
+            for p, v, _, _ in window:
+                self.rolling_stats.add(p, v)
+            self._rolling_evictions = 0
+
     def _calculate_segment_vwap(self) -> Optional[float]:
-        if self.anchor_method == "rolling":
-            if not self.rolling_price_volume_data:
-                return None
-            total_pv = sum(adj_price * adj_volume for adj_price, adj_volume, _, _ in self.rolling_price_volume_data)
-            total_volume = sum(adj_volume for _, adj_volume, _, _ in self.rolling_price_volume_data)
-        else:
-            if not self.current_segment['price_volume_data']:
-                return None
-            total_pv = sum(adj_price * adj_volume for adj_price, adj_volume, _, _ in self.current_segment['price_volume_data'])
-            total_volume = sum(adj_volume for _, adj_volume, _, _ in self.current_segment['price_volume_data'])
-        
-        if total_volume == 0:
-            return None
-            
-        return total_pv / total_volume
+        return self._active_stats().vwap()
 
     def _calculate_simple_zscore(self, current_price: float, vwap_value: float, asymmetric_offset: float = 0.0) -> float:
-        if self.anchor_method == "rolling":
-            price_data = [price for price, _, _, _ in self.rolling_price_volume_data]
-        else:
-            price_data = [price for price, _, _, _ in self.current_segment['price_volume_data']]
-            
-        bars_available = len(price_data)
+        stats = self._active_stats()
+        bars_available = stats.count
         
         # More aggressive early ZScore calculation - allow calculation from bar 2 onwards
         if bars_available < 2:
             base_zscore = 0.0
         else:
             # Calculate standard deviation
-            std_price = np.std(price_data, ddof=1) if bars_available > 1 else abs(current_price - vwap_value)
+            std_price = stats.std()
             
             # Ultra-aggressive scaling that starts immediately with substantial values
             if bars_available < 10:
@@ -314,7 +367,7 @@ class VWAPZScoreHTFAnchored:
         adj_open = float(bar.open) - offset
         
         if self.anchor_method == "rolling":
-            self.rolling_price_volume_data.append((adj_price, adj_volume, price, volume))
+            self._append_rolling(adj_price, adj_volume, price, volume)
         else:
             should_anchor, anchor_reason = self._should_anchor_new_segment(bar, adj_price, adj_open)
             
@@ -335,8 +388,7 @@ class VWAPZScoreHTFAnchored:
                         avg_rth_volume = np.mean(self.rth_session_volumes) if self.rth_session_volumes else volume
                         adj_volume = avg_rth_volume
             
-            bars_before = self.current_segment['bars_in_segment']
-            self.current_segment['price_volume_data'].append((adj_price, adj_volume, price, volume))
+            self.current_segment['stats'].add(adj_price, adj_volume)
             self.current_segment['bars_in_segment'] += 1
 
         vwap_value = self._calculate_segment_vwap()
@@ -408,5 +460,24 @@ class VWAPZScoreHTFAnchored:
     def reset_kalman_state(self):
         self.last_price_above_kalman = None
 
+    def compute_batch(self, ohlcv_arrays, asymmetric_offset: float = 0.0, kalman_exit_mean=None, exit_trades=None) -> dict:
+        """
+        vwap / zscore series of a fresh instance with the same settings (None -> NaN). The anchoring logic
+        (gaps, RTH volume, kalman crosses, grace period) is sequential, so the O(1) update path is replayed on
+        plain float records instead of Nautilus bars; kalman_exit_mean / exit_trades are optional per-bar arrays
+        """
+        indicator = type(self)(**self._init_kwargs)
+        vwaps = []
+        zscores = []
+        for i, bar in enumerate(iter_bars(ohlcv_arrays)):
+            if kalman_exit_mean is not None and kalman_exit_mean[i] == kalman_exit_mean[i]:
+                indicator.set_kalman_exit_mean(float(kalman_exit_mean[i]))
+            if exit_trades is not None and exit_trades[i]:
+                indicator.notify_exit_trade_occurred()
+            vwap_value, zscore = indicator.update(bar, asymmetric_offset)
+            vwaps.append(np.nan if vwap_value is None else vwap_value)
+            zscores.append(np.nan if zscore is None else zscore)
+        return {"vwap": np.asarray(vwaps, dtype=np.float64), "zscore": np.asarray(zscores, dtype=np.float64)}
+
 # Backward compatibility alias
 VWAPZScoreHTF = VWAPZScoreHTFAnchored
\ No newline at end of file
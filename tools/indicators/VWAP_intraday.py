@@ -1,14 +1,13 @@
 from nautilus_trader.indicators.vwap import VolumeWeightedAveragePrice
 import numpy as np
 import pandas as pd
+from tools.help_funcs.batch_utils import ohlcv_column, segment_cumsum, segment_starts, timestamps
 
 class VWAPIntraday:
     def __init__(self):
         self.vwap = VolumeWeightedAveragePrice()
-        self.prices = []
-        self.volumes = []
-        self.weighted_prices = []
         self.last_day = None
+        self._reset_band_sums()
         
         # VWAP extremes tracking state
         self.bars_above_long_band = 0
@@ -28,9 +27,7 @@ class VWAPIntraday:
         # Check for new day to reset our data
         current_day = pd.Timestamp(bar.ts_init, tz="UTC").day
         if self.last_day is not None and current_day != self.last_day:
-            self.prices.clear()
-            self.volumes.clear()
-            self.weighted_prices.clear()
+            self._reset_band_sums()
             # Reset VWAP extremes tracking on new day
             self.reset_extremes_tracking()
         self.last_day = current_day
@@ -40,33 +37,56 @@ class VWAPIntraday:
         volume = bar.volume.as_double()
         
         if volume > 0:
-            self.prices.append(typical_price)
-            self.volumes.append(volume)
-            self.weighted_prices.append(typical_price * volume)
+            self._add_band_sums(typical_price, volume)
         
         # Track VWAP extremes after updating data - ONLY during RTH
         if is_rth:
             self._track_vwap_extremes(bar.close.as_double())
     
+    def _reset_band_sums(self):
+        # running Σv, Σv·p, Σv·p² of today's typical prices, p relative to the first price of the day
+        self.bar_count = 0
+        self._reference_price = None
+        self._sum_v = 0.0
+        self._sum_vp = 0.0
+        self._sum_vpp = 0.0
+        self._band_stats = None
+
+    def _add_band_sums(self, typical_price: float, volume: float):
+        if self._reference_price is None:
+            self._reference_price = typical_price
+        shifted = typical_price - self._reference_price
+        self.bar_count += 1
+        self._sum_v += volume
+        self._sum_vp += volume * shifted
+        self._sum_vpp += volume * shifted * shifted
+        self._band_stats = None
+
+    def _get_band_stats(self):
+        """(band vwap, volume-weighted std) of today, computed once per bar and shared by all multipliers"""
+        if self._band_stats is None:
+            if self.bar_count < 2 or self._sum_v == 0:
+                return None
+            mean_shifted = self._sum_vp / self._sum_v
+            weighted_variance = max(self._sum_vpp / self._sum_v - mean_shifted * mean_shifted, 0.0)
+            self._band_stats = (self._reference_price + mean_shifted, np.sqrt(weighted_variance))
+        return self._band_stats
+
     def get_bands(self, multiplier=1.0):
         """returns (vwap, upper_band, lower_band)"""
-        if len(self.prices) < 2 or sum(self.volumes) == 0:
+        stats = self._get_band_stats()
+        if stats is None:
             return self.value, None, None
-            
-        # Calculate volume-weighted variance
-        total_volume = sum(self.volumes)
-        vwap_value = sum(self.weighted_prices) / total_volume
-        
-        weighted_variance = sum(
-            vol * (price - vwap_value) ** 2 
-            for price, vol in zip(self.prices, self.volumes)
-        ) / total_volume
-        
-        std_dev = np.sqrt(weighted_variance)
-        upper_band = vwap_value + (multiplier * std_dev)
-        lower_band = vwap_value - (multiplier * std_dev)
-        
-        return self.value, upper_band, lower_band
+        vwap_value, std_dev = stats
+        return self.value, vwap_value + (multiplier * std_dev), vwap_value - (multiplier * std_dev)
+
+    def get_bands_multi(self, multipliers=(1.0, 2.0, 3.0)):
+        """returns {multiplier: (upper_band, lower_band)} from one variance calculation"""
+        stats = self._get_band_stats()
+        if stats is None:
+            return {m: (None, None) for m in multipliers}
+        vwap_value, std_dev = stats
+        return {m: (vwap_value + m * std_dev, vwap_value - m * std_dev) for m in multipliers}
     
     @property
     def value(self):
@@ -134,3 +154,39 @@ class VWAPIntraday:
             'bars_above_long_band': self.bars_above_long_band,
             'bars_below_short_band': self.bars_below_short_band
         }
+
+    def compute_batch(self, ohlcv_arrays, multiplier: float = 1.0) -> dict:
+        """
+        vwap / upper / lower band series like get_bands(multiplier) after each update(bar) of a fresh instance
+        (day reset on ts_init day, zero-volume bars skipped); vwap is the typical-price vwap of the band calculation
+        """
+        high = ohlcv_column(ohlcv_arrays, "high")
+        low = ohlcv_column(ohlcv_arrays, "low")
+        close = ohlcv_column(ohlcv_arrays, "close")
+        volume = ohlcv_column(ohlcv_arrays, "volume")
+        days = pd.DatetimeIndex(pd.to_datetime(timestamps(ohlcv_arrays, prefer="ts_init"), unit="ns", utc=True)).day.to_numpy()
+        starts = segment_starts(days)
+
+        typical = (high + low + close) / 3.0
+        used = volume > 0
+        vol = np.where(used, volume, 0.0)
+        # prices relative to the first price of the day keep Σv·p² well conditioned
+        reference = typical[np.flatnonzero(starts)][np.cumsum(starts) - 1]
+        shifted = np.where(used, typical - reference, 0.0)
+
+        count = segment_cumsum(used.astype(np.float64), starts)
+        sum_v = segment_cumsum(vol, starts)
+        sum_vp = segment_cumsum(vol * shifted, starts)
+        sum_vpp = segment_cumsum(vol * shifted * shifted, starts)
+
+        valid = (count >= 2) & (sum_v > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_shifted = sum_vp / sum_v
+            variance = np.maximum(sum_vpp / sum_v - mean_shifted * mean_shifted, 0.0)
+        vwap = np.where(sum_v > 0, reference + mean_shifted, np.nan)
+        std_dev = np.sqrt(variance)
+        return {
+            "vwap": vwap,
+            "upper": np.where(valid, vwap + multiplier * std_dev, np.nan),
+            "lower": np.where(valid, vwap - multiplier * std_dev, np.nan),
+        }
@@ -1,5 +1,19 @@
 import numpy as np
 from collections import deque
+from tools.help_funcs.rolling_stats import RollingSlope, RollingVariance
+from tools.help_funcs.batch_utils import maybe_njit, ohlcv_column, rolling_windows
+
+
+@maybe_njit
+def _kalman_mean_kernel(values, start, mean, var, process_var, measurement_var):
+    means = np.full(len(values), np.nan)
+    for i in range(start, len(values)):
+        pred_var = var + process_var
+        gain = pred_var / (pred_var + measurement_var)
+        mean = mean + gain * (values[i] - mean)
+        var = (1 - gain) * pred_var
+        means[i] = mean
+    return means
 
 class KalmanFilterRegressionWithZScore:
     def __init__(
@@ -13,16 +27,20 @@ class KalmanFilterRegressionWithZScore:
     ):
         self.process_var = process_var
         self.measurement_var = measurement_var
+        self._initial_state = (initial_state_mean, initial_state_covariance)
         self.mean = initial_state_mean
         self.var = initial_state_covariance
         self.initialized = False if initial_state_mean is None else True
         self.window = []
         self.window_size = window
-        self.buffer = deque(maxlen=window)  # Für Regression
+        # Für Regression: Slope aus laufenden Summen statt np.polyfit pro Bar
+        self._slope = RollingSlope(window)
+        self.buffer = self._slope.values
         
-        # Für Z-Score vom Kalman Mean (echte Distanz)
+        # Für Z-Score vom Kalman Mean (echte Distanz), Std aus laufender Varianz
         self.zscore_window = zscore_window
-        self.kalman_distance_history = deque(maxlen=zscore_window)
+        self._distance_stats = RollingVariance(zscore_window)
+        self.kalman_distance_history = self._distance_stats.values
         self.current_kalman_mean = None
 
     def update(self, value: float, calculate_zscore: bool = True):
@@ -44,16 +62,9 @@ class KalmanFilterRegressionWithZScore:
         self.var = (1 - K) * pred_var
         self.current_kalman_mean = self.mean
 
-        # Buffer für Regression aktualisieren
-        self.buffer.append(self.mean)
-        
-        # Slope per Regression berechnen
-        if len(self.buffer) >= 2:
-            y = np.array(self.buffer)
-            x = np.arange(len(y))
-            slope = np.polyfit(x, y, 1)[0]
-        else:
-            slope = 0.0
+        # Buffer für Regression aktualisieren + Slope per Regression (O(1))
+        self._slope.append(self.mean)
+        slope = self._slope.slope()
 
         # Z-Score berechnung - EINFACHE Distanz zum Kalman Mean in Standardabweichungen
         # Z-Score = 0 wenn Preis EXAKT auf Kalman Mean ist
@@ -62,12 +73,12 @@ class KalmanFilterRegressionWithZScore:
 
             # Sammle die absoluten Distanzen für Standardabweichung (ohne Vorzeichen)
             abs_distance = abs(value - self.current_kalman_mean)
-            self.kalman_distance_history.append(abs_distance)
+            self._distance_stats.append(abs_distance)
             
             # Benötigen mindestens 5 Datenpunkte für Standardabweichung
             if len(self.kalman_distance_history) >= 5:
                 # Berechne die durchschnittliche absolute Distanz (Standardabweichung der Distanzen)
-                distance_std = np.std(list(self.kalman_distance_history), ddof=1)
+                distance_std = self._distance_stats.std(ddof=1)
                 
                 if distance_std > 0.0001:  # Vermeide Division durch Null
                     # EINFACHER Z-Score: Aktuelle Distanz / Standard-Distanz
@@ -87,8 +98,8 @@ class KalmanFilterRegressionWithZScore:
         self.var = 1.0
         self.initialized = False
         self.window = []
-        self.buffer.clear()
-        self.kalman_distance_history.clear()
+        self._slope.clear()
+        self._distance_stats.clear()
         self.current_kalman_mean = None
 
     def is_initialized(self) -> bool:
@@ -98,8 +109,55 @@ class KalmanFilterRegressionWithZScore:
         return self.mean, self.var
 
     def get_regression_slope(self):
-        if len(self.buffer) >= 2:
-            y = np.array(self.buffer)
-            x = np.arange(len(y))
-            return np.polyfit(x, y, 1)[0]
-        return 0.0
\ No newline at end of file
+        return self._slope.slope()
+
+    def compute_batch(self, ohlcv_arrays, calculate_zscore: bool = True) -> dict:
+        """
+        mean / slope / zscore series of a fresh filter with these parameters over a close array
+        (or ohlcv_arrays["close"]), same values as calling update() per bar; None -> NaN
+        """
+        values = ohlcv_arrays if isinstance(ohlcv_arrays, np.ndarray) else ohlcv_column(ohlcv_arrays, "close")
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        n = len(values)
+        init_mean, init_var = self._initial_state
+        slopes = np.zeros(n)
+        zscores = np.full(n, np.nan)
+
+        if init_mean is None:
+            init_end = self.window_size - 1  # bar that completes the initialisation window
+            if n <= init_end:
+                return {"mean": np.full(n, np.nan), "slope": slopes, "zscore": zscores}
+            init_mean = float(np.mean(values[:self.window_size]))
+            first = init_end + 1
+        else:
+            first = 0
+        means = _kalman_mean_kernel(values, first, float(init_mean), float(init_var), self.process_var, self.measurement_var)
+        if first > 0:
+            means[first - 1] = init_mean
+        filtered_means = means[first:]
+        filtered_values = values[first:]
+
+        # slope: np.polyfit(range(len), buffer, 1)[0] over the growing, then full regression buffer
+        w = self.window_size
+        for i in range(1, min(w - 1, len(filtered_means))):
+            slopes[first + i] = np.polyfit(np.arange(i + 1), filtered_means[:i + 1], 1)[0]
+        x_centered = np.arange(w) - (w - 1) / 2.0
+        sxx = float(x_centered @ x_centered)
+        for row, windows in rolling_windows(filtered_means, w):
+            slopes[first + row:first + row + len(windows)] = windows @ x_centered / sxx if w >= 2 else 0.0
+
+        if calculate_zscore:
+            distances = np.abs(filtered_values - filtered_means)
+            stds = np.full(len(distances), np.nan)
+            zw = self.zscore_window
+            for i in range(4, min(zw - 1, len(distances))):
+                stds[i] = np.std(distances[:i + 1], ddof=1)
+            for row, windows in rolling_windows(distances, zw):
+                if zw >= 5:
+                    stds[row:row + len(windows)] = windows.std(axis=1, ddof=1)
+            has_std = ~np.isnan(stds)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                raw = np.clip((filtered_values - filtered_means) / stds, -80.0, 80.0)
+            zscores[first:] = np.where(has_std, np.where(stds > 0.0001, raw, 0.0), np.nan)
+
+        return {"mean": means, "slope": slopes, "zscore": zscores}
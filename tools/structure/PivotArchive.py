@@ -1,8 +1,11 @@
 
 from dataclasses import dataclass
 from typing import Optional, List
+import numpy as np
+import pandas as pd
 from nautilus_trader.model.data import Bar
 from nautilus_trader.indicators.swings import Swings
+from tools.help_funcs.batch_utils import ohlcv_column, timestamps
 
 
 @dataclass
@@ -14,6 +17,7 @@ class SwingPoint:
 
 class PivotArchive:
     def __init__(self, strength: int = 5):
+        self.strength = strength
         self.swings = Swings(period=strength)
         self.last_high_value = None
         self.last_low_value = None
@@ -45,12 +49,10 @@ class PivotArchive:
     def update(self, bar: Bar) -> bool:
         # Always feed Nautilus for initial swing detection
         self.swings.handle_bar(bar)
-        
+        return self._update_levels(float(bar.high), float(bar.low), int(bar.ts_event))
+
+    def _update_levels(self, bar_high: float, bar_low: float, timestamp: int) -> bool:
         # Store EVERY high and low from this candle for our own tracking
-        bar_high = float(bar.high)
-        bar_low = float(bar.low)
-        timestamp = int(bar.ts_event)
-        
         # Add to our complete records (keep last 300)
         high_point = SwingPoint(bar_high, timestamp, True)
         low_point = SwingPoint(bar_low, timestamp, False)
@@ -63,7 +65,7 @@ class PivotArchive:
         
         # Phase 1: Try to get initial critical points from Nautilus swings
         if not self.nautilus_initialized:
-            if self._initialize_from_nautilus_swings(bar):
+            if self._initialize_from_nautilus_swings(timestamp):
                 return True 
             return False
         
@@ -118,8 +120,8 @@ class PivotArchive:
         
         return changed
     
-    def _initialize_from_nautilus_swings(self, bar: Bar) -> bool:
-        new_swing = self._get_new_swing(bar)
+    def _initialize_from_nautilus_swings(self, timestamp: int) -> bool:
+        new_swing = self._get_new_swing(timestamp)
         if new_swing:
             if new_swing.is_high and len(self.critical_highs) == 0:
                 self.critical_highs.append(new_swing)
@@ -139,17 +141,17 @@ class PivotArchive:
                 return True
         return False
 
-    def _get_new_swing(self, bar: Bar) -> Optional[SwingPoint]:
+    def _get_new_swing(self, timestamp: int) -> Optional[SwingPoint]:
         if (self.swings.changed and self.swings.direction == 1 and 
             self.last_high_value != self.swings.high_price):
             self.last_high_value = self.swings.high_price
-            return SwingPoint(float(self.swings.high_price), int(bar.ts_event), True)
+            return SwingPoint(float(self.swings.high_price), timestamp, True)
             
         # Check for new swing low  
         elif (self.swings.changed and self.swings.direction == -1 and 
               self.last_low_value != self.swings.low_price):
             self.last_low_value = self.swings.low_price
-            return SwingPoint(float(self.swings.low_price), int(bar.ts_event), False)
+            return SwingPoint(float(self.swings.low_price), timestamp, False)
         
         return None
 
@@ -222,3 +224,45 @@ class PivotArchive:
         self.lowest_low = None
         self.initialized = False
         self.nautilus_initialized = False
+
+    def compute_batch(self, ohlcv_arrays) -> dict:
+        """
+        per-bar changed flag, last critical high/low, direction (1 up, -1 down, 0 unknown) and running extremes
+        of a fresh archive with the same strength; the swing/critical-point logic is sequential, so it is replayed
+        on raw floats (Swings.update_raw) without building Nautilus bars
+        """
+        archive = PivotArchive(self.strength)
+        high = ohlcv_column(ohlcv_arrays, "high")
+        low = ohlcv_column(ohlcv_arrays, "low")
+        ts = timestamps(ohlcv_arrays)
+        n = len(high)
+        out = {
+            "changed": np.zeros(n, dtype=bool),
+            "last_swing_high": np.full(n, np.nan),
+            "last_swing_low": np.full(n, np.nan),
+            "direction": np.zeros(n, dtype=np.int8),
+            "highest_high": np.full(n, np.nan),
+            "lowest_low": np.full(n, np.nan),
+        }
+        for i in range(n):
+            _swings_update_raw(archive.swings, float(high[i]), float(low[i]), int(ts[i]))
+            out["changed"][i] = archive._update_levels(float(high[i]), float(low[i]), int(ts[i]))
+            if archive.critical_highs:
+                out["last_swing_high"][i] = archive.critical_highs[-1].price
+            if archive.critical_lows:
+                out["last_swing_low"][i] = archive.critical_lows[-1].price
+            direction, _ = archive.get_direction_with_confidence()
+            out["direction"][i] = 1 if direction == "up" else -1 if direction == "down" else 0
+            if archive.highest_high is not None:
+                out["highest_high"][i] = archive.highest_high
+            if archive.lowest_low is not None:
+                out["lowest_low"][i] = archive.lowest_low
+        return out
+
+
+def _swings_update_raw(swings: Swings, high: float, low: float, ts_event: int) -> None:
+    # newer Nautilus versions take the timestamp as uint64 ns, older ones as datetime
+    try:
+        swings.update_raw(high, low, ts_event)
+    except TypeError:
+        swings.update_raw(high, low, pd.Timestamp(ts_event, tz="UTC"))
@@ -1,5 +1,4 @@
 from typing import Tuple, Dict, Any
-from collections import deque
 from tools.indicators.VWAP_ZScore_HTF import VWAPZScoreHTFAnchored
 
 class ElasticReversionZScoreEntry:
@@ -21,8 +20,8 @@ class ElasticReversionZScoreEntry:
         self.reset_neutral_zone_long = reset_neutral_zone_long
         self.reset_neutral_zone_short = reset_neutral_zone_short
         
-        # Use deque with reasonable maxlen for memory efficiency
-        self.zscore_since_cross = deque(maxlen=5000)  # Keep last 5000 values
+        # extremes since the cross are running min / max, only the bar count is needed (no zscore buffer)
+        self.bars_since_cross = 0
         self.z_extreme_long_since_cross = None      
         self.z_extreme_short_since_cross = None     
         self.bars_since_long_extreme = 0
@@ -50,7 +49,7 @@ class ElasticReversionZScoreEntry:
 
     def reset_on_cross(self):
         """Resettet das System bei einem neuen Kalman Cross - ersetzt lookback_window"""
-        self.zscore_since_cross.clear()  # Clear deque efficiently
+        self.bars_since_cross = 0
         self.z_extreme_long_since_cross = None
         self.z_extreme_short_since_cross = None
         self.bars_since_long_extreme = 0
@@ -91,8 +90,7 @@ class ElasticReversionZScoreEntry:
         if zscore is None:
             return
             
-        # Deque automatically manages memory with maxlen
-        self.zscore_since_cross.append(zscore)
+        self.bars_since_cross += 1
         self._update_extremes_since_cross(zscore)
 
         self.bars_since_long_extreme += 1
@@ -146,7 +144,7 @@ class ElasticReversionZScoreEntry:
             'z_extreme_short_since_cross': self.z_extreme_short_since_cross,
             'long_recovery_triggered': self.long_recovery_triggered,
             'short_recovery_triggered': self.short_recovery_triggered,
-            'bars_since_cross': len(self.zscore_since_cross),
+            'bars_since_cross': self.bars_since_cross,
             'current_parameters': {
                 'z_min_threshold': self.z_min_threshold,
                 'z_max_threshold': self.z_max_threshold,
@@ -206,7 +204,7 @@ class ElasticReversionZScoreEntry:
             'bars_since_short_extreme': self.bars_since_short_extreme,
             'long_recovery_triggered': self.long_recovery_triggered,
             'short_recovery_triggered': self.short_recovery_triggered,
-            'bars_since_cross': len(self.zscore_since_cross),
+            'bars_since_cross': self.bars_since_cross,
             'parameters': {
                 'z_min_threshold': self.z_min_threshold,
                 'z_max_threshold': self.z_max_threshold,
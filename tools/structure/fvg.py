@@ -1,6 +1,8 @@
 from typing import List, Tuple
 from decimal import Decimal
+import numpy as np
 from nautilus_trader.model.data import Bar
+from tools.help_funcs.batch_utils import ohlcv_column
 
 
 class FVG_Analyser:
@@ -38,3 +40,21 @@ class FVG_Analyser:
         if bar_0.high < bar_2.low:
             return True, (bar_2.low, bar_0.high)
         return False, (Decimal("0"), Decimal("0"))
+
+    def compute_batch(self, ohlcv_arrays) -> dict:
+        """bullish/bearish fvg flags + gap bounds per bar (as floats, 0.0 if none), same as the per-bar checks"""
+        high = ohlcv_column(ohlcv_arrays, "high")
+        low = ohlcv_column(ohlcv_arrays, "low")
+        n = len(high)
+        high_2 = np.r_[np.full(min(2, n), np.nan), high[:-2]] if n > 2 else np.full(n, np.nan)
+        low_2 = np.r_[np.full(min(2, n), np.nan), low[:-2]] if n > 2 else np.full(n, np.nan)
+        bullish = low > high_2
+        bearish = high < low_2
+        return {
+            "bullish": bullish,
+            "bullish_high": np.where(bullish, high_2, 0.0),
+            "bullish_low": np.where(bullish, low, 0.0),
+            "bearish": bearish,
+            "bearish_high": np.where(bearish, low_2, 0.0),
+            "bearish_low": np.where(bearish, high, 0.0),
+        }